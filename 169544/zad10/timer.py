@@ -1,15 +1,198 @@
 from typing import Any
+import atexit
+import contextvars
+import functools
+import inspect
+import json
+import random
 import time
 from collections.abc import Callable
-def timer[F:Callable[..., Any]](func:F)->F:
-    def wrapper(*args:Any,**kwargs:Any)->Any:
-        wynik1=time.perf_counter()
-        result=func(*args,**kwargs)
-        wynik2=time.perf_counter()
-        wynik3=wynik2-wynik1
-        print(f"Czas {wynik3}")
-        return result
-    return wrapper
+
+# Ile pomiarów na span trzymamy do wyznaczania percentyli (reservoir sampling)
+RESERVOIR_SIZE = 1024
+
+_stos: contextvars.ContextVar[tuple[str, ...]] = contextvars.ContextVar("timer_stos", default=())
+
+
+class SpanStats:
+    def __init__(self) -> None:
+        self.calls = 0
+        self.timed = 0
+        self.total_ns = 0
+        self.min_ns: int | None = None
+        self.max_ns: int | None = None
+        self._probki: list[int] = []
+
+    def add(self, czas_ns: int) -> None:
+        self.timed += 1
+        self.total_ns += czas_ns
+        if self.min_ns is None or czas_ns < self.min_ns:
+            self.min_ns = czas_ns
+        if self.max_ns is None or czas_ns > self.max_ns:
+            self.max_ns = czas_ns
+        if len(self._probki) < RESERVOIR_SIZE:
+            self._probki.append(czas_ns)
+        else:
+            i = random.randrange(self.timed)
+            if i < RESERVOIR_SIZE:
+                self._probki[i] = czas_ns
+
+    def percentile(self, p: float) -> float:
+        if not self._probki:
+            return 0.0
+        posortowane = sorted(self._probki)
+        return posortowane[min(len(posortowane) - 1, int(p / 100 * len(posortowane)))] / 1e9
+
+    # Przy próbkowaniu suma mierzonych wywołań jest skalowana do liczby wszystkich wywołań
+    @property
+    def estimated_total(self) -> float:
+        if self.timed == 0:
+            return 0.0
+        return self.total_ns / 1e9 * self.calls / self.timed
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "timed": self.timed,
+            "total_s": self.estimated_total,
+            "min_s": (self.min_ns or 0) / 1e9,
+            "max_s": (self.max_ns or 0) / 1e9,
+            "mean_s": self.total_ns / self.timed / 1e9 if self.timed else 0.0,
+            "p50_s": self.percentile(50),
+            "p90_s": self.percentile(90),
+            "p99_s": self.percentile(99),
+        }
+
+
+class Registry:
+    def __init__(self) -> None:
+        # Klucz to ścieżka zagnieżdżonych spanów, np. ("main", "describe")
+        self.spans: dict[tuple[str, ...], SpanStats] = {}
+
+    def stats(self, sciezka: tuple[str, ...]) -> SpanStats:
+        wpis = self.spans.get(sciezka)
+        if wpis is None:
+            wpis = self.spans[sciezka] = SpanStats()
+        return wpis
+
+    def reset(self) -> None:
+        self.spans.clear()
+
+    def to_json(self) -> str:
+        return json.dumps({";".join(k): v.to_dict() for k, v in sorted(self.spans.items())}, indent=2)
+
+    # Format "folded stacks" (flamegraph.pl, speedscope): czas własny spanu w mikrosekundach
+    def to_folded(self) -> str:
+        dzieci: dict[tuple[str, ...], float] = {}
+        for sciezka, wpis in self.spans.items():
+            if len(sciezka) > 1:
+                dzieci[sciezka[:-1]] = dzieci.get(sciezka[:-1], 0.0) + wpis.estimated_total
+        linie = []
+        for sciezka, wpis in sorted(self.spans.items()):
+            wlasny = max(0.0, wpis.estimated_total - dzieci.get(sciezka, 0.0))
+            linie.append(f"{';'.join(sciezka)} {round(wlasny * 1e6)}")
+        return "\n".join(linie) + "\n"
+
+    def export(self, json_path: str | None = None, folded_path: str | None = None) -> None:
+        if json_path:
+            with open(json_path, "w") as f:
+                f.write(self.to_json())
+        if folded_path:
+            with open(folded_path, "w") as f:
+                f.write(self.to_folded())
+
+    def export_at_exit(self, json_path: str | None = None, folded_path: str | None = None) -> None:
+        atexit.register(self.export, json_path, folded_path)
+
+
+registry = Registry()
+
+
+# Wejście do spanu: ścieżka trafia na stos zawsze (zagnieżdżone spany mają poprawnych
+# rodziców), a mierzone jest co sample_every-te wywołanie danej ścieżki. Dla niemierzonego
+# wywołania zwracany wpis to None - bez zegara i add.
+def _enter(reg: Registry, name: str, sample_every: int) -> tuple[SpanStats | None, contextvars.Token[tuple[str, ...]]]:
+    sciezka = _stos.get() + (name,)
+    wpis = reg.stats(sciezka)
+    wpis.calls += 1
+    return (wpis if wpis.calls % sample_every == 0 else None), _stos.set(sciezka)
+
+
+class span:
+    # Context manager: with span("etap"): ...  (zagnieżdżenia tworzą hierarchię)
+    def __init__(self, name: str, registry: Registry = registry, sample_every: int = 1) -> None:
+        self.name = name
+        self.registry = registry
+        self.sample_every = sample_every
+
+    def __enter__(self) -> "span":
+        self._wpis, self._token = _enter(self.registry, self.name, self.sample_every)
+        if self._wpis is not None:
+            self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        if self._wpis is not None:
+            self._wpis.add(time.perf_counter_ns() - self._start)
+        _stos.reset(self._token)
+
+
+def _instrument[F: Callable[..., Any]](func: F, name: str, reg: Registry, sample_every: int, verbose: bool) -> F:
+    def _wyjscie(wpis: SpanStats, czas_ns: int) -> None:
+        wpis.add(czas_ns)
+        if verbose:
+            print(f"Czas {czas_ns / 1e9}")
+
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            wpis, token = _enter(reg, name, sample_every)
+            if wpis is None:
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    _stos.reset(token)
+            wynik1 = time.perf_counter_ns()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                wynik2 = time.perf_counter_ns()
+                _stos.reset(token)
+                _wyjscie(wpis, wynik2 - wynik1)
+        return async_wrapper  # type: ignore[return-value]
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        wpis, token = _enter(reg, name, sample_every)
+        if wpis is None:
+            try:
+                return func(*args, **kwargs)
+            finally:
+                _stos.reset(token)
+        wynik1 = time.perf_counter_ns()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            wynik2 = time.perf_counter_ns()
+            _stos.reset(token)
+            _wyjscie(wpis, wynik2 - wynik1)
+    return wrapper  # type: ignore[return-value]
+
+
+# @timer albo @timer(name=..., sample_every=100, registry=..., verbose=True).
+# sample_every=N mierzy co N-te wywołanie każdej ścieżki (czas ścieżki jest skalowany do
+# liczby wszystkich wywołań), verbose=False wyłącza wypisywanie czasu mierzonego wywołania.
+def timer[F: Callable[..., Any]](func: F | None = None, *, name: str | None = None, sample_every: int = 1,
+                                 registry: Registry = registry, verbose: bool = True) -> Any:
+    if sample_every < 1:
+        raise ValueError("sample_every musi być >= 1")
+
+    def dekorator(f: F) -> F:
+        return _instrument(f, name or f.__qualname__, registry, sample_every, verbose)
+
+    if func is not None:
+        return dekorator(func)
+    return dekorator
 
 @timer
 def add(x:int,y:int)->int:
@@ -0,0 +1,87 @@
+import numpy as np
+
+SIZES = {'10k': 10_000, '1m': 1_000_000, '10m': 10_000_000}
+
+# Wartości atrybutów car.txt (buying, maint, doors, persons, lug_boot, safety, klasa)
+CAR_VALUES = [
+    ['vhigh', 'high', 'med', 'low'],
+    ['vhigh', 'high', 'med', 'low'],
+    ['2', '3', '4', '5more'],
+    ['2', '4', 'more'],
+    ['small', 'med', 'big'],
+    ['low', 'med', 'high'],
+    ['unacc', 'acc', 'good', 'vgood'],
+]
+
+CHURN_HEADER = [
+    'RowNumber', 'CustomerId', 'Surname', 'CreditScore', 'Geography', 'Gender', 'Age', 'Tenure',
+    'Balance', 'NumOfProducts', 'HasCrCard', 'IsActiveMember', 'EstimatedSalary', 'Exited',
+]
+SURNAMES = ['Hargrave', 'Hill', 'Onio', 'Boni', 'Mitchell', 'Chu', 'Bartlett', 'Obinna', 'He', 'Kowalski']
+COUNTRIES = ['France', 'Spain', 'Germany']
+
+CHUNK = 100_000
+
+
+def parse_size(rozmiar):
+    if isinstance(rozmiar, int):
+        return rozmiar
+    return SIZES[rozmiar] if rozmiar in SIZES else int(rozmiar)
+
+
+# Plik w kształcie car.txt; missing_rate to ułamek komórek zastąpionych przez '?'
+def write_car_like(sciezka, n_rows, missing_rate=0.0, seed=0):
+    rng = np.random.default_rng(seed)
+    slowniki = [np.array(v + ['?']) for v in CAR_VALUES]
+    with open(sciezka, 'w') as f:
+        for start in range(0, n_rows, CHUNK):
+            n = min(CHUNK, n_rows - start)
+            kolumny = []
+            for slownik in slowniki:
+                kody = rng.integers(0, len(slownik) - 1, size=n)
+                if missing_rate:
+                    kody[rng.random(n) < missing_rate] = len(slownik) - 1
+                kolumny.append(slownik[kody])
+            f.writelines(" ".join(wiersz) + "\n" for wiersz in zip(*kolumny))
+    return sciezka
+
+
+def write_car_types(sciezka):
+    with open(sciezka, 'w') as f:
+        f.writelines(f"a{j + 1} s\n" for j in range(len(CAR_VALUES) - 1))
+    return sciezka
+
+
+# Plik w kształcie Churn_Modelling.csv; braki to puste pola, a co dziesiąty wiersz z brakiem jest ucięty
+def write_churn_like(sciezka, n_rows, missing_rate=0.0, seed=0):
+    rng = np.random.default_rng(seed)
+    with open(sciezka, 'w') as f:
+        f.write(",".join(CHURN_HEADER) + "\n")
+        for start in range(0, n_rows, CHUNK):
+            n = min(CHUNK, n_rows - start)
+            kolumny = [
+                np.arange(start + 1, start + n + 1).astype(str),
+                rng.integers(15_500_000, 15_900_000, size=n).astype(str),
+                np.array(SURNAMES)[rng.integers(0, len(SURNAMES), size=n)],
+                rng.integers(350, 851, size=n).astype(str),
+                np.array(COUNTRIES)[rng.integers(0, len(COUNTRIES), size=n)],
+                np.array(['Female', 'Male'])[rng.integers(0, 2, size=n)],
+                rng.integers(18, 93, size=n).astype(str),
+                rng.integers(0, 11, size=n).astype(str),
+                np.char.mod('%.2f', np.where(rng.random(n) < 0.35, 0, rng.uniform(0, 250_000, size=n))),
+                rng.integers(1, 5, size=n).astype(str),
+                rng.integers(0, 2, size=n).astype(str),
+                rng.integers(0, 2, size=n).astype(str),
+                np.char.mod('%.2f', rng.uniform(10, 200_000, size=n)),
+                rng.integers(0, 2, size=n).astype(str),
+            ]
+            braki = rng.random((n, len(kolumny))) < missing_rate if missing_rate else None
+            linie = []
+            for i, wiersz in enumerate(zip(*kolumny)):
+                if braki is not None and braki[i].any():
+                    wiersz = ['' if b else v for v, b in zip(wiersz, braki[i])]
+                    if i % 10 == 0:
+                        wiersz = wiersz[:-1]
+                linie.append(",".join(wiersz) + "\n")
+            f.writelines(linie)
+    return sciezka
@@ -0,0 +1,250 @@
+import argparse
+import gc
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+
+import kolejny
+from benchmark.generators import parse_size, write_car_like, write_car_types, write_churn_like
+from column_stats import describe
+from csv_reader import CsvReader
+from decision_table import load_decision_table
+from encoding import OneHotEncoder
+from imputation import expand_table
+from running_stats import RunningStats
+from scalers import MinMaxScaler, StandardScaler
+
+
+# Pętla dummy attributes w postaci, w jakiej była w main() - punkt odniesienia dla OneHotEncoder
+def legacy_churn_rows(sciezka):
+    readable_data = []
+    geography_values = kolejny.UniqueSet()
+    with open(sciezka, 'r') as file:
+        headers = file.readline().strip().split(',')
+        for line in file:
+            values = line.strip().split(',')
+            row_dict = {headers[i]: values[i] if i < len(values) else "MISSING" for i in range(len(headers))}
+            geography_values.add(values[headers.index("Geography")])
+            readable_data.append(row_dict)
+    return readable_data, geography_values
+
+
+def legacy_churn_dummies(readable_data, geography_values):
+    for row in readable_data:
+        for country in geography_values:
+            row[country] = "1" if row["Geography"] == country else "0"
+        del row["Geography"]
+        del row[list(geography_values)[0]]
+
+
+def _car_rows(pliki):
+    return (kolejny.string_to_tablica(pliki['car']),)
+
+
+def _car_table(pliki):
+    return (load_decision_table(pliki['car'], pliki['car_types']),)
+
+
+def _churn_geography(pliki):
+    reader = CsvReader(pliki['churn'])
+    chunk = reader.read()
+    return reader.vocabularies['Geography'], chunk['Geography']
+
+
+def _one_hot(slownik, kody):
+    return OneHotEncoder().fit(slownik).transform_codes(kody, slownik)
+
+
+# Stan statystyk tabeli źródłowej i tabela po dopisaniu 10% wierszy - mierzona jest tylko aktualizacja
+def _running_append(pliki):
+    tabela = load_decision_table(pliki['car'], pliki['car_types'])
+    return RunningStats.from_table(tabela), expand_table(tabela), tabela.n_rows
+
+
+def _minmax(tabela):
+    return MinMaxScaler().fit_transform(tabela.to_numeric(), [(-1, 1), (0, 1), (-10, 10)])
+
+
+# nazwa -> (przygotowanie danych (poza pomiarem), mierzona funkcja)
+CASES = {
+    'string_to_tablica': (lambda p: (p['car'],), kolejny.string_to_tablica),
+    'find_min': (_car_rows, kolejny.find_min),
+    'find_max': (_car_rows, kolejny.find_max),
+    'avg': (_car_rows, kolejny.avg),
+    'std_dev': (_car_rows, kolejny.std_dev),
+    'get_unique': (_car_rows, kolejny.get_unique),
+    'fill_missing_values': (_car_rows, kolejny.fill_missing_values),
+    'normalize_into_intervals': (_car_rows, lambda d: kolejny.normalize_into_intervals(d, -1, 1)),
+    'normalize': (_car_rows, kolejny.normalize),
+    'churn_dummies_legacy': (lambda p: legacy_churn_rows(p['churn']), legacy_churn_dummies),
+    'load_decision_table': (lambda p: (p['car'], p['car_types']), load_decision_table),
+    'describe': (_car_table, describe),
+    'minmax_scaler': (_car_table, _minmax),
+    'standard_scaler': (_car_table, lambda t: StandardScaler().fit_transform(t.to_numeric())),
+    'expand_table': (_car_table, expand_table),
+    'running_stats_append': (_running_append, lambda stan, tabela, start: stan.update(tabela, start)),
+    'csv_reader': (lambda p: (p['churn'],), lambda sciezka: CsvReader(sciezka).read()),
+    'one_hot': (_churn_geography, _one_hot),
+}
+
+
+def _current_rss_mb():
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2**20
+    except OSError:
+        return float('nan')
+
+
+def _peak_rss_mb():
+    maks = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux podaje kB, macOS bajty
+    return maks / 2**20 if sys.platform == 'darwin' else maks / 1024
+
+
+# Zerowanie szczytowego RSS procesu (VmHWM) - Linux; False, gdy niedostępne
+def _reset_peak_rss():
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def _hwm_mb():
+    try:
+        with open('/proc/self/status') as f:
+            for linia in f:
+                if linia.startswith('VmHWM:'):
+                    return int(linia.split()[1]) / 1024
+    except OSError:
+        pass
+    return _peak_rss_mb()
+
+
+# Każde powtórzenie ma świeże dane z przygotowania (część funkcji modyfikuje argumenty);
+# czas i pamięć mierzone są tylko dla samej operacji. wall_s to najlepszy z pomiarów,
+# rss_delta_mb - największy przyrost szczytowego RSS ponad stan po przygotowaniu.
+def _run_case(nazwa, pliki, polaczenie, powtorzenia=5):
+    try:
+        przygotuj, funkcja = CASES[nazwa]
+        czasy, przyrosty = [], []
+        rss_przed = float('nan')
+        for _ in range(powtorzenia):
+            argumenty = przygotuj(pliki)
+            gc.collect()
+            rss_przed = _current_rss_mb()
+            zerowany = _reset_peak_rss()
+            start = time.perf_counter()
+            funkcja(*argumenty)
+            czasy.append(time.perf_counter() - start)
+            # Bez zerowania szczyt obejmuje też przygotowanie - przyrost jest wtedy zawyżony
+            przyrosty.append(max(0.0, (_hwm_mb() if zerowany else _peak_rss_mb()) - rss_przed))
+            del argumenty
+        czasy.sort()
+        polaczenie.send({
+            'wall_s': czasy[0], 'wall_median_s': czasy[len(czasy) // 2], 'wall_samples_s': czasy,
+            'rss_delta_mb': max(przyrosty), 'peak_rss_mb': _peak_rss_mb(), 'rss_before_mb': rss_przed,
+        })
+    except Exception as e:
+        polaczenie.send({'error': f"{type(e).__name__}: {e}"})
+    finally:
+        polaczenie.close()
+
+
+# Każdy przypadek w osobnym procesie, żeby szczytowe RSS dotyczyło tylko jego
+def measure(nazwa, pliki, n_rows, repeat=5):
+    kontekst = multiprocessing.get_context('fork' if 'fork' in multiprocessing.get_all_start_methods() else 'spawn')
+    odbior, nadanie = kontekst.Pipe(duplex=False)
+    proces = kontekst.Process(target=_run_case, args=(nazwa, pliki, nadanie, repeat))
+    proces.start()
+    nadanie.close()
+    try:
+        wynik = odbior.recv()
+    except EOFError:
+        # Proces zakończył się bez wyniku (np. zabity przez OOM) - pozostałe przypadki idą dalej
+        wynik = None
+    proces.join()
+    if wynik is None:
+        wynik = {'error': f"exit code {proces.exitcode}"}
+    wynik.update({'case': nazwa, 'rows': n_rows})
+    if 'wall_s' in wynik:
+        wynik['rows_per_s'] = n_rows / wynik['wall_s'] if wynik['wall_s'] > 0 else float('inf')
+    return wynik
+
+
+# Przypadki wolniejsze niż baseline o więcej niż threshold (ułamek); porównywane są
+# najlepsze czasy z powtórzeń, mniej wrażliwe na szum niż pojedynczy pomiar
+def regressions(wyniki, baseline, threshold):
+    odniesienie = {(r['case'], r['rows']): r for r in baseline.get('results', []) if 'wall_s' in r}
+    regresje = []
+    for r in wyniki:
+        stary = odniesienie.get((r['case'], r['rows']))
+        if stary and 'wall_s' in r and r['wall_s'] > stary['wall_s'] * (1 + threshold):
+            regresje.append((r['case'], r['rows'], stary['wall_s'], r['wall_s']))
+    return regresje
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark funkcji przetwarzania danych")
+    parser.add_argument("--sizes", nargs="+", default=["10k"], help="rozmiary danych: 10k, 1m, 10m albo liczba wierszy")
+    parser.add_argument("--cases", nargs="+", default=sorted(CASES), choices=sorted(CASES), metavar="CASE")
+    parser.add_argument("--missing-rate", type=float, default=0.0, help="ułamek brakujących komórek")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", metavar="FILE", help="zapisz wyniki do pliku JSON")
+    parser.add_argument("--baseline", metavar="FILE", help="wyniki odniesienia (JSON) do porównania")
+    parser.add_argument("--threshold", type=float, default=0.2, help="dopuszczalne spowolnienie względem baseline")
+    parser.add_argument("--repeat", type=int, default=5, help="liczba pomiarów każdego przypadku")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    wyniki = []
+    with tempfile.TemporaryDirectory() as katalog:
+        for rozmiar in args.sizes:
+            n_rows = parse_size(rozmiar)
+            pliki = {
+                'car': write_car_like(os.path.join(katalog, f"car_{n_rows}.txt"), n_rows, args.missing_rate, args.seed),
+                'car_types': write_car_types(os.path.join(katalog, "car-type.txt")),
+                'churn': write_churn_like(os.path.join(katalog, f"churn_{n_rows}.csv"), n_rows, args.missing_rate, args.seed),
+            }
+            for nazwa in args.cases:
+                wynik = measure(nazwa, pliki, n_rows, args.repeat)
+                wyniki.append(wynik)
+                if 'error' in wynik:
+                    print(f"{nazwa:>26} {n_rows:>10}  BŁĄD: {wynik['error']}")
+                else:
+                    print(f"{nazwa:>26} {n_rows:>10} {wynik['wall_s']:>10.4f} s "
+                          f"(mediana {wynik['wall_median_s']:.4f} s) {wynik['rss_delta_mb']:>9.1f} MB "
+                          f"{wynik['rows_per_s']:>14.0f} wierszy/s")
+
+    raport = {
+        'meta': {
+            'python': platform.python_version(), 'platform': platform.platform(),
+            'missing_rate': args.missing_rate, 'seed': args.seed, 'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'results': wyniki,
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(raport, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regresje = regressions(wyniki, json.load(f), args.threshold)
+        for nazwa, n_rows, stary, nowy in regresje:
+            print(f"REGRESJA: {nazwa} ({n_rows} wierszy): {stary:.4f} s -> {nowy:.4f} s")
+        if regresje:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,141 @@
+import hashlib
+import json
+import os
+import shutil
+
+import numpy as np
+
+from csv_reader import CsvChunk, CsvReader
+from decision_table import DecisionTable, load_decision_table
+
+FORMAT_VERSION = 1
+MANIFEST = 'manifest.json'
+
+
+def cache_dir_for(sciezka_do_pliku):
+    return sciezka_do_pliku + '.cache'
+
+
+def content_hash(sciezka_do_pliku, blok=1 << 20):
+    h = hashlib.blake2b(digest_size=16)
+    with open(sciezka_do_pliku, 'rb') as f:
+        while True:
+            dane = f.read(blok)
+            if not dane:
+                break
+            h.update(dane)
+    return h.hexdigest()
+
+
+def _stat(sciezka_do_pliku):
+    st = os.stat(sciezka_do_pliku)
+    return {'path': os.path.abspath(sciezka_do_pliku), 'size': st.st_size, 'mtime_ns': st.st_mtime_ns}
+
+
+# Odcisk plików źródłowych; hash treści liczymy tylko wtedy, gdy rozmiar/mtime nie wystarczają
+def _fingerprint(sciezki, poprzedni=None):
+    odcisk = []
+    for i, sciezka in enumerate(sciezki):
+        wpis = _stat(sciezka)
+        stary = poprzedni[i] if poprzedni and i < len(poprzedni) else None
+        if stary and all(stary.get(k) == wpis[k] for k in ('path', 'size', 'mtime_ns')):
+            wpis['hash'] = stary['hash']
+        else:
+            wpis['hash'] = content_hash(sciezka)
+        odcisk.append(wpis)
+    return odcisk
+
+
+def _read_manifest(katalog):
+    try:
+        with open(os.path.join(katalog, MANIFEST), 'r') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return manifest if manifest.get('version') == FORMAT_VERSION else None
+
+
+# Zwraca (tablice zmapowane w pamięci, metadane) albo None, gdy cache nie pasuje do źródeł.
+# Jeśli zmienił się tylko mtime, a treść jest ta sama, odświeżamy manifest i używamy cache.
+def load_cached(katalog, sciezki, rodzaj):
+    manifest = _read_manifest(katalog)
+    if manifest is None or manifest.get('kind') != rodzaj or len(manifest['sources']) != len(sciezki):
+        return None
+    try:
+        odcisk = _fingerprint(sciezki, manifest['sources'])
+    except OSError:
+        return None
+    if [w['hash'] for w in odcisk] != [w['hash'] for w in manifest['sources']]:
+        return None
+    if odcisk != manifest['sources']:
+        manifest['sources'] = odcisk
+        _write_manifest(katalog, manifest)
+    try:
+        tablice = {
+            nazwa: np.load(os.path.join(katalog, plik), mmap_mode='r')
+            for nazwa, plik in manifest['arrays'].items()
+        }
+    except (OSError, ValueError):
+        return None
+    return tablice, manifest['meta']
+
+
+def _write_manifest(katalog, manifest):
+    tymczasowy = os.path.join(katalog, MANIFEST + '.tmp')
+    with open(tymczasowy, 'w') as f:
+        json.dump(manifest, f)
+    os.replace(tymczasowy, os.path.join(katalog, MANIFEST))
+
+
+# Manifest zapisywany jest na końcu, więc przerwany zapis nigdy nie wygląda na poprawny cache
+def store(katalog, sciezki, rodzaj, tablice, meta):
+    if os.path.isdir(katalog):
+        shutil.rmtree(katalog)
+    os.makedirs(katalog)
+    pliki = {}
+    for i, (nazwa, tablica) in enumerate(tablice.items()):
+        pliki[nazwa] = f"{i:04d}.npy"
+        np.save(os.path.join(katalog, pliki[nazwa]), np.ascontiguousarray(tablica))
+    manifest = {
+        'version': FORMAT_VERSION,
+        'kind': rodzaj,
+        'sources': _fingerprint(sciezki),
+        'arrays': pliki,
+        'meta': meta,
+    }
+    _write_manifest(katalog, manifest)
+
+
+def load_decision_table_cached(sciezka_do_danych, sciezka_do_typow=None, cache_dir=None):
+    katalog = cache_dir or cache_dir_for(sciezka_do_danych)
+    zrodla = [sciezka_do_danych] + ([sciezka_do_typow] if sciezka_do_typow else [])
+    zapisane = load_cached(katalog, zrodla, 'decision_table')
+    if zapisane is not None:
+        tablice, meta = zapisane
+        kolumny = [tablice[str(j)] for j in range(len(meta['names']))]
+        return DecisionTable(meta['names'], meta['types'], kolumny, meta['vocabularies'])
+
+    tabela = load_decision_table(sciezka_do_danych, sciezka_do_typow)
+    meta = {'names': tabela.names, 'types': tabela.types, 'vocabularies': tabela.vocabularies}
+    store(katalog, zrodla, 'decision_table', {str(j): k for j, k in enumerate(tabela.columns)}, meta)
+    return tabela
+
+
+# Zwraca (reader, chunk) - reader ma odtworzone typy i słowniki, więc działa decode()
+def read_csv_cached(sciezka_do_pliku, dtypes=None, cache_dir=None):
+    katalog = cache_dir or cache_dir_for(sciezka_do_pliku)
+    reader = CsvReader(sciezka_do_pliku, dtypes=dtypes)
+    zapisane = load_cached(katalog, [sciezka_do_pliku], 'csv')
+    if zapisane is not None and zapisane[1]['overrides'] == (dtypes or {}):
+        tablice, meta = zapisane
+        reader.set_schema(meta['dtypes'], meta['vocabularies'])
+        kolumny = {name: tablice['col:' + name] for name in reader.headers}
+        braki = {name[len('missing:'):]: t for name, t in tablice.items() if name.startswith('missing:')}
+        return reader, CsvChunk(0, kolumny, braki)
+
+    chunk = reader.read()
+    tablice = {'col:' + name: kolumna for name, kolumna in chunk.columns.items()}
+    tablice.update({'missing:' + name: maska for name, maska in chunk.missing.items()})
+    meta = {'dtypes': reader.dtypes, 'vocabularies': reader.vocabularies, 'overrides': dtypes or {}}
+    store(katalog, [sciezka_do_pliku], 'csv', tablice, meta)
+    return reader, chunk
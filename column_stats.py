@@ -0,0 +1,327 @@
+import mmap
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from sketches import HyperLogLog, KLLSketch
+
+DEFAULT_CHUNK = 1_000_000
+
+
+class ColumnStats:
+    def __init__(self, names, count, missing, minimum, maximum, mean, variance, uniques, distinct=None,
+                 quantiles=None):
+        self.names = names
+        self.count = count
+        self.missing = missing
+        self.min = minimum
+        self.max = maximum
+        self.mean = mean
+        self.variance = variance
+        self.std = np.sqrt(variance)
+        # Posortowane unikalne wartości liczbowe każdej kolumny. W trybie przybliżonym (describe
+        # z exact_limit) kolumna powyżej limitu ma tu None, a jej liczba unikalnych w distinct
+        # pochodzi ze szkicu - korzystający z uniques muszą sprawdzać None.
+        self.uniques = uniques
+        if distinct is None:
+            distinct = [len(u) for u in uniques]
+        self.distinct = np.array(distinct, dtype=np.int64)
+        # Szkice kwantyli KLL kolumn liczbowych (tylko w trybie przybliżonym, inaczej None)
+        self.quantiles = quantiles if quantiles is not None else [None] * len(names)
+
+    def __len__(self):
+        return len(self.names)
+
+    def column(self, name):
+        j = self.names.index(name)
+        return {
+            'count': int(self.count[j]), 'missing': int(self.missing[j]),
+            'min': float(self.min[j]), 'max': float(self.max[j]),
+            'mean': float(self.mean[j]), 'variance': float(self.variance[j]),
+            'std': float(self.std[j]), 'distinct': int(self.distinct[j]),
+        }
+
+    # Przybliżony kwantyl (albo tablica kwantyli) kolumny liczbowej ze szkicu KLL
+    def quantile(self, name, q):
+        szkic = self.quantiles[self.names.index(name)]
+        if szkic is None:
+            raise ValueError(f"Brak szkicu kwantyli dla kolumny {name} (describe z exact_limit, kolumna liczbowa)")
+        return szkic.quantile(q)
+
+    def __repr__(self):
+        naglowek = f"{'kolumna':>10} {'count':>10} {'missing':>8} {'min':>12} {'max':>12} {'mean':>12} {'std':>12} {'distinct':>9}"
+        linie = [naglowek]
+        for j, nazwa in enumerate(self.names):
+            linie.append(
+                f"{nazwa:>10} {self.count[j]:>10} {self.missing[j]:>8} {self.min[j]:>12.4g} {self.max[j]:>12.4g} "
+                f"{self.mean[j]:>12.4g} {self.std[j]:>12.4g} {self.distinct[j]:>9}"
+            )
+        return "\n".join(linie)
+
+
+# Kolumna zakodowana słownikiem: jeden bincount po kodach, a wszystkie statystyki
+# liczone są z liczności poszczególnych wartości słownika.
+def _describe_codes(kody, lookup, chunk_size):
+    rozmiar = len(lookup)
+    licznosci = np.zeros(rozmiar, dtype=np.int64)
+    for start in range(0, len(kody), chunk_size):
+        # Kod BRAK (-1) trafia modulo do ostatniej pozycji lookupu (NaN)
+        licznosci += np.bincount(kody[start:start + chunk_size].astype(np.intp) % rozmiar, minlength=rozmiar)
+
+    brakujace = int(licznosci[-1])
+    licznosci, wartosci = licznosci[:-1], lookup[:-1]
+    uzyte = licznosci > 0
+    n = int(licznosci.sum())
+    if n == 0:
+        return 0, brakujace, np.nan, np.nan, np.nan, np.nan, np.empty(0), 0, None
+    srednia = float((licznosci * wartosci).sum() / n)
+    wariancja = float((licznosci * (wartosci - srednia) ** 2).sum() / n)
+    unikalne = np.unique(wartosci[uzyte])
+    return n, brakujace, float(unikalne[0]), float(unikalne[-1]), srednia, wariancja, unikalne, len(unikalne), None
+
+
+# Kolumna liczbowa: fragmenty łączone wzorem Chana (liczność, średnia, M2).
+# Gdy unikalnych wartości jest więcej niż exact_limit, zbiór jest porzucany na rzecz
+# szkicu HyperLogLog (błąd względny error, domyślnie p=14) - pamięć przestaje rosnąć,
+# a liczba unikalnych staje się przybliżona. Z exact_limit każdy fragment trafia też do
+# szkicu kwantyli KLL o parametrze k (stałe ziarno, więc wynik nie zależy od trybu).
+def _describe_values(wartosci, chunk_size, exact_limit=None, error=None, k=200):
+    n, srednia, m2 = 0, 0.0, 0.0
+    minimum, maksimum = np.inf, -np.inf
+    brakujace = 0
+    unikalne = np.empty(0)
+    szkic = None
+    kwantyle = KLLSketch(k, seed=0) if exact_limit is not None else None
+    for start in range(0, len(wartosci), chunk_size):
+        fragment = wartosci[start:start + chunk_size]
+        braki = np.isnan(fragment)
+        brakujace += int(braki.sum())
+        fragment = fragment[~braki]
+        if len(fragment) == 0:
+            continue
+        n_b = len(fragment)
+        srednia_b = float(fragment.mean())
+        m2_b = float(((fragment - srednia_b) ** 2).sum())
+        delta = srednia_b - srednia
+        razem = n + n_b
+        srednia += delta * n_b / razem
+        m2 += m2_b + delta * delta * n * n_b / razem
+        n = razem
+        minimum = min(minimum, float(fragment.min()))
+        maksimum = max(maksimum, float(fragment.max()))
+        if kwantyle is not None:
+            kwantyle.update(fragment)
+        if szkic is not None:
+            szkic.update(fragment)
+            continue
+        unikalne = np.union1d(unikalne, fragment)
+        if exact_limit is not None and len(unikalne) > exact_limit:
+            szkic = (HyperLogLog() if error is None else HyperLogLog.for_error(error)).update(unikalne)
+            unikalne = None
+    distinct = len(unikalne) if szkic is None else len(szkic)
+    if n == 0:
+        return 0, brakujace, np.nan, np.nan, np.nan, np.nan, unikalne, distinct, kwantyle
+    return n, brakujace, minimum, maksimum, srednia, m2 / n, unikalne, distinct, kwantyle
+
+
+def _describe_column(kolumna, typ, lookup, chunk_size, exact_limit=None, error=None, k=200):
+    if typ == 's':
+        return _describe_codes(kolumna, lookup, chunk_size)
+    return _describe_values(kolumna, chunk_size, exact_limit, error, k)
+
+
+# Zadanie procesu roboczego: kolumna mapowana z pliku współdzielonego, bez pośrednictwa pickle
+def _describe_mapped(plik, offset, dtype, n, typ, lookup, chunk_size, exact_limit, error, k):
+    kolumna = np.memmap(plik, dtype=dtype, mode='r', offset=offset, shape=(n,))
+    return _describe_column(kolumna, typ, lookup, chunk_size, exact_limit, error, k)
+
+
+# Położenie danych memmapy w pliku. Wycinek (np. mm[1000:]) dziedziczy offset całej mapy,
+# więc liczymy go z adresu danych względem początku mapowania (mapowanie zaczyna się
+# w pliku od offsetu zaokrąglonego w dół do ALLOCATIONGRANULARITY, jak w np.memmap).
+def _file_offset(kolumna):
+    mapa = getattr(kolumna, '_mmap', None)
+    if mapa is None or mapa.closed:
+        return None
+    poczatek_mapy = np.frombuffer(mapa, dtype=np.uint8).ctypes.data
+    poczatek_w_pliku = kolumna.offset - kolumna.offset % mmap.ALLOCATIONGRANULARITY
+    return poczatek_w_pliku + kolumna.ctypes.data - poczatek_mapy
+
+
+# Kolumny z cache (np.load z mmap_mode) są już plikami - przekazujemy je bez kopiowania.
+# Pozostałe zapisujemy raz do katalogu w pamięci współdzielonej (/dev/shm, jeśli jest).
+def _shared_file(kolumna, katalog, j):
+    if isinstance(kolumna, np.memmap) and kolumna.filename and kolumna.flags.c_contiguous:
+        offset = _file_offset(kolumna)
+        if offset is not None:
+            return kolumna.filename, offset
+    plik = os.path.join(katalog, f"{j}.bin")
+    np.ascontiguousarray(kolumna).tofile(plik)
+    return plik, 0
+
+
+# Każda kolumna liczona jest w całości przez jeden proces tą samą funkcją co w trybie
+# szeregowym, więc wyniki są identyczne.
+def _describe_parallel(table, chunk_size, workers, exact_limit, error, k):
+    baza = '/dev/shm' if os.path.isdir('/dev/shm') else None
+    with tempfile.TemporaryDirectory(dir=baza) as katalog, ProcessPoolExecutor(max_workers=workers) as pool:
+        zadania = []
+        for j, kolumna in enumerate(table.columns):
+            plik, offset = _shared_file(kolumna, katalog, j)
+            zadania.append(pool.submit(
+                _describe_mapped, plik, offset, kolumna.dtype, len(kolumna), table.types[j],
+                table.value_lookup(j), chunk_size, exact_limit, error, k,
+            ))
+        return [zadanie.result() for zadanie in zadania]
+
+
+# Liczność, braki, min, max, średnia, wariancja (populacyjna, jak np.var), odchylenie
+# i liczba unikalnych wartości dla wszystkich kolumn tabeli - każda kolumna czytana raz.
+# workers > 1 rozdziela kolumny między procesy (wyniki takie same jak szeregowo).
+# exact_limit ogranicza pamięć na unikalne wartości kolumn liczbowych: powyżej liczba unikalnych
+# pochodzi z HyperLogLog o względnym błędzie error (domyślnie p=14, ok. 0.8%), a uniques
+# kolumny to None. Z exact_limit kolumny liczbowe mają też kwantyle ze szkicu KLL o parametrze k
+# (ColumnStats.quantile).
+def describe(table, chunk_size=DEFAULT_CHUNK, workers=1, exact_limit=None, error=None, k=200):
+    if workers > 1 and table.n_cols > 1:
+        wyniki = _describe_parallel(table, chunk_size, workers, exact_limit, error, k)
+    else:
+        wyniki = [
+            _describe_column(table.columns[j], table.types[j], table.value_lookup(j), chunk_size,
+                             exact_limit, error, k)
+            for j in range(table.n_cols)
+        ]
+
+    count, missing, minimum, maximum, mean, variance, uniques, distinct, quantiles = zip(*wyniki)
+    return ColumnStats(
+        list(table.names),
+        np.array(count, dtype=np.int64), np.array(missing, dtype=np.int64),
+        np.array(minimum), np.array(maximum), np.array(mean), np.array(variance),
+        list(uniques), distinct, list(quantiles),
+    )
+
+
+class GroupedStats:
+    def __init__(self, names, by, keys, size, count, missing, minimum, maximum, mean, variance, distinct):
+        self.names = names
+        self.by = by
+        # Klucze grup jako krotki zdekodowanych wartości kolumn grupujących
+        self.keys = keys
+        self.size = size
+        # Tablice (grupy x kolumny)
+        self.count = count
+        self.missing = missing
+        self.min = minimum
+        self.max = maximum
+        self.mean = mean
+        self.variance = variance
+        self.std = np.sqrt(variance)
+        self.distinct = distinct
+
+    def __len__(self):
+        return len(self.keys)
+
+    def group(self, key):
+        if not isinstance(key, tuple):
+            key = (key,)
+        g = self.keys.index(key)
+        return {
+            name: {
+                'count': int(self.count[g, j]), 'missing': int(self.missing[g, j]),
+                'min': float(self.min[g, j]), 'max': float(self.max[g, j]),
+                'mean': float(self.mean[g, j]), 'variance': float(self.variance[g, j]),
+                'std': float(self.std[g, j]), 'distinct': int(self.distinct[g, j]),
+            }
+            for j, name in enumerate(self.names)
+        }
+
+    def __repr__(self):
+        return "\n".join(f"{' '.join(k)}: {n}" for k, n in zip(self.keys, self.size.tolist()))
+
+
+# Numer grupy dla każdego wiersza: kody kolejnych kolumn grupujących (przesunięte o 1, żeby
+# brak miał własną wartość) dokładane do numeru grupy i od razu przenumerowane przez np.unique.
+# Klucz nigdy nie przekracza liczba_wierszy * rozmiar_słownika, więc nie przepełnia int64
+# przy wielu kolumnach o dużej liczności; numeracja zachowuje porządek leksykograficzny.
+def _group_ids(table, kolumny):
+    grupy = np.zeros(table.n_rows, dtype=np.int64)
+    pierwsze = np.zeros(min(table.n_rows, 1), dtype=np.intp)
+    for j in kolumny:
+        if table.types[j] != 's':
+            raise ValueError(f"Grupowanie możliwe tylko po kolumnach symbolicznych: {table.names[j]}")
+        klucz = grupy * (len(table.vocabularies[j]) + 1) + (table.columns[j].astype(np.int64) + 1)
+        _, pierwsze, grupy = np.unique(klucz, return_index=True, return_inverse=True)
+        grupy = grupy.ravel()
+
+    # Klucze grup z pierwszego wiersza każdej grupy
+    wartosci = [np.array(table.vocabularies[j] + ['?'])[table.columns[j][pierwsze]] for j in kolumny]
+    klucze = [tuple(str(w) for w in wiersz) for wiersz in zip(*wartosci)] if kolumny else [()] * len(pierwsze)
+    return grupy, klucze
+
+
+# Kolumna symboliczna: jedna macierz liczności (grupa x wartość słownika) z jednego bincount
+def _grouped_codes(grupy, liczba_grup, kody, lookup):
+    rozmiar = len(lookup)
+    licznosci = np.bincount(grupy * rozmiar + kody.astype(np.intp) % rozmiar,
+                            minlength=liczba_grup * rozmiar).reshape(liczba_grup, rozmiar)
+    brakujace = licznosci[:, -1]
+    licznosci, wartosci = licznosci[:, :-1], lookup[:-1]
+    n = licznosci.sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        srednia = (licznosci @ wartosci) / n
+        wariancja = (licznosci * (wartosci[None, :] - srednia[:, None]) ** 2).sum(axis=1) / n
+    uzyte = licznosci > 0
+    minimum = np.where(uzyte, wartosci[None, :], np.inf).min(axis=1, initial=np.inf)
+    maksimum = np.where(uzyte, wartosci[None, :], -np.inf).max(axis=1, initial=-np.inf)
+    pusta = n == 0
+    minimum[pusta] = maksimum[pusta] = np.nan
+    # Różne wpisy słownika mogą mieć tę samą wartość liczbową - liczymy unikalne wartości
+    distinct = np.array([len(np.unique(wartosci[u])) for u in uzyte], dtype=np.int64)
+    return n, brakujace, minimum, maksimum, srednia, wariancja, distinct
+
+
+# Kolumna liczbowa: sumy przez bincount z wagami, min/max przez reduceat na posortowanych grupach
+def _grouped_values(grupy, liczba_grup, porzadek, poczatki, wartosci):
+    braki = np.isnan(wartosci)
+    obecne = ~braki
+    n = np.bincount(grupy, weights=obecne, minlength=liczba_grup).astype(np.int64)
+    brakujace = np.bincount(grupy, weights=braki, minlength=liczba_grup).astype(np.int64)
+    zera = np.where(obecne, wartosci, 0.0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        srednia = np.bincount(grupy, weights=zera, minlength=liczba_grup) / n
+        odchylenia = np.where(obecne, wartosci - srednia[grupy], 0.0)
+        wariancja = np.bincount(grupy, weights=odchylenia ** 2, minlength=liczba_grup) / n
+    posortowane = wartosci[porzadek]
+    minimum = np.fmin.reduceat(posortowane, poczatki)
+    maksimum = np.fmax.reduceat(posortowane, poczatki)
+    pary = np.unique(np.stack([grupy[obecne], wartosci[obecne]]), axis=1)
+    distinct = np.bincount(pary[0].astype(np.intp), minlength=liczba_grup).astype(np.int64)
+    return n, brakujace, minimum, maksimum, srednia, wariancja, distinct
+
+
+# Statystyki wszystkich kolumn osobno dla każdej grupy (domyślnie: klasy decyzyjnej,
+# czyli ostatniej kolumny) - jedno grupowanie i jeden przebieg na kolumnę zamiast
+# osobnego filtrowania tabeli dla każdej klasy.
+def describe_by(table, by=None):
+    if by is None:
+        by = [table.names[-1]]
+    elif isinstance(by, str):
+        by = [by]
+    kolumny = [table.names.index(name) for name in by]
+    grupy, klucze = _group_ids(table, kolumny)
+    liczba_grup = len(klucze)
+    porzadek = np.argsort(grupy, kind='stable')
+    size = np.bincount(grupy, minlength=liczba_grup).astype(np.int64)
+    poczatki = np.concatenate(([0], np.cumsum(size)[:-1]))
+
+    wyniki = []
+    for j in range(table.n_cols):
+        if table.types[j] == 's':
+            wyniki.append(_grouped_codes(grupy, liczba_grup, table.columns[j], table.value_lookup(j)))
+        else:
+            wyniki.append(_grouped_values(grupy, liczba_grup, porzadek, poczatki, table.columns[j]))
+
+    count, missing, minimum, maximum, mean, variance, distinct = (np.stack(t, axis=1) for t in zip(*wyniki))
+    return GroupedStats(list(table.names), by, klucze, size, count, missing, minimum, maximum, mean, variance, distinct)
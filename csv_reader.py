@@ -0,0 +1,156 @@
+import csv
+from itertools import islice
+
+import numpy as np
+
+from decision_table import BRAK
+
+DEFAULT_CHUNK = 65_536
+DTYPES = ('int64', 'float64', 'category')
+
+
+# Typ kolumny zgadywany z próbki napisów: int64, potem float64, w ostateczności kategoria
+def infer_dtype(komorki):
+    komorki = [k for k in komorki if k != '']
+    if not komorki:
+        return 'category'
+    for dtype in ('int64', 'float64'):
+        try:
+            np.array(komorki).astype(dtype)
+            return dtype
+        except ValueError:
+            continue
+    return 'category'
+
+
+class CsvChunk:
+    def __init__(self, start, columns, missing):
+        # Numer pierwszego wiersza fragmentu (licząc od zera, bez nagłówka)
+        self.start = start
+        self.columns = columns
+        # Maski braków tylko dla kolumn, w których braki wystąpiły
+        self.missing = missing
+
+    def __len__(self):
+        return len(next(iter(self.columns.values()))) if self.columns else 0
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+
+class CsvReader:
+    def __init__(self, sciezka_do_pliku, dtypes=None, chunk_size=DEFAULT_CHUNK, delimiter=','):
+        self.path = sciezka_do_pliku
+        self.chunk_size = chunk_size
+        self.delimiter = delimiter
+        self._overrides = dict(dtypes or {})
+        for name, dtype in self._overrides.items():
+            if dtype not in DTYPES:
+                raise ValueError(f"Nieznany typ kolumny {name}: {dtype}")
+        with open(self.path, 'r', newline='') as f:
+            self.headers = next(csv.reader(f, delimiter=delimiter))
+        self.dtypes = None
+        # Słowniki kolumn kategorycznych rosną między fragmentami, więc kody są stabilne
+        self.vocabularies = {}
+        self._codes = {}
+
+    # Typy i słowniki zapisane wcześniej (np. w cache) - bez ponownego zgadywania
+    def set_schema(self, dtypes, vocabularies):
+        self.dtypes = dict(dtypes)
+        self.vocabularies = {name: list(slownik) for name, slownik in vocabularies.items()}
+        self._codes = {name: {v: i for i, v in enumerate(slownik)} for name, slownik in self.vocabularies.items()}
+
+    def _rows(self, f):
+        liczba_kolumn = len(self.headers)
+        for wiersz in csv.reader(f, delimiter=self.delimiter):
+            if not wiersz:
+                continue
+            if len(wiersz) < liczba_kolumn:
+                # Krótkie wiersze uzupełniamy pustymi polami, traktowanymi dalej jako braki
+                wiersz = wiersz + [''] * (liczba_kolumn - len(wiersz))
+            yield wiersz[:liczba_kolumn]
+
+    def _infer(self, kolumny):
+        self.dtypes = {
+            name: self._overrides.get(name) or infer_dtype(kolumny[j])
+            for j, name in enumerate(self.headers)
+        }
+        for name, dtype in self.dtypes.items():
+            if dtype == 'category':
+                self.vocabularies[name] = []
+                self._codes[name] = {}
+
+    def _convert(self, name, komorki):
+        komorki = np.array(komorki)
+        braki = komorki == ''
+        dtype = self.dtypes[name]
+        if dtype == 'category':
+            unikalne, odwrotne = np.unique(komorki, return_inverse=True)
+            kody = self._codes[name]
+            slownik = self.vocabularies[name]
+            mapa = np.empty(len(unikalne), dtype=np.int32)
+            for i, wartosc in enumerate(unikalne.tolist()):
+                if wartosc == '':
+                    mapa[i] = BRAK
+                    continue
+                if wartosc not in kody:
+                    kody[wartosc] = len(slownik)
+                    slownik.append(wartosc)
+                mapa[i] = kody[wartosc]
+            return mapa[odwrotne], braki
+        if braki.any():
+            # np.where dobiera szerokość napisu, więc 'nan' nie zostanie obcięte
+            komorki = np.where(braki, 'nan' if dtype == 'float64' else '0', komorki)
+        try:
+            return komorki.astype(dtype), braki
+        except ValueError:
+            raise ValueError(f"Kolumna {name} nie pasuje do typu {dtype}; podaj typ jawnie w dtypes")
+
+    def __iter__(self):
+        with open(self.path, 'r', newline='') as f:
+            wiersze = self._rows(f)
+            next(wiersze)  # nagłówek
+            start = 0
+            while True:
+                fragment = list(islice(wiersze, self.chunk_size))
+                if not fragment:
+                    break
+                kolumny = list(zip(*fragment))
+                if self.dtypes is None:
+                    self._infer(kolumny)
+                dane, braki = {}, {}
+                for j, name in enumerate(self.headers):
+                    dane[name], maska = self._convert(name, kolumny[j])
+                    if maska.any():
+                        braki[name] = maska
+                yield CsvChunk(start, dane, braki)
+                start += len(fragment)
+
+    # Wartości kolumny fragmentu jako napisy, z oznaczeniem braków. Całkowite wartości kolumn
+    # float64 wypisywane są bez ".0", tak jak zwykle stoją w pliku (np. saldo "0")
+    def decode(self, chunk, name, missing="MISSING"):
+        wartosci = chunk.columns[name]
+        if self.dtypes[name] == 'category':
+            wartosci = np.array(self.vocabularies[name] + [missing])[wartosci].astype(str)
+        elif self.dtypes[name] == 'float64':
+            calkowite = np.isfinite(wartosci) & (np.abs(wartosci) < 2 ** 53)
+            calkowite[calkowite] = wartosci[calkowite] == np.round(wartosci[calkowite])
+            wartosci = np.where(calkowite, np.where(calkowite, wartosci, 0).astype(np.int64).astype(str),
+                                wartosci.astype(str))
+        else:
+            wartosci = wartosci.astype(str)
+        if name in chunk.missing:
+            wartosci = np.where(chunk.missing[name], missing, wartosci)
+        return wartosci.tolist()
+
+    # Cały plik jako jeden fragment (wygodne dla małych plików)
+    def read(self):
+        fragmenty = list(self)
+        if not fragmenty:
+            return CsvChunk(0, {name: np.empty(0) for name in self.headers}, {})
+        kolumny = {name: np.concatenate([f.columns[name] for f in fragmenty]) for name in self.headers}
+        braki = {}
+        for name in self.headers:
+            if any(name in f.missing for f in fragmenty):
+                braki[name] = np.concatenate([f.missing.get(name, np.zeros(len(f), dtype=bool)) for f in fragmenty])
+        return CsvChunk(0, kolumny, braki)
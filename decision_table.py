@@ -0,0 +1,197 @@
+import numpy as np
+
+from tokenizer import tokenize
+
+# Kod wstawiany w miejsce brakującej wartości ('?' albo pusta komórka)
+BRAK = -1
+
+categorical_map = {
+    'low': 1, 'med': 2, 'high': 3, 'vhigh': 4,
+    'small': 5, 'big': 6, 'unacc': 7, 'acc': 8,
+    'good': 9, 'vgood': 10
+}
+
+# Wartość jak w string_to_double, ale bez ostrzeżenia: None dla nieznanej wartości kategorycznej
+def _parse_double(liczba):
+    liczba = liczba.strip()
+
+    if not liczba or liczba == "?":
+        return 0.0  # Zwracamy domyślną wartość dla brakujących danych
+
+    if 'more' in liczba:
+        try:
+            return float(liczba.split('more')[0].strip())
+        except:
+            return 0.0
+
+    try:
+        return float(liczba.replace(',', '.'))
+    except ValueError:
+        pass
+
+    if liczba.lower() in categorical_map:
+        return categorical_map[liczba.lower()]
+    return None
+
+
+def _warn_unknown(liczba):
+    print(f"OSTRZEŻENIE: Nieznana wartość kategoryczna: '{liczba.strip()}'. Zwracam 0.0")
+
+
+def string_to_double(liczba):
+    wartosc = _parse_double(liczba)
+    if wartosc is None:
+        _warn_unknown(liczba)
+        return 0.0
+    return wartosc
+
+
+# Wartości liczbowe słownika (jak string_to_double, nieznane kategorie to 0.0) bez ostrzeżeń -
+# ostrzega tylko wczytanie tabeli, a nie każde zbudowanie jej z gotowych słowników
+def vocabulary_values(slownik):
+    wartosci = [_parse_double(v) for v in slownik]
+    return np.array([0.0 if w is None else w for w in wartosci], dtype=np.float64)
+
+# Najmniejszy typ całkowity, w którym zmieszczą się kody słownika o danym rozmiarze
+def code_dtype(rozmiar_slownika):
+    for dtype in (np.int8, np.int16, np.int32):
+        if rozmiar_slownika <= np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+# Plik typów ma po jednej linii na atrybut: "<nazwa> <typ>", gdzie typ to 's' (symboliczny) albo 'n' (numeryczny)
+def read_attribute_types(sciezka_do_pliku):
+    typy = []
+    with open(sciezka_do_pliku, 'r') as f:
+        for line in f:
+            pola = line.split()
+            if not pola:
+                continue
+            if len(pola) != 2 or pola[1] not in ('s', 'n'):
+                raise ValueError(f"Niepoprawna linia w pliku typów: '{line.strip()}'")
+            typy.append((pola[0], pola[1]))
+    return typy
+
+# Koduje jedną kolumnę tekstową: każda różna wartość jest parsowana tylko raz,
+# a komórki dostają indeks do posortowanego słownika (braki dostają kod BRAK).
+def encode_column(komorki):
+    komorki = np.asarray(komorki, dtype=str)
+    slownik, kody = np.unique(komorki, return_inverse=True)
+    return _drop_missing(kody, slownik)
+
+
+def _drop_missing(kody, slownik):
+    slownik = np.asarray(slownik, dtype=str)
+    brakujace = (slownik == '?') | (slownik == '')
+    if brakujace.any():
+        przesuniecie = np.cumsum(brakujace) - brakujace
+        mapa = np.where(brakujace, BRAK, np.arange(len(slownik)) - przesuniecie)
+        kody = mapa[kody]
+        slownik = slownik[~brakujace]
+    return kody.astype(code_dtype(len(slownik))), [str(v) for v in slownik]
+
+
+class DecisionTable:
+    def __init__(self, names, types, columns, vocabularies):
+        self.names = names
+        self.types = types
+        # Kolumny symboliczne: tablice kodów całkowitych; numeryczne: float64 z NaN dla braków
+        self.columns = columns
+        self.vocabularies = vocabularies
+        # Wartości liczbowe słownika w sensie string_to_double, liczone raz na kolumnę;
+        # ostatni element (NaN) obsługuje kod BRAK = -1
+        self._lookups = [
+            None if slownik is None else np.append(vocabulary_values(slownik), np.nan)
+            for slownik in vocabularies
+        ]
+
+    @property
+    def n_rows(self):
+        return len(self.columns[0]) if self.columns else 0
+
+    @property
+    def n_cols(self):
+        return len(self.columns)
+
+    def missing(self, j):
+        if self.types[j] == 's':
+            return self.columns[j] == BRAK
+        return np.isnan(self.columns[j])
+
+    # Wartości liczbowe słownika kolumny symbolicznej, z NaN na ostatniej pozycji
+    def value_lookup(self, j):
+        return self._lookups[j]
+
+    # Wartości liczbowe kolumny (NaN w miejscu braków)
+    def numeric(self, j):
+        if self.types[j] == 'n':
+            return self.columns[j]
+        return self._lookups[j][self.columns[j]]
+
+    # Cała tabela jako macierz liczbowa (wiersze x kolumny)
+    def to_numeric(self, dtype=np.float64):
+        macierz = np.empty((self.n_rows, self.n_cols), dtype=dtype)
+        for j in range(self.n_cols):
+            macierz[:, j] = self.numeric(j)
+        return macierz
+
+    def decode(self, j):
+        if self.types[j] == 'n':
+            return np.array([f"{v:g}" if not np.isnan(v) else '?' for v in self.columns[j]])
+        slownik = np.array(self.vocabularies[j] + ['?'])
+        return slownik[self.columns[j]]
+
+    # Odtworzenie tabeli w postaci listy list napisów (jak string_to_tablica)
+    def rows(self):
+        return [list(row) for row in zip(*(self.decode(j).tolist() for j in range(self.n_cols)))]
+
+    @property
+    def nbytes(self):
+        return sum(kolumna.nbytes for kolumna in self.columns)
+
+
+# Kolumny nieopisane w pliku typów (np. decyzja) traktujemy jako symboliczne
+def _complete_types(typy, liczba_kolumn):
+    typy = list(typy or [])
+    if len(typy) > liczba_kolumn:
+        raise ValueError("Plik typów opisuje więcej atrybutów niż jest kolumn w danych")
+    for j in range(len(typy), liczba_kolumn):
+        typy.append(('decision' if j == liczba_kolumn - 1 else f"a{j + 1}", 's'))
+    return typy
+
+
+# Tabela z zakodowanych kolumn (kody, słownik bez braków). Nieznane wartości kategoryczne
+# są zgłaszane tu, raz na wartość słownika przy wczytaniu.
+def _from_encoded(zakodowane, typy):
+    typy = _complete_types(typy, len(zakodowane))
+    kolumny, slowniki = [], []
+    for (kody, slownik), (_, typ) in zip(zakodowane, typy):
+        if typ == 's':
+            for v in slownik:
+                if _parse_double(v) is None:
+                    _warn_unknown(v)
+            kolumny.append(kody)
+            slowniki.append(slownik)
+        else:
+            wartosci = np.array([string_to_double(v) for v in slownik] + [np.nan], dtype=np.float64)
+            kolumny.append(wartosci[kody])
+            slowniki.append(None)
+    return DecisionTable([n for n, _ in typy], [t for _, t in typy], kolumny, slowniki)
+
+
+def build_table(wiersze, typy=None):
+    if not wiersze:
+        raise ValueError("Pusta tabela")
+    liczba_kolumn = len(wiersze[0])
+    if any(len(wiersz) != liczba_kolumn for wiersz in wiersze):
+        raise ValueError("Wiersze mają różną liczbę kolumn")
+    return _from_encoded([encode_column(komorki) for komorki in zip(*wiersze)], typy)
+
+
+# Plik danych czytany przez mmap (tokenizer.tokenize), bez listy napisów dla każdej komórki
+def load_decision_table(sciezka_do_danych, sciezka_do_typow=None):
+    typy = read_attribute_types(sciezka_do_typow) if sciezka_do_typow else None
+    zakodowane = tokenize(sciezka_do_danych)
+    if not zakodowane:
+        raise ValueError("Pusta tabela")
+    return _from_encoded([_drop_missing(kody, slownik) for kody, slownik in zakodowane], typy)
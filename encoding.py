@@ -0,0 +1,120 @@
+import numpy as np
+
+
+class OneHotEncoder:
+    # drop: 'first' (pierwsza kategoria w porządku posortowanym), konkretna kategoria albo None
+    def __init__(self, drop='first', sparse=False, dtype=np.uint8):
+        self.drop = drop
+        self.sparse = sparse
+        self.dtype = dtype
+        self.categories_ = None
+        self._drop_index = None
+
+    def fit(self, values):
+        wartosci = np.asarray(values)
+        wartosci = wartosci[wartosci != ''] if wartosci.dtype.kind == 'U' else wartosci
+        self.categories_ = np.unique(wartosci)
+        if len(self.categories_) == 0:
+            raise ValueError("Brak kategorii do nauczenia")
+        if self.drop is None:
+            self._drop_index = None
+        elif self.drop == 'first':
+            self._drop_index = 0
+        else:
+            pozycja = np.flatnonzero(self.categories_ == self.drop)
+            if len(pozycja) == 0:
+                raise ValueError(f"Kategoria referencyjna {self.drop!r} nie występuje w danych")
+            self._drop_index = int(pozycja[0])
+        return self
+
+    def _check_fitted(self):
+        if self.categories_ is None:
+            raise ValueError("Koder nie został nauczony - wywołaj najpierw fit()")
+
+    def feature_names(self, prefix=None):
+        self._check_fitted()
+        nazwy = [str(c) for i, c in enumerate(self.categories_.tolist()) if i != self._drop_index]
+        return [f"{prefix}_{n}" for n in nazwy] if prefix else nazwy
+
+    @property
+    def n_features(self):
+        self._check_fitted()
+        return len(self.categories_) - (self._drop_index is not None)
+
+    # Pozycje kategorii dla każdej wartości; -1 dla wartości nieznanych i braków
+    def _positions(self, values):
+        wartosci = np.asarray(values)
+        pozycje = np.searchsorted(self.categories_, wartosci)
+        pozycje = np.minimum(pozycje, len(self.categories_) - 1)
+        return np.where(self.categories_[pozycje] == wartosci, pozycje, -1)
+
+    # Zamiana pozycji kategorii na numery kolumn wyniku (po usunięciu kolumny referencyjnej)
+    def _build(self, pozycje):
+        n = len(pozycje)
+        kolumny = pozycje.astype(np.intp)
+        if self._drop_index is not None:
+            kolumny = np.where(kolumny == self._drop_index, -1, kolumny - (kolumny > self._drop_index))
+        jest = kolumny >= 0
+        if self.sparse:
+            try:
+                from scipy import sparse
+            except ImportError:
+                raise ImportError("Tryb sparse wymaga pakietu scipy")
+            indptr = np.concatenate(([0], np.cumsum(jest)))
+            return sparse.csr_matrix(
+                (np.ones(int(jest.sum()), dtype=self.dtype), kolumny[jest], indptr),
+                shape=(n, self.n_features),
+            )
+        wynik = np.zeros((n, self.n_features), dtype=self.dtype)
+        wynik[np.flatnonzero(jest), kolumny[jest]] = 1
+        return wynik
+
+    def transform(self, values):
+        self._check_fitted()
+        return self._build(self._positions(values))
+
+    # Wariant dla kolumn już zakodowanych słownikiem (DecisionTable, CsvReader):
+    # tłumaczymy tylko słownik, a nie każdą komórkę
+    def transform_codes(self, codes, vocabulary):
+        self._check_fitted()
+        mapa = np.append(self._positions(np.asarray(vocabulary)), -1)  # kod BRAK = -1 -> ostatni element
+        return self._build(mapa[np.asarray(codes)])
+
+    def fit_transform(self, values):
+        return self.fit(values).transform(values)
+
+
+# Jeden koder na każdą kolumnę symboliczną tabeli decyzyjnej; wynik to sklejona macierz
+class TableOneHotEncoder:
+    def __init__(self, drop='first', columns=None, dtype=np.uint8):
+        self.drop = drop
+        self.columns = columns
+        self.dtype = dtype
+        self.encoders_ = None
+
+    def fit(self, table):
+        kolumny = self.columns
+        if kolumny is None:
+            kolumny = [n for n, t in zip(table.names, table.types) if t == 's']
+        self.encoders_ = {}
+        for name in kolumny:
+            j = table.names.index(name)
+            self.encoders_[name] = OneHotEncoder(drop=self.drop, dtype=self.dtype).fit(table.vocabularies[j])
+        return self
+
+    def feature_names(self):
+        if self.encoders_ is None:
+            raise ValueError("Koder nie został nauczony - wywołaj najpierw fit()")
+        return [n for name, enc in self.encoders_.items() for n in enc.feature_names(prefix=name)]
+
+    def transform(self, table):
+        if self.encoders_ is None:
+            raise ValueError("Koder nie został nauczony - wywołaj najpierw fit()")
+        czesci = []
+        for name, enc in self.encoders_.items():
+            j = table.names.index(name)
+            czesci.append(enc.transform_codes(table.columns[j], table.vocabularies[j]))
+        return np.hstack(czesci)
+
+    def fit_transform(self, table):
+        return self.fit(table).transform(table)
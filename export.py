@@ -0,0 +1,286 @@
+# Zapis przetworzonych danych (tabele, macierze po skalowaniu/uzupełnianiu/kodowaniu) do plików:
+# .npy, .npz, kolumnowy format binarny z nagłówkiem schematu (.ktab) i tekst (CSV albo kolumny
+# oddzielone spacjami). Dane zapisywane są fragmentami, więc cały wynik nie musi być w pamięci.
+# Fragment to macierz (wiersze x kolumny) albo lista kolumn (tablic 1-D tej samej długości).
+import json
+import os
+import struct
+
+import numpy as np
+
+from csv_reader import DEFAULT_CHUNK
+from decision_table import DecisionTable
+from pipeline import _chunks
+
+FORMAT_VERSION = 1
+# Plik .ktab: MAGIC, długość nagłówka (uint32), nagłówek JSON (nazwy, typy numpy, typy atrybutów,
+# słowniki), potem grupy wierszy: liczba wierszy (uint64), szerokości kolumn tekstowych w tej
+# grupie (uint32 na kolumnę) i kolejno bajty każdej kolumny
+MAGIC = b'KTAB\x00\x01\r\n'
+NPY_MAGIC = b'\x93NUMPY\x01\x00'
+# Zapas w nagłówku .npy na liczbę wierszy wpisywaną po zapisaniu wszystkich fragmentów
+NPY_RESERVE = 24
+
+
+def _columns(fragment):
+    if isinstance(fragment, np.ndarray):
+        return [fragment] if fragment.ndim == 1 else [fragment[:, j] for j in range(fragment.shape[1])]
+    return [np.asarray(kolumna) for kolumna in fragment]
+
+
+# Zapis do pliku tymczasowego i podmiana na końcu - przerwany zapis nie zostawia połowy pliku
+def _replace_when_done(sciezka, zapis):
+    tymczasowy = sciezka + '.tmp'
+    try:
+        with open(tymczasowy, 'wb') as f:
+            wynik = zapis(f)
+    except BaseException:
+        if os.path.exists(tymczasowy):
+            os.remove(tymczasowy)
+        raise
+    os.replace(tymczasowy, sciezka)
+    return wynik
+
+
+def _npy_header(dtype, shape, dlugosc=None):
+    slownik = repr({'descr': np.lib.format.dtype_to_descr(dtype), 'fortran_order': False, 'shape': shape})
+    naglowek = slownik.encode('latin1')
+    if dlugosc is None:
+        # Całość (10 bajtów stałych + słownik + '\n') wyrównana do 64 bajtów
+        dlugosc = (len(NPY_MAGIC) + 2 + len(naglowek) + NPY_RESERVE + 1 + 63) // 64 * 64
+    naglowek += b' ' * (dlugosc - len(NPY_MAGIC) - 2 - len(naglowek) - 1) + b'\n'
+    return NPY_MAGIC + struct.pack('<H', len(naglowek)) + naglowek
+
+
+# Macierz .npy z fragmentów: nagłówek z miejscem na liczbę wierszy, poprawiany na końcu
+# (fragmenty 1-D dają wektor o kształcie (n,))
+def write_npy(sciezka, fragmenty, dtype=None):
+    def zapis(f):
+        n, k, typ, dlugosc, wektor = 0, None, None, None, False
+        for fragment in fragmenty:
+            kolumny = _columns(fragment)
+            if k is None:
+                k = len(kolumny)
+                wektor = isinstance(fragment, np.ndarray) and fragment.ndim == 1
+                typ = np.dtype(dtype) if dtype is not None else np.result_type(*kolumny)
+                naglowek = _npy_header(typ, (0,) if wektor else (0, k))
+                dlugosc = len(naglowek)
+                f.write(naglowek)
+            elif len(kolumny) != k:
+                raise ValueError("Fragmenty mają różną liczbę kolumn")
+            macierz = np.empty((len(kolumny[0]), k), dtype=typ)
+            for j, kolumna in enumerate(kolumny):
+                macierz[:, j] = kolumna
+            f.write(macierz.tobytes())
+            n += len(macierz)
+        if k is None:
+            raise ValueError("Brak danych do zapisu")
+        f.seek(0)
+        f.write(_npy_header(typ, (n,) if wektor else (n, k), dlugosc))
+        return n
+    return _replace_when_done(sciezka, zapis)
+
+
+# Wiele tablic w jednym .npz; np.savez zapisuje każdą prosto do pliku zip, bez kopii w pamięci.
+# To jedyny format bez zapisu fragmentami - tablice muszą już być w pamięci (albo memmapami).
+def write_npz(sciezka, tablice, compressed=False):
+    zapis = np.savez_compressed if compressed else np.savez
+    return _replace_when_done(sciezka, lambda f: zapis(f, **tablice))
+
+
+# Kolumny tekstowe (U, S) mają szerokość zapisaną osobno w każdej grupie wierszy, więc
+# dłuższe napisy w późniejszych fragmentach nie są obcinane do szerokości z pierwszego
+def write_columnar(sciezka, fragmenty, names, types=None, vocabularies=None):
+    def zapis(f):
+        n, typy, tekstowe = 0, None, None
+        for fragment in fragmenty:
+            kolumny = _columns(fragment)
+            if len(kolumny) != len(names):
+                raise ValueError("Liczba kolumn fragmentu nie zgadza się z nazwami")
+            if typy is None:
+                typy = [kolumna.dtype.newbyteorder('<') for kolumna in kolumny]
+                naglowek = json.dumps({
+                    'version': FORMAT_VERSION, 'names': list(names),
+                    'dtypes': [t.str for t in typy], 'types': types, 'vocabularies': vocabularies,
+                }, ensure_ascii=False).encode('utf-8')
+                f.write(MAGIC + struct.pack('<I', len(naglowek)) + naglowek)
+                tekstowe = [j for j, t in enumerate(typy) if t.kind in 'US']
+            typy_grupy = list(typy)
+            for j in tekstowe:
+                # Szerokość z danych fragmentu (np.asarray z samym rodzajem typu, np. '<U')
+                typy_grupy[j] = np.asarray(kolumny[j], dtype=typy[j].str[:2]).dtype
+            f.write(struct.pack('<Q', len(kolumny[0])))
+            f.write(struct.pack(f'<{len(tekstowe)}I', *(int(typy_grupy[j].str[2:]) for j in tekstowe)))
+            for kolumna, typ in zip(kolumny, typy_grupy):
+                f.write(np.ascontiguousarray(kolumna, dtype=typ).tobytes())
+            n += len(kolumny[0])
+        if typy is None:
+            raise ValueError("Brak danych do zapisu")
+        return n
+    return _replace_when_done(sciezka, zapis)
+
+
+def _read_schema(f):
+    if f.read(len(MAGIC)) != MAGIC:
+        raise ValueError("To nie jest plik .ktab")
+    (dlugosc,) = struct.unpack('<I', f.read(4))
+    schemat = json.loads(f.read(dlugosc).decode('utf-8'))
+    if schemat.get('version') != FORMAT_VERSION:
+        raise ValueError(f"Nieobsługiwana wersja pliku .ktab: {schemat.get('version')}")
+    return schemat
+
+
+# Grupy wierszy pliku .ktab po kolei: (schemat, lista kolumn)
+def iter_columnar(sciezka):
+    with open(sciezka, 'rb') as f:
+        schemat = _read_schema(f)
+        typy = [np.dtype(t) for t in schemat['dtypes']]
+        tekstowe = [j for j, t in enumerate(typy) if t.kind in 'US']
+        while True:
+            dane = f.read(8)
+            if not dane:
+                break
+            (n,) = struct.unpack('<Q', dane)
+            typy_grupy = list(typy)
+            szerokosci = struct.unpack(f'<{len(tekstowe)}I', f.read(4 * len(tekstowe)))
+            for j, szerokosc in zip(tekstowe, szerokosci):
+                typy_grupy[j] = np.dtype(f"{typy[j].str[:2]}{szerokosc}")
+            yield schemat, [np.frombuffer(f.read(n * t.itemsize), dtype=t, count=n) for t in typy_grupy]
+
+
+def read_columnar(sciezka):
+    schemat = None
+    czesci = []
+    for schemat, kolumny in iter_columnar(sciezka):
+        czesci.append(kolumny)
+    if schemat is None:
+        with open(sciezka, 'rb') as f:
+            schemat = _read_schema(f)
+    if czesci:
+        kolumny = [np.concatenate(k) for k in zip(*czesci)]
+    else:
+        kolumny = [np.empty(0, dtype=t) for t in schemat['dtypes']]
+    return schemat, dict(zip(schemat['names'], kolumny))
+
+
+# Napisy kolumny tekstowej gotowe do zapisu. W CSV (separator nie jest białym znakiem) pola
+# z separatorem, cudzysłowem albo końcem linii trafiają w cudzysłów (z podwojonym '"'), jak
+# w module csv; w tekście rozdzielanym spacjami takich pól nie da się zapisać, więc są odrzucane.
+def _text_fields(kolumna, separator):
+    napisy = kolumna.astype(str)
+    if separator.strip():
+        specjalne = np.zeros(len(napisy), dtype=bool)
+        for znak in (separator, '"', '\n', '\r'):
+            specjalne |= np.char.find(napisy, znak) >= 0
+        if specjalne.any():
+            cytowane = np.char.add(np.char.add('"', np.char.replace(napisy, '"', '""')), '"')
+            napisy = np.where(specjalne, cytowane, napisy)
+        return napisy
+    zle = np.char.str_len(napisy) == 0
+    for znak in (' ', '\t', '\n', '\r', separator):
+        zle |= np.char.find(napisy, znak) >= 0
+    if zle.any():
+        raise ValueError(f"Wartość {str(napisy[zle][0])!r} jest pusta albo zawiera biały znak - "
+                         "nie da się jej zapisać w tekście rozdzielanym spacjami (użyj .csv)")
+    return napisy
+
+
+# Fragment jako tekst: jeden wzorzec wiersza powielony na cały fragment i jedno formatowanie %
+# zamiast wywołania format dla każdej komórki. Kolumny z brakami (NaN) formatowane są osobno
+# przez np.char.mod i dostają na_rep; napisy przechodzą przez _text_fields.
+def _format_chunk(kolumny, formaty, separator, na_rep):
+    n = len(kolumny[0])
+    if not n:
+        return ''
+    wartosci = np.empty((n, len(kolumny)), dtype=object)
+    wzorce = []
+    for j, (kolumna, fmt) in enumerate(zip(kolumny, formaty)):
+        if kolumna.dtype.kind == 'f':
+            braki = np.isnan(kolumna)
+            if braki.any():
+                kolumna = np.where(braki, na_rep, np.char.mod(fmt, kolumna))
+                fmt = '%s'
+        elif kolumna.dtype.kind in 'US':
+            kolumna = _text_fields(kolumna, separator)
+            fmt = '%s'
+        wartosci[:, j] = kolumna
+        wzorce.append(fmt)
+    wzorzec = separator.join(wzorce) + '\n'
+    return (wzorzec * n) % tuple(wartosci.ravel().tolist())
+
+
+# fmt: jeden format dla wszystkich kolumn liczbowych albo lista formatów kolumn
+def write_text(sciezka, fragmenty, names=None, delimiter=' ', fmt='%.6g', na_rep='?'):
+    def zapis(f):
+        n = 0
+        if names is not None:
+            f.write((delimiter.join(_text_fields(np.array(names), delimiter).tolist()) + '\n').encode('utf-8'))
+        for fragment in fragmenty:
+            kolumny = _columns(fragment)
+            formaty = [fmt] * len(kolumny) if isinstance(fmt, str) else fmt
+            f.write(_format_chunk(kolumny, formaty, delimiter, na_rep).encode('utf-8'))
+            n += len(kolumny[0])
+        return n
+    return _replace_when_done(sciezka, zapis)
+
+
+# Fragmenty tabeli decyzyjnej: kody i wartości liczbowe (decoded=False) albo napisy słownika
+# z '?' w miejscu braków (decoded=True), jak w pliku źródłowym
+def table_chunks(table, chunk_size=DEFAULT_CHUNK, decoded=False):
+    slowniki = [None if v is None else np.array(v + ['?']) for v in table.vocabularies]
+    for start in range(0, table.n_rows, chunk_size):
+        kolumny = []
+        for j in range(table.n_cols):
+            kolumna = table.columns[j][start:start + chunk_size]
+            if decoded and table.types[j] == 's':
+                kolumna = slowniki[j][kolumna]
+            kolumny.append(kolumna)
+        yield kolumny
+
+
+def matrix_chunks(macierz, chunk_size=DEFAULT_CHUNK):
+    for start in range(0, len(macierz), chunk_size):
+        yield macierz[start:start + chunk_size]
+
+
+# Zapis tabeli decyzyjnej albo macierzy w formacie wybranym po rozszerzeniu pliku:
+# .npy (macierz liczbowa), .npz (tablica na kolumnę, zapis w całości), .ktab, .csv (przecinki),
+# inne - tekst ze spacjami. Wynik: liczba zapisanych wierszy.
+def export(data, sciezka, names=None, chunk_size=DEFAULT_CHUNK, fmt='%.6g'):
+    rozszerzenie = os.path.splitext(sciezka)[1].lower()
+    tabela = isinstance(data, DecisionTable)
+    if tabela:
+        names = names or data.names
+    elif names is None:
+        names = [f"x{j + 1}" for j in range(1 if data.ndim == 1 else data.shape[1])]
+
+    if rozszerzenie == '.npy':
+        if tabela:
+            # Wartości liczbowe kolumn (jak DecisionTable.to_numeric), fragment po fragmencie
+            return write_npy(sciezka, _chunks(data, chunk_size)[0]())
+        return write_npy(sciezka, matrix_chunks(data, chunk_size))
+    if rozszerzenie == '.npz':
+        # Całe kolumny naraz (bez fragmentów); wynik jak w innych formatach - liczba wierszy
+        if not tabela:
+            write_npz(sciezka, {'data': data, 'names': np.array(names)})
+            return len(data)
+        tablice = dict(zip(names, data.columns))
+        tablice.update({f"vocabulary:{n}": np.array(v) for n, v in zip(names, data.vocabularies) if v is not None})
+        write_npz(sciezka, tablice)
+        return data.n_rows
+    if rozszerzenie == '.ktab':
+        if tabela:
+            return write_columnar(sciezka, table_chunks(data, chunk_size), names, data.types, data.vocabularies)
+        return write_columnar(sciezka, matrix_chunks(data, chunk_size), names)
+    separator = ',' if rozszerzenie == '.csv' else ' '
+    fragmenty = table_chunks(data, chunk_size, decoded=True) if tabela else matrix_chunks(data, chunk_size)
+    return write_text(sciezka, fragmenty, names if rozszerzenie == '.csv' else None, separator, fmt)
+
+
+# Tabela decyzyjna z pliku .ktab zapisanego przez export (kody i słowniki bez zmian)
+def load_columnar_table(sciezka):
+    schemat, kolumny = read_columnar(sciezka)
+    if schemat['types'] is None:
+        raise ValueError("Plik .ktab nie zawiera typów atrybutów tabeli decyzyjnej")
+    return DecisionTable(schemat['names'], schemat['types'], [kolumny[n] for n in schemat['names']],
+                         schemat['vocabularies'])
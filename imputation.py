@@ -0,0 +1,116 @@
+import numpy as np
+
+from decision_table import BRAK, DecisionTable
+
+STRATEGIES = ('mean', 'median', 'mode')
+
+
+def _mode(wartosci):
+    wartosci = wartosci[~np.isnan(wartosci)]
+    if len(wartosci) == 0:
+        return np.nan
+    unikalne, licznosci = np.unique(wartosci, return_counts=True)
+    return unikalne[np.argmax(licznosci)]
+
+
+class SimpleImputer:
+    # Braki to NaN w macierzy liczbowej; wartości zastępcze liczone raz na kolumnę w fit()
+    def __init__(self, strategy='mean'):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Nieznana strategia: {strategy}")
+        self.strategy = strategy
+        self.statistics_ = None
+
+    def fit(self, X):
+        X = np.asarray(X, dtype=np.float64)
+        if self.strategy == 'mean':
+            self.statistics_ = np.nanmean(X, axis=0)
+        elif self.strategy == 'median':
+            self.statistics_ = np.nanmedian(X, axis=0)
+        else:
+            self.statistics_ = np.array([_mode(X[:, j]) for j in range(X.shape[1])])
+        return self
+
+    # Wszystkie braki wypełniane jednym zapisem przez indeksowanie maską
+    def transform(self, X, copy=True):
+        if self.statistics_ is None:
+            raise ValueError("Imputer nie został nauczony - wywołaj najpierw fit()")
+        # copy=False: wypełnianie w miejscu, gdy X jest już tablicą float64 (inaczej i tak powstaje kopia)
+        X = np.array(X, dtype=np.float64) if copy else np.asarray(X, dtype=np.float64)
+        wiersze, kolumny = np.nonzero(np.isnan(X))
+        X[wiersze, kolumny] = self.statistics_[kolumny]
+        return X
+
+    def fit_transform(self, X, copy=True):
+        return self.fit(X).transform(X, copy=copy)
+
+
+# Wartość zastępcza dla każdej kolumny tabeli: dla kolumn symbolicznych najczęstszy kod,
+# dla liczbowych średnia/mediana/moda według strategii
+def fill_values(table, strategy='mean'):
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Nieznana strategia: {strategy}")
+    wartosci = []
+    for j in range(table.n_cols):
+        kolumna = table.columns[j]
+        if table.types[j] == 's':
+            licznosci = np.bincount(kolumna[kolumna != BRAK].astype(np.intp), minlength=len(table.vocabularies[j]))
+            wartosci.append(int(np.argmax(licznosci)) if licznosci.sum() else BRAK)
+        elif strategy == 'mean':
+            wartosci.append(float(np.nanmean(kolumna)) if (~np.isnan(kolumna)).any() else np.nan)
+        elif strategy == 'median':
+            wartosci.append(float(np.nanmedian(kolumna)) if (~np.isnan(kolumna)).any() else np.nan)
+        else:
+            wartosci.append(float(_mode(kolumna)))
+    return wartosci
+
+
+def fill_table(table, strategy='mean'):
+    zastepcze = fill_values(table, strategy)
+    kolumny = []
+    for j, kolumna in enumerate(table.columns):
+        braki = table.missing(j)
+        kolumny.append(np.where(braki, zastepcze[j], kolumna).astype(kolumna.dtype) if braki.any() else kolumna.copy())
+    return DecisionTable(list(table.names), list(table.types), kolumny, list(table.vocabularies))
+
+
+# n syntetycznych wierszy zapisywanych od razu do tablic docelowych:
+# 'impute' - wiersze złożone z wartości zastępczych (jak wiersze '?' uzupełnione fill_missing_values),
+# 'sample' - każda kolumna losowana niezależnie z rozkładu empirycznego (ew. w obrębie klasy decyzyjnej)
+def generate_rows(table, n, method='impute', strategy='mean', by_class=False, class_column=-1, seed=None, out=None):
+    if method not in ('impute', 'sample'):
+        raise ValueError(f"Nieznana metoda generowania: {method}")
+    if out is None:
+        out = [np.empty(n, dtype=kolumna.dtype) for kolumna in table.columns]
+    if method == 'impute':
+        for docelowa, wartosc in zip(out, fill_values(table, strategy)):
+            docelowa[:] = wartosc
+        return out
+
+    rng = np.random.default_rng(seed)
+    if by_class:
+        # Najpierw losujemy klasę (z jej częstością), a potem wiersze tylko z tej klasy
+        klasy = table.columns[class_column].astype(np.intp)
+        porzadek = np.argsort(klasy, kind='stable')
+        _, poczatki, licznosci = np.unique(klasy[porzadek], return_index=True, return_counts=True)
+        wylosowane = rng.choice(len(licznosci), size=n, p=licznosci / licznosci.sum())
+        start, rozmiar = poczatki[wylosowane], licznosci[wylosowane]
+    for docelowa, kolumna in zip(out, table.columns):
+        if by_class:
+            indeksy = porzadek[start + (rng.random(n) * rozmiar).astype(np.intp)]
+        else:
+            indeksy = rng.integers(0, table.n_rows, size=n)
+        np.take(kolumna, indeksy, out=docelowa)
+    return out
+
+
+# Tabela powiększona o ułamek nowych wierszy; kolumny alokowane raz na pełny rozmiar
+def expand_table(table, fraction=0.1, **kwargs):
+    n = int(table.n_rows * fraction)
+    kolumny = []
+    for kolumna in table.columns:
+        docelowa = np.empty(table.n_rows + n, dtype=kolumna.dtype)
+        docelowa[:table.n_rows] = kolumna
+        kolumny.append(docelowa)
+    generate_rows(table, n, out=[k[table.n_rows:] for k in kolumny], **kwargs)
+    return DecisionTable(list(table.names), list(table.types), kolumny, list(table.vocabularies))
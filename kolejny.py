@@ -1,46 +1,23 @@
+import argparse
 import numpy as np
 import pandas as pd
 import math
 from collections import defaultdict
+from decision_table import string_to_double
+from column_stats import describe, describe_by
+from encoding import OneHotEncoder
+from export import export
+from pipeline import Pipeline
+from imputation import expand_table
+from cache import load_decision_table_cached, read_csv_cached
+from report import Report
+from rough_sets import RoughSets
 
 class UniqueSet(set):
     def add(self, obj):
         if obj not in self:
             super().add(obj)
 
-def string_to_double(liczba):
-    liczba = liczba.strip()
-
-    if not liczba or liczba == "?":
-        return 0.0  # Zwracamy domyślną wartość dla brakujących danych
-
-    if 'more' in liczba:
-        try:
-            return float(liczba.split('more')[0].strip())
-        except:
-            return 0.0
-
-    try:
-        return float(liczba.replace(',', '.'))
-    except ValueError:
-        pass
-
-    categorical_map = {
-        'low': 1, 'med': 2, 'high': 3, 'vhigh': 4,
-        'small': 5, 'big': 6, 'unacc': 7, 'acc': 8,
-        'good': 9, 'vgood': 10
-    }
-
-    if liczba.lower() in categorical_map:
-        return categorical_map[liczba.lower()]
-    
-    print(f"OSTRZEŻENIE: Nieznana wartość kategoryczna: '{liczba}'. Zwracam 0.0")
-    return 0.0
-
-
-
-
-
 def string_to_int(liczba):
     try:
         return int(liczba.strip())
@@ -106,9 +83,19 @@ def get_unique_for_column(data, column):
         result.add(string_to_double(row[column]))
     return result
 
+# Różne wartości kolumny tabeli jako wyniki string_to_double (int dla kategorii z mapy, float dla
+# liczb) w kolejności pierwszego wystąpienia, razem z numerem wiersza tego wystąpienia
+def first_seen_values(tabela, j):
+    unikalne, pierwsze = np.unique(tabela.columns[j], return_index=True)
+    porzadek = np.argsort(pierwsze, kind='stable')
+    unikalne, pierwsze = unikalne[porzadek].tolist(), pierwsze[porzadek].tolist()
+    if tabela.types[j] == 's':
+        slownik = tabela.vocabularies[j] + ['?']
+        return [string_to_double(slownik[k]) for k in unikalne], pierwsze
+    return [0.0 if math.isnan(v) else v for v in unikalne], pierwsze
+
 def calculate_standard_deviation(data):
     numeric_data = list(map(string_to_double, data))
-    mean = np.mean(numeric_data)
     variance = np.var(numeric_data)
     return math.sqrt(variance)
 
@@ -149,7 +136,6 @@ def normalize(data):
 
 def calculate_variance(data):
     numeric_data = list(map(string_to_double, data))
-    mean = np.mean(numeric_data)
     variance = np.var(numeric_data)
     return variance
 
@@ -158,127 +144,114 @@ def variance(data):
     column_size = len(data[0])
     return [calculate_variance([data[i][j] for i in range(size)]) for j in range(column_size)]
 
-def main():
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Analiza tabeli decyzyjnej car.txt i pliku Churn_Modelling.csv")
+    parser.add_argument("--quiet", action="store_true", help="nic nie wypisuj na standardowe wyjście")
+    parser.add_argument("--summary-only", action="store_true", help="pomiń sekcje z wierszami danych")
+    parser.add_argument("--output", metavar="FILE", help="zapisz raport do pliku")
+    parser.add_argument("--limit", type=int, metavar="N", help="maksymalna liczba wierszy w sekcji")
+    parser.add_argument("--export", metavar="FILE",
+                        help="zapisz dane standaryzowane (.npy, .npz, .ktab, .csv albo tekst ze spacjami)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
     nazwa_pliku_z_danymi = 'car.txt'
     nazwa_pliku_z_typami_atrybutow = 'car-type.txt'
 
-    wczytane_dane = string_to_tablica(nazwa_pliku_z_danymi)
-    atr_type = string_to_tablica(nazwa_pliku_z_typami_atrybutow)
+    with Report(args.output, quiet=args.quiet, summary_only=args.summary_only, row_limit=args.limit) as raport:
+        tabela = load_decision_table_cached(nazwa_pliku_z_danymi, nazwa_pliku_z_typami_atrybutow)
+        atr_type = string_to_tablica(nazwa_pliku_z_typami_atrybutow)
+
+        if raport.data_enabled:
+            raport.rows("Dane systemu", tabela.rows())
+        raport.rows("\nDane pliku z typami", atr_type)
 
-    print("Dane systemu")
-    for row in wczytane_dane:
-        print(" ".join(row))
+        decision_class_map = {
+            7: 'unacc',  # "unacceptable"
+            8: 'acc',    # "acceptable"
+            9: 'good',   # "good"
+            10: 'vgood'  # "very good"
+        }
 
-    print("\nDane pliku z typami")
-    for row in atr_type:
-        print(" ".join(row))
+        # Wszystkie statystyki kolumn w jednym przebiegu
+        statystyki = describe(tabela)
 
-    decision_class_map = {
-        7: 'unacc',  # "unacceptable"
-        8: 'acc',    # "acceptable"
-        9: 'good',   # "good"
-        10: 'vgood'  # "very good"
-    }
+        # Wartości kolumn w postaci i kolejności jak przy zbieraniu ich wiersz po wierszu do UniqueSet
+        wartosci_kolumn = [first_seen_values(tabela, j) for j in range(tabela.n_cols)]
 
-    decision_classes = get_unique_for_column(wczytane_dane, len(wczytane_dane[0]) - 1)  # Ostatnia kolumna to klasy decyzyjne
-    print("\nDostępne klasy decyzyjne:")
-    for class_value in decision_classes:
+        decision_classes = UniqueSet(wartosci_kolumn[-1][0])  # Ostatnia kolumna to klasy decyzyjne
         # Wypisujemy nazwę klasy zamiast liczby
-        print(decision_class_map.get(class_value, f"Nieznana klasa: {class_value}"))
-
-    # Miejsce na rozwiązanie:
-    print("Wielkości klas decyzyjnych")
-    print(len(wczytane_dane))
-
-    min_result = find_min(wczytane_dane)
-    print("Minimalne:")
-    for item in min_result:
-        print(item)
-
-    max_result = find_max(wczytane_dane)
-    print("Maksymalne:")
-    for item in max_result:
-        print(item)
-
-    # Lista unikalnych wartości
-    uniq = get_unique(wczytane_dane)
-    print("Unikalne")
-    for item in uniq:
-        print(item)
-
-    # Poszczególne unikalne wartości
-    for i in range(len(wczytane_dane[0])):
-        unique_for_column = get_unique_for_column(wczytane_dane, i)
-        for item in unique_for_column:
-            print(item)
-        print(f"Liczba wszystkich: {len(unique_for_column)}")
-        print("--------------------------")
-
-    # Odchylenie standardowe
-    for i in range(len(wczytane_dane[0])):
-        data = [wczytane_dane[j][i] for j in range(len(wczytane_dane))]
-        standard_deviation = calculate_standard_deviation(data)
-        print(standard_deviation)
-
-    # Zadanie 4 i 5: Generowanie 10% więcej danych
-    original_rows = len(wczytane_dane)
-    cols = len(wczytane_dane[0])
-    extra_rows = original_rows // 10
-    new_rows = original_rows + extra_rows
-
-    expanded_data = wczytane_dane + [['?'] * cols for _ in range(extra_rows)]
-    fill_missing_values(expanded_data) 
-
-    normalized_data = normalize_into_intervals(wczytane_dane, -1, 1)
-    print("Dane znormalizowane na przedział <-1, 1>")
-    for row in normalized_data:
-        print(" ".join(row))
-
-    normalized_data2 = normalize_into_intervals(wczytane_dane, 0, 1)
-    print("Dane znormalizowane na przedział <0, 1>")
-    for row in normalized_data2:
-        print(" ".join(row))
-
-    normalized_data3 = normalize_into_intervals(wczytane_dane, -10, 10)
-    print("Dane znormalizowane na przedział <-10, 10>")
-    for row in normalized_data3:
-        print(" ".join(row))
-
-    normalized_data4 = normalize(wczytane_dane)
-    print("Dane znormalizowane")
-    for row in normalized_data4:
-        print(" ".join([f"{float(val):.2f}" for val in row]))
-
-    average_values = avg(normalized_data4)
-    print(" ".join(map(str, average_values)))
-
-    variances = variance(normalized_data4)
-    print(" ".join(map(str, variances)))
-
-    #Wczytanie pliku CSV
-    readable_data = []
-    geography_values = UniqueSet()
-    with open("Churn_Modelling.csv", 'r') as file:
-        header_line = file.readline().strip()
-        headers = header_line.split(',')
-
-        for line in file:
-            values = line.strip().split(',')
-            row_dict = {headers[i]: values[i] if i < len(values) else "MISSING" for i in range(len(headers))}
-            geography_values.add(values[headers.index("Geography")])
-            readable_data.append(row_dict)
-
-    # Tworzenie dummy attributes dla kolumny Geography
-    for row in readable_data:
-        for country in geography_values:
-            row[country] = "1" if row["Geography"] == country else "0"
-        del row["Geography"]
-        del row[list(geography_values)[0]]  # Usunięcie jednego z dummy attributes
-
-    for row in readable_data:
-        for kvp in row.items():
-            print(f"{kvp[0]}: {kvp[1]} ", end="")
-        print()
+        raport.values("\nDostępne klasy decyzyjne:",
+                      [decision_class_map.get(c, f"Nieznana klasa: {c}") for c in decision_classes])
+
+        # Liczności i statystyki każdej klasy decyzyjnej w jednym grupowaniu
+        statystyki_klas = describe_by(tabela)
+        raport.values("Wielkości klas decyzyjnych",
+                      [f"{klasa}: {n}" for (klasa,), n in zip(statystyki_klas.keys, statystyki_klas.size.tolist())])
+
+        # Zbiory przybliżone: zależność decyzji od atrybutów, redukt i rdzeń
+        przyblizenia = RoughSets(tabela)
+        raport.values("Stopień zależności decyzji:", [przyblizenia.dependency()])
+        raport.values("Redukt:", przyblizenia.reduct())
+        raport.values("Rdzeń:", przyblizenia.core())
+
+        # Minimum i maksimum wypisywane w postaci z string_to_double (np. 1 dla 'low', 2.0 dla '2')
+        postaci = [{float(v): v for v in wartosci} for wartosci, _ in wartosci_kolumn]
+        raport.values("Minimalne:", [p.get(v, v) for p, v in zip(postaci, statystyki.min.tolist())])
+        raport.values("Maksymalne:", [p.get(v, v) for p, v in zip(postaci, statystyki.max.tolist())])
+
+        # Lista unikalnych wartości: pierwsze wystąpienia w kolejności wiersz po wierszu
+        wystapienia = sorted((wiersz, j, v) for j, (wartosci, wiersze) in enumerate(wartosci_kolumn)
+                             for v, wiersz in zip(wartosci, wiersze))
+        raport.values("Unikalne", UniqueSet(v for _, _, v in wystapienia))
+
+        # Poszczególne unikalne wartości
+        for wartosci, _ in wartosci_kolumn:
+            unique_for_column = UniqueSet(wartosci)
+            raport.text(*unique_for_column, f"Liczba wszystkich: {len(unique_for_column)}",
+                        "--------------------------")
+
+        # Odchylenie standardowe
+        raport.text(*statystyki.std.tolist())
+
+        # Zadanie 4 i 5: Generowanie 10% więcej danych
+        # Nowe wiersze od razu uzupełnione wartościami zastępczymi (moda dla kolumn symbolicznych)
+        expanded_data = expand_table(tabela, fraction=0.1)
+
+        # Skalowanie zawsze na danych źródłowych; min/max i odchylenia są już w statystykach.
+        # Potok liczy macierze jednym przebiegiem po fragmentach i tylko wtedy, gdy trafią do raportu.
+        potok = Pipeline(tabela)
+        zrodlo = potok.source()
+        przedzialy = [(-1, 1), (0, 1), (-10, 10)]
+        if raport.data_enabled:
+            for a, b in przedzialy:
+                potok.materialize(f"Dane znormalizowane na przedział <{a}, {b}>", zrodlo.minmax((a, b)))
+            potok.materialize("Dane znormalizowane", zrodlo.standardize())
+        potok.summarize("standaryzacja", zrodlo.standardize())
+        if args.export:
+            potok.materialize("eksport", zrodlo.standardize())
+        wyniki = potok.run(stats=statystyki)
+        for tytul, macierz in wyniki.items():
+            if tytul not in ("standaryzacja", "eksport"):
+                raport.matrix(tytul, macierz)
+        if args.export:
+            export(wyniki["eksport"], args.export, names=tabela.names, fmt='%.17g')
+
+        raport.text(" ".join(map(str, wyniki["standaryzacja"]['mean'].tolist())))
+        raport.text(" ".join(map(str, wyniki["standaryzacja"]['variance'].tolist())))
+
+        #Wczytanie pliku CSV
+        reader, churn = read_csv_cached("Churn_Modelling.csv")
+
+        # Tworzenie dummy attributes dla kolumny Geography (pierwszy kraj alfabetycznie jest usuwany)
+        geography = OneHotEncoder(drop='first').fit(reader.vocabularies["Geography"])
+        dummies = geography.transform_codes(churn["Geography"], reader.vocabularies["Geography"])
+
+        if raport.data_enabled:
+            headers = [h for h in reader.headers if h != "Geography"]
+            columns = [reader.decode(churn, h) for h in headers] + [dummies[:, k].tolist() for k in range(geography.n_features)]
+            raport.records(None, headers + geography.feature_names(), columns)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,245 @@
+# Addytywne rozłączne bazy wzorców (pattern databases) dla N-puzzle.
+# Każda baza to najmniejsza liczba ruchów klocków swojej grupy potrzebna do ustawienia
+# ich na miejscach docelowych (ruchy pozostałych klocków są darmowe), dla każdego
+# rozmieszczenia tych klocków. Grupy są rozłączne, więc suma baz nie przeszacowuje.
+import mmap
+import os
+import tempfile
+
+import numpy as np
+
+from puzzle import Plansza
+
+NIEZNANA = 255
+
+# Domyślne podziały klocków na grupy (15-puzzle: 5-5-5, 24-puzzle: sześć grup po 4).
+# Podziały 15 i 24 są symetryczne względem przekątnej (transpozycja przeprowadza grupy
+# na grupy), więc wartość lustrzana jest w miarę niezależna od zwykłej.
+DOMYSLNE_GRUPY = {
+    3: [(1, 2, 3, 4), (5, 6, 7, 8)],
+    4: [(2, 3, 4, 7, 8), (5, 9, 13, 10, 14), (1, 6, 11, 12, 15)],
+    5: [(2, 3, 4, 5), (6, 11, 16, 21), (8, 9, 10, 15), (12, 17, 22, 23), (1, 7, 13, 19), (14, 18, 20, 24)],
+}
+
+
+def cache_dir_for(bok):
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), f"pdb{bok}.cache")
+
+
+# Indeks rozmieszczenia: pozycje klocków grupy jako cyfry w systemie o podstawie n
+# (pierwszy klocek to najmniej znacząca cyfra). Nie jest to ranking bez dziur,
+# ale pozwala aktualizować indeks jednym dodawaniem, gdy klocek się przesuwa.
+def _wagi(n, k):
+    return [n ** i for i in range(k)]
+
+
+# BFS 0-1 po stanach (pozycje klocków grupy, pozycja pustego pola), wektorowo poziomami:
+# najpierw domknięcie poziomu d ruchami darmowymi (puste pole zamienia się z klockiem
+# spoza grupy), potem ruchy klockami grupy dają poziom d + 1. Na końcu minimum po
+# pozycji pustego pola.
+def build(plansza, klocki):
+    n, k = plansza.n, len(klocki)
+    if n ** (k + 1) > 1 << 31:
+        raise ValueError(f"Grupa {len(klocki)} klocków jest za duża dla planszy {plansza.bok}x{plansza.bok}")
+    cel = plansza.cel
+    # Indeks stanu: puste + n * (p0 + n * (p1 + ...))
+    sasiedzi = np.full((n, 4), -1, dtype=np.int64)
+    for pozycja, lista in enumerate(plansza.sasiedzi):
+        for i, (nowa, _) in enumerate(lista):
+            sasiedzi[pozycja, i] = nowa
+    potegi = np.array([n ** (i + 1) for i in range(k)], dtype=np.int64)
+
+    odleglosci = np.full(n ** (k + 1), NIEZNANA, dtype=np.uint8)
+    start = cel.index(0) + sum(cel.index(t) * int(w) for t, w in zip(klocki, potegi))
+    odleglosci[start] = 0
+    poziom_stany = np.array([start], dtype=np.int64)
+    d = 0
+    while len(poziom_stany):
+        # Domknięcie poziomu ruchami darmowymi
+        caly_poziom = [poziom_stany]
+        nowe = poziom_stany
+        while len(nowe):
+            kolejne = []
+            for puste, pozycje, indeksy in _rozloz(nowe, n, k, potegi):
+                for kierunek in range(4):
+                    cel_pustego = sasiedzi[puste, kierunek]
+                    wolne = (cel_pustego >= 0) & ~(pozycje == cel_pustego[:, None]).any(axis=1)
+                    kolejne.append(indeksy[wolne] - puste[wolne] + cel_pustego[wolne])
+            nowe = np.unique(np.concatenate(kolejne)) if kolejne else np.empty(0, dtype=np.int64)
+            nowe = nowe[odleglosci[nowe] == NIEZNANA]
+            odleglosci[nowe] = d
+            caly_poziom.append(nowe)
+        poziom_stany = np.concatenate(caly_poziom)
+
+        # Ruchy klockami grupy: klocek wchodzi na miejsce pustego pola
+        kolejne = []
+        for puste, pozycje, indeksy in _rozloz(poziom_stany, n, k, potegi):
+            for kierunek in range(4):
+                cel_pustego = sasiedzi[puste, kierunek]
+                for i in range(k):
+                    trafione = pozycje[:, i] == cel_pustego
+                    kolejne.append(
+                        indeksy[trafione] + (cel_pustego[trafione] - puste[trafione])
+                        + (puste[trafione] - cel_pustego[trafione]) * potegi[i])
+        d += 1
+        nowe = np.unique(np.concatenate(kolejne)) if kolejne else np.empty(0, dtype=np.int64)
+        nowe = nowe[odleglosci[nowe] == NIEZNANA]
+        odleglosci[nowe] = d
+        poziom_stany = nowe
+
+    return odleglosci.reshape(-1, n).min(axis=1)
+
+
+# Rozkład indeksów na pozycję pustego pola i pozycje klocków - fragmentami, żeby
+# tablice pomocnicze nie rosły z rozmiarem poziomu
+def _rozloz(indeksy, n, k, potegi, fragment=1 << 20):
+    for start in range(0, len(indeksy), fragment):
+        czesc = indeksy[start:start + fragment]
+        pozycje = (czesc[:, None] // potegi[None, :]) % n
+        yield czesc % n, pozycje, czesc
+
+
+class PatternDatabase:
+    def __init__(self, bok, klocki, tablica):
+        self.bok = bok
+        self.klocki = tuple(klocki)
+        # Bajty bazy (np.memmap albo memoryview na mmap pliku) indeksowane _wagi
+        self.tablica = tablica
+
+    @staticmethod
+    def path(katalog, bok, klocki):
+        return os.path.join(katalog, f"{bok}x{bok}_{'-'.join(map(str, klocki))}.pdb")
+
+    @classmethod
+    def build(cls, plansza, klocki):
+        return cls(plansza.bok, klocki, memoryview(build(plansza, klocki).tobytes()))
+
+    # Zapis do unikalnego pliku tymczasowego w tym samym katalogu i podmiana - procesy budujące
+    # tę samą bazę jednocześnie nie piszą do jednego pliku i nie podmieniają niepełnej bazy
+    def save(self, sciezka):
+        katalog = os.path.dirname(sciezka) or '.'
+        os.makedirs(katalog, exist_ok=True)
+        deskryptor, tymczasowy = tempfile.mkstemp(dir=katalog, prefix=os.path.basename(sciezka) + '.', suffix='.tmp')
+        try:
+            with os.fdopen(deskryptor, 'wb') as f:
+                f.write(self.tablica)
+            os.replace(tymczasowy, sciezka)
+        except BaseException:
+            if os.path.exists(tymczasowy):
+                os.remove(tymczasowy)
+            raise
+
+    # Baza z dysku przez mmap - strony trafiają do pamięci dopiero przy odczycie,
+    # a kilka procesów korzysta z tej samej kopii w pamięci podręcznej systemu
+    @classmethod
+    def load(cls, sciezka, bok, klocki):
+        with open(sciezka, 'rb') as f:
+            mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(mapa) != (bok * bok) ** len(klocki):
+            raise ValueError(f"Niepoprawny rozmiar bazy wzorców: {sciezka}")
+        return cls(bok, klocki, memoryview(mapa))
+
+    @classmethod
+    def load_or_build(cls, plansza, klocki, katalog=None):
+        sciezka = cls.path(katalog or cache_dir_for(plansza.bok), plansza.bok, klocki)
+        if not os.path.exists(sciezka):
+            cls.build(plansza, klocki).save(sciezka)
+        return cls.load(sciezka, plansza.bok, klocki)
+
+
+# Transpozycja planszy: pozycja (w, k) -> (k, w) i klocek z celu na tej pozycji
+def _transpozycja(plansza):
+    bok = plansza.bok
+    pozycje = [(p % bok) * bok + p // bok for p in range(plansza.n)]
+    klocki = [0] * plansza.n
+    for p, t in enumerate(plansza.cel):
+        klocki[t] = plansza.cel[pozycje[p]]
+    return pozycje, klocki
+
+
+# Heurystyka dla puzzle.szukaj_rozwiazania / szukaj_ida: suma baz wszystkich grup.
+# Jest dopuszczalna, ale nie spójna (minimum po pustym polu i maksimum z odbiciem potrafią
+# zmienić h o więcej niż 1 na jeden ruch) - szukaj_rozwiazania ponownie otwiera wtedy stany
+# zamknięte, więc ścieżka nadal jest optymalna.
+# Indeks każdej grupy aktualizowany jest jednym dodawaniem przy ruchu jej klocka.
+# Przy lustro=True liczona jest też suma dla stanu odbitego względem przekątnej (ma tę
+# samą odległość od celu; te same bazy, inne indeksy) i brane jest większe z dwóch h.
+class AdditivePDB:
+    def __init__(self, plansza, grupy=None, katalog=None, lustro=True):
+        if grupy is None:
+            grupy = DOMYSLNE_GRUPY[plansza.bok]
+        wszystkie = [t for grupa in grupy for t in grupa]
+        if len(set(wszystkie)) != len(wszystkie):
+            raise ValueError("Grupy klocków muszą być rozłączne")
+        if sorted(wszystkie) != list(range(1, plansza.n)):
+            raise ValueError("Grupy muszą obejmować wszystkie klocki")
+        self.bazy = [PatternDatabase.load_or_build(plansza, grupa, katalog).tablica for grupa in grupy]
+        # Dla każdego klocka: numer grupy i waga jego pozycji w indeksie grupy
+        self.grupa = [0] * plansza.n
+        self.waga = [0] * plansza.n
+        for g, grupa in enumerate(grupy):
+            for t, w in zip(grupa, _wagi(plansza.n, len(grupa))):
+                self.grupa[t], self.waga[t] = g, w
+        self.pozycje_odbite, self.klocki_odbite = _transpozycja(plansza)
+        self.lustro = lustro
+        self.indeksy = [0] * len(grupy)
+        self.indeksy_odbite = [0] * len(grupy)
+        self.suma = self.suma_odbita = self.h = 0
+
+    def _indeksy(self, stan):
+        indeksy = [0] * len(self.bazy)
+        for pozycja, klocek in enumerate(stan):
+            if klocek:
+                indeksy[self.grupa[klocek]] += pozycja * self.waga[klocek]
+        return indeksy
+
+    def _odbity(self, stan):
+        odbity = [0] * len(stan)
+        for pozycja, klocek in enumerate(stan):
+            odbity[self.pozycje_odbite[pozycja]] = self.klocki_odbite[klocek]
+        return odbity
+
+    def _suma(self, indeksy):
+        return sum(baza[i] for baza, i in zip(self.bazy, indeksy))
+
+    def oblicz(self, stan):
+        h = self._suma(self._indeksy(stan))
+        if self.lustro:
+            h = max(h, self._suma(self._indeksy(self._odbity(stan))))
+        return h
+
+    def inicjuj(self, stan):
+        self.indeksy = self._indeksy(stan)
+        self.suma = self.h = self._suma(self.indeksy)
+        if self.lustro:
+            self.indeksy_odbite = self._indeksy(self._odbity(stan))
+            self.suma_odbita = self._suma(self.indeksy_odbite)
+            self.h = max(self.suma, self.suma_odbita)
+        return self.h
+
+    def przesun(self, klocek, z, do):
+        g = self.grupa[klocek]
+        baza = self.bazy[g]
+        stary = self.indeksy[g]
+        nowy = stary + (do - z) * self.waga[klocek]
+        self.indeksy[g] = nowy
+        self.suma += baza[nowy] - baza[stary]
+        if not self.lustro:
+            self.h = self.suma
+            return self.h
+        klocek = self.klocki_odbite[klocek]
+        g = self.grupa[klocek]
+        baza = self.bazy[g]
+        stary = self.indeksy_odbite[g]
+        nowy = stary + (self.pozycje_odbite[do] - self.pozycje_odbite[z]) * self.waga[klocek]
+        self.indeksy_odbite[g] = nowy
+        self.suma_odbita += baza[nowy] - baza[stary]
+        self.h = max(self.suma, self.suma_odbita)
+        return self.h
+
+    def cofnij(self, klocek, z, do):
+        return self.przesun(klocek, do, z)
+
+
+def heurystyka_dla(bok, grupy=None, katalog=None, lustro=True):
+    return AdditivePDB(Plansza(bok), grupy, katalog, lustro)
@@ -0,0 +1,237 @@
+# Leniwy potok przetwarzania tabeli liczbowej: kroki (uzupełnianie braków, skalowanie
+# min-max, standaryzacja) są tylko zapisywane, a wykonuje je dopiero Pipeline.run.
+# Każdy łańcuch kroków sprowadza się do jednego przekształcenia kolumn: wstawienie wartości
+# w miejsce braków i x * a + b, z parametrami wyliczonymi ze statystyk źródła (statystyki
+# po każdym kroku wynikają z poprzednich, bez ponownego czytania danych). Wykonanie to
+# najwyżej dwa przebiegi po fragmentach źródła: statystyki (pomijany, gdy są podane albo
+# niepotrzebne) i jeden wspólny przebieg zapisujący wszystkie żądane macierze. W pamięci
+# jest jeden fragment i wyniki, a nie kopie całej tabeli po każdym kroku.
+import numpy as np
+
+from column_stats import DEFAULT_CHUNK
+from decision_table import DecisionTable
+from running_stats import _chan
+
+
+# Źródło jako funkcja zwracająca iterator fragmentów (macierze wiersze x kolumny float64)
+def _chunks(source, chunk_size):
+    if isinstance(source, DecisionTable):
+        def fragmenty():
+            for start in range(0, source.n_rows, chunk_size):
+                fragment = np.empty((min(chunk_size, source.n_rows - start), source.n_cols))
+                for j in range(source.n_cols):
+                    kolumna = source.columns[j][start:start + chunk_size]
+                    fragment[:, j] = kolumna if source.types[j] == 'n' else source.value_lookup(j)[kolumna]
+                yield fragment
+        return fragmenty, source.n_rows
+    if isinstance(source, np.ndarray):
+        macierz = source[:, None] if source.ndim == 1 else source
+        return (lambda: (macierz[s:s + chunk_size].astype(np.float64, copy=False)
+                         for s in range(0, len(macierz), chunk_size))), len(macierz)
+    if callable(source):
+        return source, None
+    raise ValueError("Źródło potoku musi być DecisionTable, macierzą numpy albo funkcją zwracającą fragmenty")
+
+
+class Node:
+    def __init__(self, pipeline, steps=()):
+        self.pipeline = pipeline
+        self.steps = steps
+
+    def _then(self, *krok):
+        return Node(self.pipeline, self.steps + (krok,))
+
+    # strategy: 'mean' albo 'constant' (z value)
+    def impute(self, strategy='mean', value=None):
+        if strategy not in ('mean', 'constant'):
+            raise ValueError(f"Nieznana strategia uzupełniania w potoku: {strategy}")
+        if strategy == 'constant' and value is None:
+            raise ValueError("Strategia 'constant' wymaga wartości")
+        return self._then('impute', strategy, value)
+
+    def minmax(self, feature_range=(0, 1)):
+        a, b = feature_range
+        return self._then('minmax', float(a), float(b))
+
+    def standardize(self):
+        return self._then('standardize')
+
+    def __repr__(self):
+        return " -> ".join(['source'] + [f"{k[0]}{k[1:] if len(k) > 1 else ''}" for k in self.steps])
+
+
+# Statystyki kolumn po krokach: liczba obecnych wartości, średnia, wariancja populacyjna, min, max
+class _Stats:
+    def __init__(self, n, count, mean, variance, minimum, maximum):
+        self.n = n
+        self.count = count
+        self.mean = mean
+        self.variance = variance
+        self.min = minimum
+        self.max = maximum
+
+    def affine(self, a, b):
+        return _Stats(self.n, self.count, self.mean * a + b, self.variance * a * a,
+                      np.minimum(self.min * a + b, self.max * a + b), np.maximum(self.min * a + b, self.max * a + b))
+
+    # Braki zastąpione wartością: dochodzi grupa n - count wierszy o zerowej wariancji
+    def fill(self, wartosc):
+        braki = self.n - self.count
+        n, srednia, m2 = _chan(self.count, self.mean, self.variance * self.count,
+                               braki, wartosc, np.zeros_like(self.mean))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            wariancja = m2 / n
+        jest = braki > 0
+        return _Stats(self.n, n, srednia, wariancja,
+                      np.where(jest, np.fmin(self.min, wartosc), self.min),
+                      np.where(jest, np.fmax(self.max, wartosc), self.max))
+
+    def summary(self):
+        return {'count': self.count, 'mean': self.mean, 'variance': self.variance,
+                'std': np.sqrt(self.variance), 'min': self.min, 'max': self.max}
+
+
+# Złożenie kroków węzła w jedno przekształcenie: wartość dla braków (w jednostkach źródła,
+# NaN - bez uzupełniania), a, b i statystyki wyniku
+def _fuse(steps, stats):
+    k = len(stats.mean)
+    wypelnienie = np.full(k, np.nan)
+    a, b = np.ones(k), np.zeros(k)
+    for krok in steps:
+        if krok[0] == 'impute':
+            wartosc = stats.mean if krok[1] == 'mean' else np.full(k, float(krok[2]))
+            # Wartość podana po przekształceniu, więc cofamy je (a == 0: wynik i tak równy b)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                zrodlowa = np.where(a != 0, (wartosc - b) / a, 0.0)
+            wypelnienie = np.where(np.isnan(wypelnienie), zrodlowa, wypelnienie)
+            stats = stats.fill(wartosc)
+            continue
+        if krok[0] == 'minmax':
+            # Kolumny stałe (min == max) zostają bez zmian, jak w scalers.MinMaxScaler
+            rozpietosc = stats.max - stats.min
+            stala = rozpietosc == 0
+            skala = np.where(stala, 1.0, (krok[2] - krok[1]) / np.where(stala, 1.0, rozpietosc))
+            przesuniecie = np.where(stala, 0.0, krok[1] - stats.min * skala)
+        else:
+            odchylenie = np.sqrt(stats.variance)
+            stala = odchylenie == 0
+            skala = np.where(stala, 1.0, 1 / np.where(stala, 1.0, odchylenie))
+            przesuniecie = np.where(stala, 0.0, -stats.mean * skala)
+        a, b = a * skala, b * skala + przesuniecie
+        stats = stats.affine(skala, przesuniecie)
+    return wypelnienie, a, b, stats
+
+
+class Pipeline:
+    def __init__(self, source, chunk_size=DEFAULT_CHUNK):
+        self.chunk_size = chunk_size
+        self._fragmenty, self.n_rows = _chunks(source, chunk_size)
+        self._wyjscia = {}
+
+    def source(self):
+        return Node(self)
+
+    # Macierz wartości węzła (wiersze x kolumny)
+    def materialize(self, name, node):
+        self._wyjscia[name] = ('matrix', node)
+        return self
+
+    # Statystyki kolumn węzła (count, mean, variance, std, min, max) - bez liczenia macierzy
+    def summarize(self, name, node):
+        self._wyjscia[name] = ('summary', node)
+        return self
+
+    def _needs_stats(self):
+        return self.n_rows is None or any(
+            krok[0] != 'impute' or krok[1] == 'mean'
+            for _, wezel in self._wyjscia.values() for krok in wezel.steps
+        ) or any(rodzaj == 'summary' for rodzaj, _ in self._wyjscia.values())
+
+    # Przebieg statystyk: liczność, średnia i M2 łączone między fragmentami wzorami Chana
+    def _scan(self):
+        n = 0
+        licznosc = srednia = m2 = minimum = maksimum = None
+        for fragment in self._fragmenty():
+            obecne = ~np.isnan(fragment)
+            c = obecne.sum(axis=0)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                s = np.where(obecne, fragment, 0.0).sum(axis=0) / c
+                m = np.where(obecne, fragment - s, 0.0)
+            m = (m * m).sum(axis=0)
+            lo = np.where(obecne, fragment, np.inf).min(axis=0, initial=np.inf)
+            hi = np.where(obecne, fragment, -np.inf).max(axis=0, initial=-np.inf)
+            if licznosc is None:
+                licznosc, srednia, m2, minimum, maksimum = c, s, m, lo, hi
+            else:
+                licznosc, srednia, m2 = _chan(licznosc, srednia, m2, c, s, m)
+                minimum, maksimum = np.minimum(minimum, lo), np.maximum(maksimum, hi)
+            n += len(fragment)
+        if licznosc is None:
+            raise ValueError("Puste źródło potoku")
+        with np.errstate(invalid='ignore', divide='ignore'):
+            wariancja = m2 / licznosc
+        brak = licznosc == 0
+        minimum, maksimum = np.where(brak, np.nan, minimum), np.where(brak, np.nan, maksimum)
+        return _Stats(n, licznosc, srednia, wariancja, minimum, maksimum)
+
+    # Statystyki z column_stats.describe (albo RunningStats.to_column_stats) zamiast przebiegu
+    @staticmethod
+    def _from_column_stats(stats):
+        licznosc = np.asarray(stats.count, dtype=np.int64)
+        return _Stats(int(licznosc[0] + stats.missing[0]), licznosc, np.asarray(stats.mean, dtype=np.float64),
+                      np.asarray(stats.variance, dtype=np.float64), np.asarray(stats.min, dtype=np.float64),
+                      np.asarray(stats.max, dtype=np.float64))
+
+    def _plan(self, stats):
+        plan = {}
+        for nazwa, (rodzaj, wezel) in self._wyjscia.items():
+            if stats is None:
+                # Tylko stałe uzupełnianie: parametry nie zależą od danych
+                k = len(next(self._fragmenty())[0])
+                stats = _Stats(self.n_rows, np.zeros(k), np.zeros(k), np.zeros(k), np.zeros(k), np.zeros(k))
+            plan[nazwa] = (rodzaj, wezel) + _fuse(wezel.steps, stats)
+        return plan
+
+    # Opis wykonania: liczba przebiegów i złożone przekształcenie każdego wyjścia
+    def explain(self, stats=None):
+        linie = [f"przebieg statystyk: {'tak' if stats is None and self._needs_stats() else 'nie'}"]
+        macierze = [n for n, (r, _) in self._wyjscia.items() if r == 'matrix']
+        linie.append(f"przebieg zapisu: {', '.join(macierze) if macierze else 'nie'}")
+        for nazwa, (rodzaj, wezel) in self._wyjscia.items():
+            linie.append(f"{nazwa} ({rodzaj}): {wezel!r}")
+        return "\n".join(linie)
+
+    # Wykonanie potoku; stats: gotowe statystyki źródła (np. z column_stats.describe).
+    # Zwraca słownik nazwa -> macierz albo słownik statystyk.
+    def run(self, stats=None):
+        if stats is not None:
+            stats = self._from_column_stats(stats)
+        elif self._needs_stats():
+            stats = self._scan()
+        plan = self._plan(stats)
+        n = stats.n if stats is not None else self.n_rows
+        wyniki = {}
+        macierze = []
+        for nazwa, (rodzaj, wezel, wypelnienie, a, b, wynikowe) in plan.items():
+            if rodzaj == 'summary':
+                wyniki[nazwa] = wynikowe.summary()
+            else:
+                wyniki[nazwa] = np.empty((n, len(a)))
+                macierze.append((wyniki[nazwa], wypelnienie, a, b, ~np.isnan(wypelnienie)))
+        if not macierze:
+            return wyniki
+
+        start = 0
+        for fragment in self._fragmenty():
+            koniec = start + len(fragment)
+            braki = np.isnan(fragment) if any(u.any() for *_, u in macierze) else None
+            for wynik, wypelnienie, a, b, uzupelniane in macierze:
+                cel = wynik[start:koniec]
+                if uzupelniane.any():
+                    np.copyto(cel, np.where(braki & uzupelniane, wypelnienie, fragment))
+                else:
+                    cel[...] = fragment
+                cel *= a
+                cel += b
+            start = koniec
+        return wyniki
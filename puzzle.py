@@ -0,0 +1,683 @@
+# Układanka N-puzzle (8, 15, 24...) - A* na kopcu i IDA* z wymienną heurystyką
+import heapq
+import math
+import time
+
+# Cel jaki chcemy osiągnąć (8-puzzle w zapisie napisowym z 2.txt)
+CEL = "12345678 "
+
+# Nazwy ruchów jak w 2.txt: kierunek, w którym przesuwa się puste pole
+RUCHY = (('Góra', -1, 0), ('Dół', 1, 0), ('Lewo', 0, -1), ('Prawo', 0, 1))
+
+# Klocki w zapisie napisowym: ' ' to puste pole, dalej cyfry i litery (do planszy 6x6)
+ZNAKI = " 123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+
+def pokaz_ukladanke(stan):
+    bok = math.isqrt(len(stan))
+    linia = "-" * (4 * bok + 1)
+    wiersze = [linia]
+    for i in range(bok):
+        wiersze.append("|" + "".join(f" {stan[i * bok + j]} |" for j in range(bok)))
+        wiersze.append(linia)
+    print("\n".join(wiersze) + "\n")
+
+
+# Sąsiedzi pustego pola dla każdej pozycji: lista (nowa pozycja, nazwa ruchu)
+def _sasiedzi(bok):
+    sasiedzi = []
+    for pozycja in range(bok * bok):
+        wiersz, kolumna = divmod(pozycja, bok)
+        sasiedzi.append([
+            ((wiersz + dw) * bok + kolumna + dk, nazwa)
+            for nazwa, dw, dk in RUCHY
+            if 0 <= wiersz + dw < bok and 0 <= kolumna + dk < bok
+        ])
+    return sasiedzi
+
+
+# Geometria planszy bok x bok; stany wewnętrznie to krotki liczb z 0 w miejscu pustego pola
+class Plansza:
+    def __init__(self, bok=3):
+        if bok < 2:
+            raise ValueError("Plansza musi mieć bok co najmniej 2")
+        self.bok = bok
+        self.n = bok * bok
+        self.cel = tuple(range(1, self.n)) + (0,)
+        self.sasiedzi = _sasiedzi(bok)
+        # Stan spakowany w liczbę: klocek z pozycji p zajmuje bity [p * bity, (p + 1) * bity);
+        # dla planszy do 4x4 to 4 bity na klocek, czyli jedno słowo 64-bitowe
+        self.bity = max(4, (self.n - 1).bit_length())
+        self.maska = (1 << self.bity) - 1
+        self.przesuniecia = [p * self.bity for p in range(self.n)]
+
+    @classmethod
+    def dla(cls, stan):
+        bok = math.isqrt(len(stan))
+        if bok * bok != len(stan):
+            raise ValueError(f"Stan o długości {len(stan)} nie jest kwadratową planszą")
+        return cls(bok)
+
+    # Napis (' ' = puste) albo ciąg liczb (0 = puste) -> krotka liczb
+    def koduj(self, stan):
+        if isinstance(stan, str):
+            stan = tuple(ZNAKI.index(znak) for znak in stan)
+        else:
+            stan = tuple(int(klocek) for klocek in stan)
+        if len(stan) != self.n or sorted(stan) != list(range(self.n)):
+            raise ValueError("Stan musi zawierać każdy klocek dokładnie raz")
+        return stan
+
+    def napis(self, stan):
+        return ''.join(ZNAKI[klocek] for klocek in stan)
+
+    def pakuj(self, stan):
+        wynik = 0
+        for klocek, przesuniecie in zip(stan, self.przesuniecia):
+            wynik |= klocek << przesuniecie
+        return wynik
+
+    def rozpakuj(self, spakowany):
+        return tuple((spakowany >> przesuniecie) & self.maska for przesuniecie in self.przesuniecia)
+
+
+# Układ jest osiągalny z celu wtedy i tylko wtedy, gdy parzystość permutacji prowadzącej
+# od celu do stanu (puste pole liczone jako klocek) równa się parzystości odległości
+# Manhattan pustego pola - każdy ruch zmienia obie o jeden. Dla nieparzystego boku to
+# klasyczny warunek parzystej liczby inwersji, dla parzystego - inwersje plus wiersz pustego.
+def _rozwiazywalna(stan, cel, bok):
+    pozycja_w_celu = {klocek: pozycja for pozycja, klocek in enumerate(cel)}
+    permutacja = [pozycja_w_celu[klocek] for klocek in stan]
+    odwiedzone = [False] * len(stan)
+    cykle = 0
+    for i in range(len(stan)):
+        if not odwiedzone[i]:
+            cykle += 1
+            while not odwiedzone[i]:
+                odwiedzone[i] = True
+                i = permutacja[i]
+    puste, puste_cel = stan.index(0), cel.index(0)
+    odleglosc = abs(puste // bok - puste_cel // bok) + abs(puste % bok - puste_cel % bok)
+    return (len(stan) - cykle) % 2 == odleglosc % 2
+
+
+def czy_rozwiazywalna(start, cel=None):
+    plansza = Plansza.dla(start)
+    koniec = plansza.koduj(cel) if cel is not None else plansza.cel
+    return _rozwiazywalna(plansza.koduj(start), koniec, plansza.bok)
+
+
+# Współrzędne (wiersz, kolumna) każdego klocka w stanie cel
+def _docelowe(cel):
+    bok = math.isqrt(len(cel))
+    return {klocek: divmod(pozycja, bok) for pozycja, klocek in enumerate(cel)}
+
+
+# Odległość Manhattan wszystkich klocków od ich pozycji w stanie cel
+def oblicz_odleglosc(stan, cel=CEL, docelowe=None):
+    if docelowe is None:
+        docelowe = _docelowe(cel)
+    bok = math.isqrt(len(stan))
+    suma = 0
+    for pozycja, klocek in enumerate(stan):
+        if klocek == ' ':
+            continue
+        wiersz, kolumna = divmod(pozycja, bok)
+        docelowy_wiersz, docelowa_kolumna = docelowe[klocek]
+        suma += abs(wiersz - docelowy_wiersz) + abs(kolumna - docelowa_kolumna)
+    return suma
+
+
+def znajdz_ruchy(stan, sasiedzi=None):
+    if sasiedzi is None:
+        sasiedzi = _sasiedzi(math.isqrt(len(stan)))
+    puste = stan.index(' ')
+    ruchy = []
+    for nowa_pozycja, nazwa in sasiedzi[puste]:
+        nowy_stan = list(stan)
+        nowy_stan[puste], nowy_stan[nowa_pozycja] = nowy_stan[nowa_pozycja], nowy_stan[puste]
+        ruchy.append((''.join(nowy_stan), nazwa))
+    return ruchy
+
+
+# Heurystyki mają wspólny interfejs:
+#   oblicz(stan) - wartość dla dowolnego stanu (A*),
+#   inicjuj(stan) / przesun(klocek, z, do) / cofnij(klocek, z, do) - wartość aktualizowana
+#   przyrostowo wzdłuż jednej ścieżki (IDA*), każda metoda zwraca bieżące h.
+class Manhattan:
+    def __init__(self, plansza, cel=None):
+        cel = cel or plansza.cel
+        bok = plansza.bok
+        n = plansza.n
+        # odleglosci[klocek][pozycja] - odległość klocka stojącego na pozycji od jego celu
+        self.odleglosci = [[0] * n for _ in range(n)]
+        for docelowa, klocek in enumerate(cel):
+            if klocek == 0:
+                continue
+            for pozycja in range(n):
+                self.odleglosci[klocek][pozycja] = (
+                    abs(pozycja // bok - docelowa // bok) + abs(pozycja % bok - docelowa % bok))
+        # roznica[klocek][z * n + do] - zmiana h po przesunięciu klocka z pozycji z na do
+        self.roznica = [
+            [odleglosci[do] - odleglosci[z] for z in range(n) for do in range(n)]
+            for odleglosci in self.odleglosci
+        ]
+        self.h = 0
+
+    def oblicz(self, stan):
+        return sum(self.odleglosci[klocek][pozycja] for pozycja, klocek in enumerate(stan))
+
+    def inicjuj(self, stan):
+        self.h = self.oblicz(stan)
+        return self.h
+
+    def przesun(self, klocek, z, do):
+        self.h += self.roznica[klocek][z * len(self.odleglosci) + do]
+        return self.h
+
+    def cofnij(self, klocek, z, do):
+        return self.przesun(klocek, do, z)
+
+
+class Wynik:
+    def __init__(self, ruchy, stany, rozwiniete, wygenerowane, status=None,
+                 maks_otwarte=0, maks_zamkniete=0, czas_s=0.0, ograniczenie=1.0):
+        # None, gdy rozwiązanie nie istnieje albo przerwano szukanie
+        self.ruchy = ruchy
+        self.stany = stany
+        self.rozwiniete = rozwiniete
+        # Następniki wytworzone przy rozwijaniu stanów, razem z powtórzeniami i odrzuconymi
+        # (IDA* nie tworzy ruchu cofającego poprzedni) - to samo znaczenie we wszystkich strategiach
+        self.wygenerowane = wygenerowane
+        # 'ok', 'brak' (nie ma rozwiązania), 'limit_wezlow', 'limit_czasu' albo 'limit_pamieci'
+        self.status = status or ('ok' if ruchy is not None else 'brak')
+        # Największy rozmiar kolejki i zbioru zamkniętych (w IDA*: największa głębokość ścieżki)
+        self.maks_otwarte = maks_otwarte
+        self.maks_zamkniete = maks_zamkniete
+        self.czas_s = czas_s
+        # Gwarantowany mnożnik kosztu ponad optimum (1.0 - optymalne); None, gdy brak gwarancji
+        self.ograniczenie = ograniczenie if ruchy is not None else None
+
+    @property
+    def wezly_na_s(self):
+        return self.rozwiniete / self.czas_s if self.czas_s > 0 else 0.0
+
+    # Efektywny współczynnik rozgałęzienia b*: drzewo o głębokości rozwiązania d
+    # i stałym rozgałęzieniu b* miałoby tyle węzłów, ile wygenerowano (N + 1 = 1 + b* + ... + b*^d)
+    @property
+    def efektywne_rozgalezienie(self):
+        d = self.koszt
+        if not d:
+            return None
+        cel = self.wygenerowane + 1
+        # b*^d <= N + 1, więc (N + 1)^(1/d) ogranicza b* z góry
+        dol, gora = 1.0, max(1.0, cel ** (1 / d))
+        for _ in range(60):
+            b = (dol + gora) / 2
+            if sum(b ** i for i in range(d + 1)) < cel:
+                dol = b
+            else:
+                gora = b
+        return (dol + gora) / 2
+
+    def metrics(self):
+        return {
+            'rozwiniete': self.rozwiniete, 'wygenerowane': self.wygenerowane,
+            'maks_otwarte': self.maks_otwarte, 'maks_zamkniete': self.maks_zamkniete,
+            'czas_s': self.czas_s, 'wezly_na_s': self.wezly_na_s,
+            'efektywne_rozgalezienie': self.efektywne_rozgalezienie, 'ograniczenie': self.ograniczenie,
+        }
+
+    @property
+    def znaleziono(self):
+        return self.ruchy is not None
+
+    @property
+    def koszt(self):
+        return len(self.ruchy) if self.ruchy is not None else None
+
+    def __repr__(self):
+        return (f"Wynik(status={self.status}, koszt={self.koszt}, rozwiniete={self.rozwiniete}, "
+                f"wygenerowane={self.wygenerowane})")
+
+
+# Limity liczby rozwiniętych węzłów i czasu; zegar sprawdzany co KROK węzłów,
+# więc w pętli przeszukiwania zostaje jedno porównanie liczb
+class _Limity:
+    KROK = 1024
+
+    def __init__(self, limit_wezlow=None, limit_czasu=None):
+        self.limit_wezlow = limit_wezlow
+        self.termin = time.perf_counter() + limit_czasu if limit_czasu is not None else None
+        self.nastepna = self._nastepna(0)
+
+    def _nastepna(self, rozwiniete):
+        nastepna = rozwiniete + self.KROK
+        return nastepna if self.limit_wezlow is None else min(nastepna, self.limit_wezlow)
+
+    # Wołane, gdy liczba rozwiniętych węzłów dojdzie do self.nastepna
+    def sprawdz(self, rozwiniete):
+        if self.limit_wezlow is not None and rozwiniete >= self.limit_wezlow:
+            return 'limit_wezlow'
+        if self.termin is not None and time.perf_counter() > self.termin:
+            return 'limit_czasu'
+        self.nastepna = self._nastepna(rozwiniete)
+        return None
+
+
+class _Przerwane(Exception):
+    def __init__(self, status):
+        super().__init__(status)
+        self.status = status
+
+
+def _odtworz(rodzice, stan):
+    ruchy, stany = [], [stan]
+    while rodzice[stan] is not None:
+        stan, ruch = rodzice[stan]
+        ruchy.append(ruch)
+        stany.append(stan)
+    return ruchy[::-1], stany[::-1]
+
+
+def _przygotuj(start, cel, heurystyka):
+    plansza = Plansza.dla(start)
+    poczatek = plansza.koduj(start)
+    # Domyślny cel to klocki po kolei i puste pole na końcu (dla 3x3 to CEL)
+    koniec = plansza.koduj(cel) if cel is not None else plansza.cel
+    if heurystyka is None:
+        heurystyka = Manhattan(plansza, koniec)
+    return plansza, poczatek, koniec, heurystyka
+
+
+# Stany wyniku w tym samym zapisie co start (napisy dla napisu); śledzenie dostaje wynik na koniec
+def _wynik(plansza, start, ruchy, stany, rozwiniete, wygenerowane, status=None, sledzenie=None, **metryki):
+    if stany is not None and isinstance(start, str):
+        stany = [plansza.napis(stan) for stan in stany]
+    wynik = Wynik(ruchy, stany, rozwiniete, wygenerowane, status, **metryki)
+    if sledzenie is not None:
+        sledzenie.koniec(wynik)
+    return wynik
+
+
+# A*: wpisy kopca (f, h, licznik, stan, puste); heurystyka liczona raz przy wygenerowaniu
+# węzła, przy równym f wygrywa mniejsze h (bliżej celu), licznik zachowuje kolejność wstawiania.
+# Zamiast historii ruchów w każdym węźle - wskaźniki na rodzica; najlepsze g każdego stanu
+# pozwala pominąć nieaktualne wpisy kopca bez ich usuwania. Heurystyka nie musi być spójna
+# (np. pattern_db.AdditivePDB): stan zamknięty osiągnięty taniej wraca do kolejki. Stany są spakowanymi liczbami,
+# ruch to dwa przesunięcia bitowe, a heurystyka z tabelą roznica zmienia się o jedną wartość.
+# limit_wezlow / limit_czasu (sekundy) przerywają szukanie ze statusem w wyniku.
+# sledzenie (puzzle_trace) dostaje zdarzenia węzłów; bez niego pętla nic nie formatuje.
+# waga > 1 to ważone A* (f = g + waga * h): koszt co najwyżej waga razy optymalny.
+# limit_pamieci ogranicza liczbę zapamiętanych stanów - po przekroczeniu odrzucana jest
+# gorsza połowa kolejki; granica odcina węzły z g + h >= granica (szukanie tańszej ścieżki).
+def szukaj_rozwiazania(start, cel=None, heurystyka=None, limit_wezlow=None, limit_czasu=None, sledzenie=None,
+                       waga=1.0, limit_pamieci=None, granica=None):
+    plansza, poczatek, koniec, heurystyka = _przygotuj(start, cel, heurystyka)
+    if sledzenie is not None:
+        sledzenie.poczatek(plansza, plansza.pakuj(poczatek))
+    if not _rozwiazywalna(poczatek, koniec, plansza.bok):
+        return _wynik(plansza, start, None, None, 0, 0, sledzenie=sledzenie)
+    zegar = time.perf_counter()
+    limity = _Limity(limit_wezlow, limit_czasu)
+    sasiedzi, przesuniecia, maska, n = plansza.sasiedzi, plansza.przesuniecia, plansza.maska, plansza.n
+    roznica = getattr(heurystyka, 'roznica', None)
+    stan = plansza.pakuj(poczatek)
+    cel_spakowany = plansza.pakuj(koniec)
+    h = heurystyka.oblicz(poczatek)
+    kolejka = [(waga * h, h, 0, stan, poczatek.index(0))]
+    koszty = {stan: 0}
+    rodzice = {stan: None}
+    zamkniete = set()
+    licznik = 1
+    rozwiniete = wygenerowane = 0
+    maks_otwarte = 1
+    przycieto = False
+
+    def zakoncz(ruchy, stany, status=None):
+        return _wynik(plansza, start, ruchy, stany, rozwiniete, wygenerowane, status, sledzenie,
+                      maks_otwarte=maks_otwarte, maks_zamkniete=len(zamkniete),
+                      czas_s=time.perf_counter() - zegar, ograniczenie=waga)
+
+    while kolejka:
+        f, h, _, stan, puste = heapq.heappop(kolejka)
+        # Wpis nieaktualny: stan ma już tańszą ścieżkę (f liczone tak samo jak przy wstawianiu)
+        if f != koszty[stan] + waga * h:
+            continue
+        if stan == cel_spakowany:
+            ruchy, stany = _odtworz(rodzice, stan)
+            return zakoncz(ruchy, [plansza.rozpakuj(s) for s in stany])
+        if rozwiniete >= limity.nastepna:
+            status = limity.sprawdz(rozwiniete)
+            if status:
+                return zakoncz(None, None, status)
+        zamkniete.add(stan)
+        rozwiniete += 1
+
+        g = koszty[stan] + 1
+        if sledzenie is not None:
+            sledzenie.rozwiniety(stan, g - 1, h)
+        wygenerowane += len(sasiedzi[puste])
+        for nowa_pozycja, ruch in sasiedzi[puste]:
+            # Klocek z nowej pozycji przechodzi na miejsce pustego pola (tam są zera)
+            klocek = (stan >> przesuniecia[nowa_pozycja]) & maska
+            nowy_stan = stan - (klocek << przesuniecia[nowa_pozycja]) + (klocek << przesuniecia[puste])
+            if g >= koszty.get(nowy_stan, g + 1):
+                continue
+            if roznica is not None:
+                nowe_h = h + roznica[klocek][nowa_pozycja * n + puste]
+            else:
+                nowe_h = heurystyka.oblicz(plansza.rozpakuj(nowy_stan))
+            if granica is not None and g + nowe_h >= granica:
+                continue
+            koszty[nowy_stan] = g
+            rodzice[nowy_stan] = (stan, ruch)
+            heapq.heappush(kolejka, (g + waga * nowe_h, nowe_h, licznik, nowy_stan, nowa_pozycja))
+            licznik += 1
+            if sledzenie is not None:
+                sledzenie.wygenerowany(nowy_stan, ruch, g, nowe_h)
+        if len(kolejka) > maks_otwarte:
+            maks_otwarte = len(kolejka)
+        if limit_pamieci is not None and len(rodzice) > limit_pamieci:
+            kolejka = _przytnij(kolejka, zamkniete, koszty, rodzice)
+            przycieto = True
+            if len(rodzice) > limit_pamieci:
+                return zakoncz(None, None, 'limit_pamieci')
+
+    # Po przycięciu kolejki pusta kolejka nie dowodzi, że rozwiązania nie ma
+    return zakoncz(None, None, 'limit_pamieci' if przycieto else None)
+
+
+# Zostawia lepszą połowę kolejki; zapomina stany, które były tylko w odrzuconej części
+# (nierozwinięte, więc nie są rodzicami żadnego zapamiętanego stanu)
+def _przytnij(kolejka, zamkniete, koszty, rodzice):
+    kolejka.sort()
+    polowa = len(kolejka) // 2
+    zostaja = {wpis[3] for wpis in kolejka[:polowa]}
+    for wpis in kolejka[polowa:]:
+        stan = wpis[3]
+        if stan not in zostaja and stan not in zamkniete and stan in rodzice:
+            del rodzice[stan]
+            del koszty[stan]
+    return kolejka[:polowa]
+
+
+# IDA*: przeszukiwanie w głąb z rosnącym progiem f - pamięć rośnie tylko z długością
+# ścieżki, więc nadaje się do 15- i 24-puzzle. Plansza jest jedną listą modyfikowaną
+# w miejscu, a heurystyka aktualizowana przyrostowo przy każdym ruchu i jego cofnięciu.
+# max_prog ogranicza koszt; nierozwiązywalny start jest odrzucany od razu testem parzystości.
+def szukaj_ida(start, cel=None, heurystyka=None, max_prog=None, limit_wezlow=None, limit_czasu=None,
+               sledzenie=None):
+    plansza, poczatek, koniec, heurystyka = _przygotuj(start, cel, heurystyka)
+    if sledzenie is not None:
+        sledzenie.poczatek(plansza, plansza.pakuj(poczatek))
+    if not _rozwiazywalna(poczatek, koniec, plansza.bok):
+        return _wynik(plansza, start, None, None, 0, 0, sledzenie=sledzenie)
+    zegar = time.perf_counter()
+    limity = _Limity(limit_wezlow, limit_czasu)
+    if max_prog is None:
+        max_prog = 2 * plansza.n * plansza.bok * plansza.bok
+    stan = list(poczatek)
+    koniec = list(koniec)
+    sasiedzi = plansza.sasiedzi
+    sciezka = []
+    rozwiniete = wygenerowane = 0
+    maks_glebokosc = 0
+
+    def dfs(puste, poprzednie, g, h, prog):
+        nonlocal rozwiniete, wygenerowane, maks_glebokosc
+        if h == 0 and stan == koniec:
+            return True
+        if rozwiniete >= limity.nastepna:
+            status = limity.sprawdz(rozwiniete)
+            if status:
+                raise _Przerwane(status)
+        rozwiniete += 1
+        if g > maks_glebokosc:
+            maks_glebokosc = g
+        if sledzenie is not None:
+            sledzenie.rozwiniety(plansza.pakuj(stan), g, h)
+        minimum = math.inf
+        for nowa_pozycja, ruch in sasiedzi[puste]:
+            if nowa_pozycja == poprzednie:
+                continue
+            wygenerowane += 1
+            klocek = stan[nowa_pozycja]
+            nowe_h = heurystyka.przesun(klocek, nowa_pozycja, puste)
+            f = g + 1 + nowe_h
+            if f <= prog:
+                stan[puste], stan[nowa_pozycja] = klocek, 0
+                if sledzenie is not None:
+                    sledzenie.wygenerowany(plansza.pakuj(stan), ruch, g + 1, nowe_h)
+                sciezka.append(ruch)
+                wynik = dfs(nowa_pozycja, puste, g + 1, nowe_h, prog)
+                if wynik is True:
+                    return True
+                sciezka.pop()
+                stan[puste], stan[nowa_pozycja] = 0, klocek
+                minimum = min(minimum, wynik)
+            else:
+                minimum = min(minimum, f)
+            heurystyka.cofnij(klocek, nowa_pozycja, puste)
+        return minimum
+
+    def zakoncz(ruchy, stany, status=None):
+        return _wynik(plansza, start, ruchy, stany, rozwiniete, wygenerowane, status, sledzenie,
+                      maks_otwarte=maks_glebokosc, czas_s=time.perf_counter() - zegar)
+
+    prog = heurystyka.inicjuj(poczatek)
+    while prog <= max_prog:
+        try:
+            wynik = dfs(poczatek.index(0), -1, 0, prog, prog)
+        except _Przerwane as przerwane:
+            return zakoncz(None, None, przerwane.status)
+        if wynik is True:
+            stany = [poczatek]
+            biezacy = list(poczatek)
+            przesuniecia = {nazwa: dw * plansza.bok + dk for nazwa, dw, dk in RUCHY}
+            for ruch in sciezka:
+                puste = biezacy.index(0)
+                nowa_pozycja = puste + przesuniecia[ruch]
+                biezacy[puste], biezacy[nowa_pozycja] = biezacy[nowa_pozycja], 0
+                stany.append(tuple(biezacy))
+            return zakoncz(list(sciezka), stany)
+        if wynik == math.inf:
+            break
+        prog = wynik
+    return zakoncz(None, None)
+
+
+# Wiązka (beam search): przeszukiwanie poziomami, z każdego poziomu zostaje tylko
+# szerokosc węzłów o najmniejszym h. Pamięć to co najwyżej szerokosc * głębokość stanów
+# (odrzuceni kandydaci są zapominani), ale nie ma gwarancji optymalności ani znalezienia.
+def szukaj_wiazka(start, cel=None, heurystyka=None, szerokosc=1000, limit_wezlow=None, limit_czasu=None,
+                  sledzenie=None, limit_pamieci=None):
+    plansza, poczatek, koniec, heurystyka = _przygotuj(start, cel, heurystyka)
+    if sledzenie is not None:
+        sledzenie.poczatek(plansza, plansza.pakuj(poczatek))
+    if not _rozwiazywalna(poczatek, koniec, plansza.bok):
+        return _wynik(plansza, start, None, None, 0, 0, sledzenie=sledzenie)
+    zegar = time.perf_counter()
+    limity = _Limity(limit_wezlow, limit_czasu)
+    sasiedzi, przesuniecia, maska, n = plansza.sasiedzi, plansza.przesuniecia, plansza.maska, plansza.n
+    roznica = getattr(heurystyka, 'roznica', None)
+    stan = plansza.pakuj(poczatek)
+    cel_spakowany = plansza.pakuj(koniec)
+    warstwa = [(heurystyka.oblicz(poczatek), 0, stan, poczatek.index(0))]
+    rodzice = {stan: None}
+    licznik = 1
+    rozwiniete = wygenerowane = 0
+    # Najwięcej kandydatów następnego poziomu trzymanych naraz (przed przycięciem do szerokości)
+    maks_otwarte = 1
+    g = 0
+
+    def zakoncz(ruchy, stany, status=None):
+        return _wynik(plansza, start, ruchy, stany, rozwiniete, wygenerowane, status, sledzenie,
+                      maks_otwarte=maks_otwarte, maks_zamkniete=len(rodzice),
+                      czas_s=time.perf_counter() - zegar, ograniczenie=None)
+
+    if stan == cel_spakowany:
+        return zakoncz([], [poczatek])
+    while warstwa:
+        kandydaci = []
+        for h, _, stan, puste in warstwa:
+            if rozwiniete >= limity.nastepna:
+                status = limity.sprawdz(rozwiniete)
+                if status:
+                    return zakoncz(None, None, status)
+            rozwiniete += 1
+            if sledzenie is not None:
+                sledzenie.rozwiniety(stan, g, h)
+            wygenerowane += len(sasiedzi[puste])
+            for nowa_pozycja, ruch in sasiedzi[puste]:
+                klocek = (stan >> przesuniecia[nowa_pozycja]) & maska
+                nowy_stan = stan - (klocek << przesuniecia[nowa_pozycja]) + (klocek << przesuniecia[puste])
+                if nowy_stan in rodzice:
+                    continue
+                rodzice[nowy_stan] = (stan, ruch)
+                if nowy_stan == cel_spakowany:
+                    ruchy, stany = _odtworz(rodzice, nowy_stan)
+                    return zakoncz(ruchy, [plansza.rozpakuj(s) for s in stany])
+                if roznica is not None:
+                    nowe_h = h + roznica[klocek][nowa_pozycja * n + puste]
+                else:
+                    nowe_h = heurystyka.oblicz(plansza.rozpakuj(nowy_stan))
+                kandydaci.append((nowe_h, licznik, nowy_stan, nowa_pozycja))
+                licznik += 1
+                if sledzenie is not None:
+                    sledzenie.wygenerowany(nowy_stan, ruch, g + 1, nowe_h)
+        g += 1
+        if len(kandydaci) > maks_otwarte:
+            maks_otwarte = len(kandydaci)
+        if len(kandydaci) > szerokosc:
+            kandydaci.sort()
+            for _, _, odrzucony, _ in kandydaci[szerokosc:]:
+                del rodzice[odrzucony]
+            kandydaci = kandydaci[:szerokosc]
+        warstwa = kandydaci
+        if limit_pamieci is not None and len(rodzice) > limit_pamieci:
+            return zakoncz(None, None, 'limit_pamieci')
+    return zakoncz(None, None)
+
+
+# Ważone A* z malejącą wagą aż do terminu: każde kolejne szukanie ma mniejszą wagę i odcina
+# węzły, które nie mogą dać ścieżki krótszej od najlepszej dotąd. Zwraca najlepszą ścieżkę
+# znalezioną przed terminem; wynik.ograniczenie to gwarantowany mnożnik ponad optimum
+# (1.0, gdy ścieżka jest na pewno optymalna).
+def szukaj_anytime(start, cel=None, heurystyka=None, limit_czasu=1.0, waga=3.0, krok=0.5,
+                   limit_wezlow=None, limit_pamieci=None, sledzenie=None):
+    zegar = time.perf_counter()
+    # Bez terminu wagi maleją aż do 1.0, czyli do ścieżki optymalnej
+    termin = zegar + limit_czasu if limit_czasu is not None else None
+    etapy = _Etapy(sledzenie) if sledzenie is not None else None
+    najlepszy = None
+    rozwiniete = wygenerowane = maks_otwarte = maks_zamkniete = 0
+    while True:
+        wynik = szukaj_rozwiazania(
+            start, cel, heurystyka, limit_wezlow=limit_wezlow,
+            limit_czasu=max(0.0, termin - time.perf_counter()) if termin is not None else None,
+            sledzenie=etapy, waga=waga,
+            limit_pamieci=limit_pamieci, granica=najlepszy.koszt if najlepszy is not None else None)
+        rozwiniete += wynik.rozwiniete
+        wygenerowane += wynik.wygenerowane
+        maks_otwarte = max(maks_otwarte, wynik.maks_otwarte)
+        maks_zamkniete = max(maks_zamkniete, wynik.maks_zamkniete)
+        if wynik.znaleziono:
+            najlepszy = wynik
+        elif wynik.status == 'brak' and najlepszy is not None and waga == 1.0:
+            # Pełne A* nie znalazło nic krótszego, więc najlepsza ścieżka jest optymalna
+            najlepszy.ograniczenie = 1.0
+        # Ważone A* z odcinaniem może przeoczyć krótszą ścieżkę - 'brak' przerywa tylko bez żadnej
+        if wynik.status not in ('ok', 'brak') or najlepszy is None or waga == 1.0:
+            break
+        waga = max(1.0, waga - krok)
+    if najlepszy is not None:
+        wynik = najlepszy
+    # Liczniki sumowane po wszystkich szukaniach, rozmiary - największe z nich
+    wynik.rozwiniete, wynik.wygenerowane = rozwiniete, wygenerowane
+    wynik.maks_otwarte, wynik.maks_zamkniete = maks_otwarte, maks_zamkniete
+    wynik.czas_s = time.perf_counter() - zegar
+    if sledzenie is not None:
+        sledzenie.koniec(wynik)
+    return wynik
+
+
+# Śledzenie kolejnych szukań jednego przebiegu: jeden początek i jeden koniec dla odbiornika
+class _Etapy:
+    def __init__(self, sledzenie):
+        self.sledzenie = sledzenie
+        self.rozwiniety = sledzenie.rozwiniety
+        self.wygenerowany = sledzenie.wygenerowany
+        self._rozpoczete = False
+
+    def poczatek(self, plansza, stan):
+        if not self._rozpoczete:
+            self._rozpoczete = True
+            self.sledzenie.poczatek(plansza, stan)
+
+    def koniec(self, wynik):
+        pass
+
+
+def szukaj_wazony(start, cel=None, heurystyka=None, waga=2.0, **opcje):
+    return szukaj_rozwiazania(start, cel, heurystyka, waga=waga, **opcje)
+
+
+# Strategie wybierane parametrem (CLI --strategy, puzzle_batch --algorithm)
+STRATEGIE = {
+    'astar': szukaj_rozwiazania,
+    'ida': szukaj_ida,
+    'weighted': szukaj_wazony,
+    'beam': szukaj_wiazka,
+    'anytime': szukaj_anytime,
+}
+
+
+def main(argv=None):
+    import argparse
+
+    from puzzle_trace import SINKS
+
+    parser = argparse.ArgumentParser(description="Układanka N-puzzle")
+    parser.add_argument("stan", nargs="?", default=" 13425786", help="stan startowy (' ' = puste pole)")
+    parser.add_argument("--ida", action="store_true", help="IDA* zamiast A* (to samo co --strategy ida)")
+    parser.add_argument("--strategy", choices=sorted(STRATEGIE), default=None, help="strategia przeszukiwania")
+    parser.add_argument("--weight", type=float, default=None, help="waga h w weighted/anytime")
+    parser.add_argument("--beam-width", type=int, default=None, help="szerokość wiązki (beam)")
+    parser.add_argument("--memory-limit", type=int, default=None, help="limit zapamiętanych stanów")
+    parser.add_argument("--time-limit", type=float, default=None, help="limit czasu (s), w anytime termin")
+    parser.add_argument("--trace", choices=sorted(SINKS), default="none", help="śledzenie przeszukiwania")
+    args = parser.parse_args(argv)
+
+    sledzenie = SINKS[args.trace]()
+    print("START:")
+    pokaz_ukladanke(args.stan)
+    strategia = args.strategy or ('ida' if args.ida else 'astar')
+    opcje = {'sledzenie': sledzenie}
+    if args.time_limit is not None:
+        opcje['limit_czasu'] = args.time_limit
+    if args.weight is not None:
+        opcje['waga'] = args.weight
+    if args.beam_width is not None:
+        opcje['szerokosc'] = args.beam_width
+    if args.memory_limit is not None:
+        opcje['limit_pamieci'] = args.memory_limit
+    wynik = STRATEGIE[strategia](args.stan, **opcje)
+    if wynik.znaleziono:
+        print("!!! ZNALEZIONO ROZWIĄZANIE !!!")
+        print("Kolejność ruchów:")
+        for i, ruch in enumerate(wynik.ruchy):
+            print(f"{i+1}. {ruch}")
+    else:
+        print("Nie znaleziono rozwiązania :(")
+    metryki = wynik.metrics()
+    print(f"Rozwinięte węzły: {metryki['rozwiniete']}, wygenerowane: {metryki['wygenerowane']}, "
+          f"maks. otwarte: {metryki['maks_otwarte']}, maks. zamknięte: {metryki['maks_zamkniete']}")
+    print(f"Węzłów/s: {metryki['wezly_na_s']:.0f}, efektywne rozgałęzienie: {metryki['efektywne_rozgalezienie']}, "
+          f"status: {wynik.status}, ograniczenie: {wynik.ograniczenie}")
+    if hasattr(sledzenie, 'summary'):
+        print(sledzenie.summary())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+# Rozwiązywanie wielu układanek z pliku w puli procesów.
+# Plik wejściowy: jedna układanka w wierszu - liczby oddzielone spacjami lub przecinkami
+# (0 = puste pole) albo obiekt JSON {"id": ..., "stan": [...] lub "napis"}.
+# Wynik: JSON lines w kolejności wejścia, z ruchami i statystykami każdej instancji.
+import argparse
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from pattern_db import DOMYSLNE_GRUPY, AdditivePDB, PatternDatabase
+from puzzle import STRATEGIE, Manhattan, Plansza
+from puzzle_table import SolutionTable
+
+# Tablica odległości 8-puzzle procesu roboczego (mmap, wczytywana przy pierwszym użyciu)
+_tablica = []
+
+
+# Odczyt z tablicy nie przeszukuje stanów, więc nie używa heurystyki ani limitów
+# (solve_stream odrzuca limity i opcje strategii w tym trybie)
+def _z_tablicy(stan, heurystyka=None, limit_wezlow=None, limit_czasu=None, **opcje):
+    if not _tablica:
+        _tablica.append(SolutionTable.load_or_build())
+    return _tablica[0].solve(stan)
+
+
+ALGORYTMY = {**STRATEGIE, 'table': _z_tablicy}
+
+# Heurystyki procesu roboczego, tworzone raz na rozmiar planszy. Bazy wzorców są
+# mapowane z plików (mmap), więc wszystkie procesy dzielą jedną kopię w pamięci.
+_heurystyki = {}
+_ustawienia = {}
+
+
+def parse_instance(linia, numer):
+    linia = linia.strip()
+    if linia.startswith('{'):
+        rekord = json.loads(linia)
+        if not isinstance(rekord, dict) or 'stan' not in rekord:
+            raise ValueError("Brak pola 'stan'")
+        if not isinstance(rekord['stan'], (list, str)):
+            raise ValueError("Pole 'stan' musi być listą liczb albo napisem")
+        return rekord.get('id', numer), rekord['stan']
+    try:
+        return numer, [int(t) for t in linia.replace(',', ' ').split()]
+    except ValueError:
+        raise ValueError(f"Niepoprawny wiersz: {linia!r}") from None
+
+
+# Zadania (id, stan, blad): wiersz, którego nie da się odczytać, dostaje komunikat błędu
+# zamiast stanu, więc jeden zły wiersz nie przerywa całego pliku
+def read_instances(sciezka):
+    with open(sciezka) as f:
+        numer = 0
+        for linia in f:
+            if linia.strip() and not linia.lstrip().startswith('#'):
+                try:
+                    identyfikator, stan = parse_instance(linia, numer)
+                except ValueError as e:
+                    yield numer, None, str(e)
+                else:
+                    yield identyfikator, stan, None
+                numer += 1
+
+
+def _init_worker(ustawienia):
+    _ustawienia.update(ustawienia)
+
+
+def _heurystyka(bok):
+    if bok not in _heurystyki:
+        plansza = Plansza(bok)
+        if _ustawienia['heuristic'] == 'pdb':
+            if bok not in DOMYSLNE_GRUPY:
+                raise ValueError(f"Brak baz wzorców dla planszy {bok}x{bok} (są dla {sorted(DOMYSLNE_GRUPY)})")
+            _heurystyki[bok] = AdditivePDB(plansza, katalog=_ustawienia['pdb_dir'])
+        else:
+            _heurystyki[bok] = Manhattan(plansza)
+    return _heurystyki[bok]
+
+
+def solve_instance(zadanie):
+    identyfikator, stan, _ = zadanie
+    start = time.perf_counter()
+    try:
+        plansza = Plansza.dla(stan)
+        tablica = _ustawienia['algorithm'] == 'table'
+        wynik = ALGORYTMY[_ustawienia['algorithm']](
+            stan, heurystyka=None if tablica else _heurystyka(plansza.bok),
+            limit_wezlow=_ustawienia['node_limit'], limit_czasu=_ustawienia['time_limit'],
+            **_ustawienia['opcje'],
+        )
+    except Exception as e:
+        # Każdy błąd instancji trafia do jej wyniku - reszta pliku liczy się dalej
+        blad = str(e) if isinstance(e, ValueError) else f"{type(e).__name__}: {e}"
+        return {'id': identyfikator, 'status': 'blad', 'blad': blad}
+    return {
+        'id': identyfikator, 'status': wynik.status, 'koszt': wynik.koszt, 'ruchy': wynik.ruchy,
+        **wynik.metrics(), 'czas_s': round(time.perf_counter() - start, 6),
+    }
+
+
+# Bazy wzorców budowane raz w procesie głównym, zanim rozmiar planszy trafi do procesów
+def _przygotuj_bazy(bok, ustawienia, gotowe):
+    if ustawienia['algorithm'] == 'table' or ustawienia['heuristic'] != 'pdb' or bok in gotowe \
+            or bok not in DOMYSLNE_GRUPY:
+        return
+    plansza = Plansza(bok)
+    for grupa in DOMYSLNE_GRUPY[bok]:
+        PatternDatabase.load_or_build(plansza, grupa, ustawienia['pdb_dir'])
+    gotowe.add(bok)
+
+
+# Zadania są wczytywane strumieniowo: w locie jest najwyżej okno zadań, a wyniki
+# czekają w słowniku tylko do chwili, gdy wszystkie wcześniejsze są już zapisane.
+# opcje: dodatkowe argumenty strategii (waga, szerokosc, limit_pamieci)
+def solve_stream(zadania, wyjscie, workers=None, algorithm='ida', heuristic='manhattan',
+                 node_limit=None, time_limit=None, pdb_dir=None, window=None, opcje=None):
+    workers = workers or os.cpu_count() or 1
+    window = window or 4 * workers
+    ustawienia = {
+        'algorithm': algorithm, 'heuristic': heuristic, 'node_limit': node_limit,
+        'time_limit': time_limit, 'pdb_dir': pdb_dir, 'opcje': opcje or {},
+    }
+    if algorithm == 'table':
+        if node_limit is not None or time_limit is not None or opcje:
+            raise ValueError("Tryb 'table' nie obsługuje limitów węzłów i czasu ani opcji strategii")
+        SolutionTable.load_or_build()
+    gotowe = set()
+    oczekujace = {}
+    wyniki = {}
+    nastepny = 0
+    liczba = 0
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(ustawienia,)) as pula:
+        zadania = iter(zadania)
+        wyczerpane = False
+        while oczekujace or not wyczerpane:
+            while not wyczerpane and len(oczekujace) < window:
+                zadanie = next(zadania, None)
+                if zadanie is None:
+                    wyczerpane = True
+                    break
+                # Zadania (id, stan) bez pola błędu też są przyjmowane
+                if len(zadanie) == 2:
+                    zadanie = (*zadanie, None)
+                if zadanie[2] is not None:
+                    wyniki[liczba] = {'id': zadanie[0], 'status': 'blad', 'blad': zadanie[2]}
+                    liczba += 1
+                    continue
+                _przygotuj_bazy(math.isqrt(len(zadanie[1])), ustawienia, gotowe)
+                oczekujace[liczba] = pula.submit(solve_instance, zadanie)
+                liczba += 1
+            if nastepny in oczekujace:
+                wyniki[nastepny] = oczekujace.pop(nastepny).result()
+            while nastepny in wyniki:
+                wyjscie.write(json.dumps(wyniki.pop(nastepny), ensure_ascii=False) + "\n")
+                nastepny += 1
+    return liczba
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Rozwiązywanie układanek z pliku w wielu procesach")
+    parser.add_argument("input", help="plik z układankami (jedna w wierszu)")
+    parser.add_argument("--output", metavar="FILE", help="plik wynikowy JSON lines (domyślnie stdout)")
+    parser.add_argument("--workers", type=int, default=None, help="liczba procesów (domyślnie liczba rdzeni)")
+    parser.add_argument("--algorithm", choices=sorted(ALGORYTMY), default='ida')
+    parser.add_argument("--heuristic", choices=['manhattan', 'pdb'], default='manhattan')
+    parser.add_argument("--node-limit", type=int, default=None, help="limit rozwiniętych węzłów na instancję")
+    parser.add_argument("--time-limit", type=float, default=None, help="limit czasu na instancję (s)")
+    parser.add_argument("--pdb-dir", default=None, help="katalog baz wzorców")
+    parser.add_argument("--weight", type=float, default=None, help="waga h (weighted, anytime)")
+    parser.add_argument("--beam-width", type=int, default=None, help="szerokość wiązki (beam)")
+    parser.add_argument("--memory-limit", type=int, default=None, help="limit zapamiętanych stanów (astar, weighted, beam, anytime)")
+    args = parser.parse_args(argv)
+    if args.algorithm == 'table' and any(v is not None for v in (
+            args.node_limit, args.time_limit, args.weight, args.beam_width, args.memory_limit)):
+        parser.error("--algorithm table nie obsługuje limitów ani opcji strategii")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    opcje = {}
+    if args.weight is not None:
+        opcje['waga'] = args.weight
+    if args.beam_width is not None:
+        opcje['szerokosc'] = args.beam_width
+    if args.memory_limit is not None:
+        opcje['limit_pamieci'] = args.memory_limit
+    wyjscie = open(args.output, 'w') if args.output else sys.stdout
+    try:
+        solve_stream(
+            read_instances(args.input), wyjscie, workers=args.workers, algorithm=args.algorithm,
+            heuristic=args.heuristic, node_limit=args.node_limit, time_limit=args.time_limit,
+            pdb_dir=args.pdb_dir, opcje=opcje,
+        )
+    finally:
+        if args.output:
+            wyjscie.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,155 @@
+# Pełna tablica odległości 8-puzzle: jeden wsteczny BFS od celu daje odległość każdego
+# z 181 440 osiągalnych stanów. Stany są numerowane kodem Lehmera (doskonałe haszowanie
+# permutacji w 0..9!-1), a odległości trzymane po 4 bity na stan: 9!/2 bajtów (~180 KB).
+# Zapytanie to zejście zachłanne do celu - bez żadnego przeszukiwania.
+import math
+import mmap
+import os
+import time
+
+import numpy as np
+
+from puzzle import Plansza, Wynik, _rozwiazywalna
+
+N = 9
+# Waga cyfry kodu Lehmera na pozycji i: (8 - i)!
+WAGI = [math.factorial(N - 1 - i) for i in range(N)]
+NIEZNANA = 255
+
+
+def cache_dir():
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), "puzzle_table.cache")
+
+
+# Kod Lehmera: cyfra i to liczba mniejszych klocków na dalszych pozycjach, czyli
+# klocek minus liczba mniejszych już użytych (maska bitowa i bit_count)
+def rank(stan):
+    wynik = 0
+    uzyte = 0
+    for i in range(N - 1):
+        klocek = stan[i]
+        wynik += (klocek - (uzyte & ((1 << klocek) - 1)).bit_count()) * WAGI[i]
+        uzyte |= 1 << klocek
+    return wynik
+
+
+def _rank_many(stany):
+    wynik = np.zeros(len(stany), dtype=np.int64)
+    for i in range(N - 1):
+        mniejsze = (stany[:, i + 1:] < stany[:, i:i + 1]).sum(axis=1)
+        wynik += mniejsze * WAGI[i]
+    return wynik
+
+
+# BFS od celu wektorowo całymi poziomami: stany jako macierz (liczba stanów x 9)
+def build_distances():
+    plansza = Plansza(3)
+    sasiedzi = np.full((N, 4), -1, dtype=np.int64)
+    for pozycja, lista in enumerate(plansza.sasiedzi):
+        for i, (nowa, _) in enumerate(lista):
+            sasiedzi[pozycja, i] = nowa
+    odleglosci = np.full(math.factorial(N), NIEZNANA, dtype=np.uint8)
+    poziom = np.array([plansza.cel], dtype=np.uint8)
+    odleglosci[_rank_many(poziom)] = 0
+    d = 0
+    while len(poziom):
+        d += 1
+        puste = np.argmax(poziom == 0, axis=1)
+        kolejne = []
+        for kierunek in range(4):
+            cel_pustego = sasiedzi[puste, kierunek]
+            wiersze = np.nonzero(cel_pustego >= 0)[0]
+            nowe = poziom[wiersze].copy()
+            nowe[np.arange(len(wiersze)), puste[wiersze]] = poziom[wiersze, cel_pustego[wiersze]]
+            nowe[np.arange(len(wiersze)), cel_pustego[wiersze]] = 0
+            kolejne.append(nowe)
+        kolejne = np.concatenate(kolejne)
+        rangi = _rank_many(kolejne)
+        rangi, pierwsze = np.unique(rangi, return_index=True)
+        nowe = odleglosci[rangi] == NIEZNANA
+        odleglosci[rangi[nowe]] = d
+        poziom = kolejne[pierwsze[nowe]]
+    return odleglosci
+
+
+# Dwie odległości w bajcie (parzysta ranga w młodszych 4 bitach). Najdłuższa odległość
+# to 31, więc zapisywana jest odległość modulo 16 - sąsiedzi różnią się zawsze o 1,
+# a d - 1 i d + 1 są różne modulo 16, więc zejście do celu jest jednoznaczne.
+def pack(odleglosci):
+    odleglosci = odleglosci & 15
+    return (odleglosci[0::2] | (odleglosci[1::2] << 4)).astype(np.uint8)
+
+
+class SolutionTable:
+    def __init__(self, dane):
+        # Bajty tablicy (bytes albo memoryview na mmap pliku)
+        self.dane = dane
+        self.plansza = Plansza(3)
+
+    @classmethod
+    def build(cls):
+        return cls(memoryview(pack(build_distances()).tobytes()))
+
+    @staticmethod
+    def path(katalog=None):
+        return os.path.join(katalog or cache_dir(), "8puzzle.dist")
+
+    def save(self, sciezka):
+        os.makedirs(os.path.dirname(sciezka) or '.', exist_ok=True)
+        tymczasowy = sciezka + ".tmp"
+        with open(tymczasowy, 'wb') as f:
+            f.write(self.dane)
+        os.replace(tymczasowy, sciezka)
+
+    @classmethod
+    def load(cls, sciezka):
+        with open(sciezka, 'rb') as f:
+            mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(mapa) != math.factorial(N) // 2:
+            raise ValueError(f"Niepoprawny rozmiar tablicy odległości: {sciezka}")
+        return cls(memoryview(mapa))
+
+    @classmethod
+    def load_or_build(cls, katalog=None):
+        sciezka = cls.path(katalog)
+        if not os.path.exists(sciezka):
+            cls.build().save(sciezka)
+        return cls.load(sciezka)
+
+    # Odległość stanu modulo 16
+    def stored(self, ranga):
+        bajt = self.dane[ranga >> 1]
+        return bajt >> 4 if ranga & 1 else bajt & 15
+
+    # Optymalna ścieżka do CEL: z każdego stanu ruch do sąsiada o odległości mniejszej o 1
+    def solve(self, start):
+        zegar = time.perf_counter()
+        plansza = self.plansza
+        poczatek = plansza.koduj(start)
+        if not _rozwiazywalna(poczatek, plansza.cel, plansza.bok):
+            return Wynik(None, None, 0, 0)
+        stan = list(poczatek)
+        cel = list(plansza.cel)
+        puste = stan.index(0)
+        biezaca = self.stored(rank(stan))
+        ruchy, stany = [], [poczatek]
+        sprawdzone = 0
+        while stan != cel:
+            szukana = (biezaca - 1) & 15
+            for nowa_pozycja, ruch in plansza.sasiedzi[puste]:
+                sprawdzone += 1
+                stan[puste], stan[nowa_pozycja] = stan[nowa_pozycja], 0
+                if self.stored(rank(stan)) == szukana:
+                    break
+                stan[nowa_pozycja], stan[puste] = stan[puste], 0
+            else:
+                raise ValueError("Uszkodzona tablica odległości")
+            puste, biezaca = nowa_pozycja, szukana
+            ruchy.append(ruch)
+            stany.append(tuple(stan))
+        if isinstance(start, str):
+            stany = [plansza.napis(s) for s in stany]
+        return Wynik(ruchy, stany, len(ruchy), sprawdzone, czas_s=time.perf_counter() - zegar)
+
+    def distance(self, start):
+        return self.solve(start).koszt
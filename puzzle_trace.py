@@ -0,0 +1,121 @@
+# Odbiorniki zdarzeń przeszukiwania dla puzzle.szukaj_rozwiazania / szukaj_ida (parametr sledzenie).
+# Interfejs: poczatek(plansza, stan), rozwiniety(stan, g, h), wygenerowany(stan, ruch, g, h),
+# koniec(wynik); stany są spakowanymi liczbami (plansza.rozpakuj zamienia je na krotki).
+# Bez odbiornika (sledzenie=None) przeszukiwanie nie woła niczego i nic nie formatuje.
+import json
+import sys
+from collections import Counter
+
+from puzzle import pokaz_ukladanke
+
+
+class TraceSink:
+    def poczatek(self, plansza, stan):
+        self.plansza = plansza
+
+    def rozwiniety(self, stan, g, h):
+        pass
+
+    def wygenerowany(self, stan, ruch, g, h):
+        pass
+
+    def koniec(self, wynik):
+        pass
+
+
+# Tylko liczniki: rozwinięcia na każdej głębokości i rozkład h - bez zapisu pojedynczych węzłów
+class CounterSink(TraceSink):
+    def __init__(self):
+        self.glebokosci = Counter()
+        self.heurystyki = Counter()
+        self.wynik = None
+
+    def rozwiniety(self, stan, g, h):
+        self.glebokosci[g] += 1
+        self.heurystyki[h] += 1
+
+    def koniec(self, wynik):
+        self.wynik = wynik
+
+    def summary(self):
+        podsumowanie = self.wynik.metrics() if self.wynik is not None else {}
+        podsumowanie['rozwiniete_na_glebokosci'] = dict(sorted(self.glebokosci.items()))
+        podsumowanie['rozklad_h'] = dict(sorted(self.heurystyki.items()))
+        return podsumowanie
+
+
+# Co n-te zdarzenie każdego rodzaju przekazywane dalej (np. do JsonlSink)
+class SampledSink(TraceSink):
+    def __init__(self, sink, co=1000):
+        self.sink = sink
+        self.co = co
+        self._rozwiniete = 0
+        self._wygenerowane = 0
+
+    def poczatek(self, plansza, stan):
+        self.sink.poczatek(plansza, stan)
+
+    def rozwiniety(self, stan, g, h):
+        self._rozwiniete += 1
+        if self._rozwiniete % self.co == 0:
+            self.sink.rozwiniety(stan, g, h)
+
+    def wygenerowany(self, stan, ruch, g, h):
+        self._wygenerowane += 1
+        if self._wygenerowane % self.co == 0:
+            self.sink.wygenerowany(stan, ruch, g, h)
+
+    def koniec(self, wynik):
+        self.sink.koniec(wynik)
+
+
+# Pełny dziennik zdarzeń w formacie JSON lines (jedno zdarzenie w wierszu)
+class JsonlSink(TraceSink):
+    def __init__(self, plik):
+        self._wlasny = isinstance(plik, str)
+        self.plik = open(plik, 'w') if self._wlasny else plik
+
+    def _zapisz(self, zdarzenie):
+        self.plik.write(json.dumps(zdarzenie, ensure_ascii=False) + "\n")
+
+    def poczatek(self, plansza, stan):
+        super().poczatek(plansza, stan)
+        self._zapisz({'zdarzenie': 'poczatek', 'bok': plansza.bok, 'stan': plansza.rozpakuj(stan)})
+
+    def rozwiniety(self, stan, g, h):
+        self._zapisz({'zdarzenie': 'rozwiniety', 'stan': self.plansza.rozpakuj(stan), 'g': g, 'h': h})
+
+    def wygenerowany(self, stan, ruch, g, h):
+        self._zapisz({'zdarzenie': 'wygenerowany', 'stan': self.plansza.rozpakuj(stan), 'ruch': ruch, 'g': g, 'h': h})
+
+    def koniec(self, wynik):
+        self._zapisz({'zdarzenie': 'koniec', 'status': wynik.status, 'koszt': wynik.koszt, **wynik.metrics()})
+        if self._wlasny:
+            self.plik.close()
+        else:
+            self.plik.flush()
+
+
+# Rysowanie planszy każdego rozwiniętego węzła i jego sąsiadów, jak dawniej w 2.txt - tylko na życzenie
+class BoardSink(TraceSink):
+    def __init__(self):
+        self.krok = 0
+
+    def rozwiniety(self, stan, g, h):
+        self.krok += 1
+        print(f"\n=== Krok {self.krok} ===")
+        print(f"Stan: (koszt: {g}, heurystyka: {h})")
+        pokaz_ukladanke(self.plansza.napis(self.plansza.rozpakuj(stan)))
+
+    def wygenerowany(self, stan, ruch, g, h):
+        print(f"  Możliwy ruch: {ruch}")
+        pokaz_ukladanke(self.plansza.napis(self.plansza.rozpakuj(stan)))
+
+
+SINKS = {
+    'none': lambda: None,
+    'counters': CounterSink,
+    'sampled': lambda: SampledSink(JsonlSink(sys.stdout)),
+    'jsonl': lambda: JsonlSink(sys.stdout),
+    'boards': BoardSink,
+}
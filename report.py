@@ -0,0 +1,99 @@
+import io
+import sys
+
+import numpy as np
+
+# Po przekroczeniu tego rozmiaru bufor jest zrzucany jednym zapisem
+FLUSH_SIZE = 8 << 20
+
+
+class Report:
+    # quiet - nic nie trafia na stdout; summary_only - pomijane są sekcje z wierszami danych;
+    # row_limit - maksymalna liczba wierszy wypisywana w jednej sekcji danych
+    def __init__(self, output=None, quiet=False, summary_only=False, row_limit=None):
+        self.summary_only = summary_only
+        self.row_limit = row_limit
+        self._plik = open(output, 'w') if output else None
+        self._cel = self._plik if self._plik else (None if quiet else sys.stdout)
+        self._bufor = io.StringIO()
+
+    @property
+    def enabled(self):
+        return self._cel is not None
+
+    def _write(self, tekst):
+        self._bufor.write(tekst)
+        if self._bufor.tell() >= FLUSH_SIZE:
+            self.flush()
+
+    def flush(self):
+        if self._cel is not None and self._bufor.tell():
+            self._cel.write(self._bufor.getvalue())
+            self._cel.flush()
+        self._bufor = io.StringIO()
+
+    def close(self):
+        self.flush()
+        if self._plik:
+            self._plik.close()
+            self._plik = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # Linie podsumowania - zawsze wypisywane (poza trybem quiet)
+    def text(self, *linie):
+        if self.enabled:
+            self._write("".join(f"{linia}\n" for linia in linie))
+
+    def values(self, title, wartosci):
+        if self.enabled:
+            self._write(f"{title}\n" + "".join(f"{w}\n" for w in wartosci))
+
+    # Czy sekcje z wierszami danych będą wypisane (pozwala pominąć ich przygotowanie)
+    @property
+    def data_enabled(self):
+        return self.enabled and not self.summary_only
+
+    def _limited(self, n):
+        return n if self.row_limit is None else min(n, self.row_limit)
+
+    def _footer(self, n, wypisane):
+        if wypisane < n:
+            self._write(f"... ({n - wypisane} wierszy pominięto)\n")
+
+    # Sekcja danych: wiersze jako listy napisów łączone spacją
+    def rows(self, title, wiersze):
+        if not self.data_enabled:
+            return
+        n = len(wiersze)
+        k = self._limited(n)
+        self._write(f"{title}\n" + "".join(" ".join(w) + "\n" for w in wiersze[:k]))
+        self._footer(n, k)
+
+    # Sekcja danych: macierz liczbowa formatowana przez np.savetxt
+    def matrix(self, title, macierz, fmt='%.2f'):
+        if not self.data_enabled:
+            return
+        n = len(macierz)
+        k = self._limited(n)
+        self._write(f"{title}\n")
+        np.savetxt(self._bufor, macierz[:k], fmt=fmt, delimiter=' ')
+        self._footer(n, k)
+        if self._bufor.tell() >= FLUSH_SIZE:
+            self.flush()
+
+    # Sekcja danych: rekordy "nazwa: wartość " z kolumn (jeden format na wiersz)
+    def records(self, title, naglowki, kolumny):
+        if not self.data_enabled:
+            return
+        wzor = "".join(f"{h}: {{}} " for h in naglowki) + "\n"
+        n = len(kolumny[0]) if kolumny else 0
+        k = self._limited(n)
+        if title:
+            self._write(f"{title}\n")
+        self._write("".join(wzor.format(*wiersz) for wiersz in zip(*(kolumna[:k] for kolumna in kolumny))))
+        self._footer(n, k)
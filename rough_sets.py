@@ -0,0 +1,204 @@
+# Zbiory przybliżone na tabeli decyzyjnej: klasy nierozróżnialności (abstrakcji) dla
+# dowolnego podzbioru atrybutów, dolne i górne przybliżenia klas decyzyjnych, stopień
+# zależności decyzji od atrybutów i wyszukiwanie reduktu.
+# Podział na klasy to numer klasy dla każdego wiersza; dodanie atrybutu to jedno złożenie
+# numerów z kodami kolumny (jak w column_stats._group_ids), więc każdy krok jest O(n)
+# zamiast porównywania par wierszy O(n^2). Podziały są zapamiętywane i rozdrabniane
+# dalej przy dodawaniu atrybutów, a przy usuwaniu atrybutu budowane od najbliższego
+# zapamiętanego podzbioru.
+import numpy as np
+
+from decision_table import BRAK
+
+
+# Numery klas w 0..liczba-1 dla kluczy z przedziału 0..zakres-1: przy małym zakresie tablica
+# obecności i suma narastająca (O(n + zakres)), przy dużym sortowanie przez np.unique
+def _densify(klucze, zakres):
+    if zakres <= max(4 * len(klucze), 1 << 16):
+        obecne = np.zeros(zakres, dtype=bool)
+        obecne[klucze] = True
+        numery = np.cumsum(obecne) - 1
+        return numery[klucze], int(numery[-1]) + 1 if zakres else 0
+    unikalne, numery = np.unique(klucze, return_inverse=True)
+    return numery.ravel(), len(unikalne)
+
+
+class Partition:
+    def __init__(self, labels, count):
+        # Numer klasy nierozróżnialności każdego wiersza (0..count-1)
+        self.labels = labels
+        self.count = count
+
+    @classmethod
+    def whole(cls, n_rows):
+        return cls(np.zeros(n_rows, dtype=np.intp), 1 if n_rows else 0)
+
+    # Podział rozdrobniony kolumną kodów 0..liczebnosc-1
+    def refine(self, kody, liczebnosc):
+        klucze = self.labels * liczebnosc + kody
+        return Partition(*_densify(klucze, self.count * liczebnosc))
+
+    def sizes(self):
+        return np.bincount(self.labels, minlength=self.count)
+
+    # Wiersze każdej klasy (lista tablic indeksów)
+    def classes(self):
+        porzadek = np.argsort(self.labels, kind='stable')
+        return np.split(porzadek, np.cumsum(self.sizes())[:-1])
+
+    def __len__(self):
+        return self.count
+
+
+class RoughSets:
+    # decision: nazwa albo numer kolumny decyzyjnej (domyślnie ostatnia), conditions:
+    # atrybuty warunkowe (domyślnie wszystkie pozostałe), cache_size: ile podziałów pamiętać
+    def __init__(self, table, decision=None, conditions=None, cache_size=64):
+        self.table = table
+        self.decision = self._index(decision) if decision is not None else table.n_cols - 1
+        if conditions is None:
+            conditions = [j for j in range(table.n_cols) if j != self.decision]
+        self.conditions = [self._index(a) for a in conditions]
+        self.cache_size = cache_size
+        self._kody = {}
+        self._podzialy = {frozenset(): Partition.whole(table.n_rows)}
+        self.decisions, self._liczba_decyzji = self._codes(self.decision)
+
+    def _index(self, atrybut):
+        if isinstance(atrybut, str):
+            if atrybut not in self.table.names:
+                raise ValueError(f"Nieznany atrybut: {atrybut}")
+            return self.table.names.index(atrybut)
+        if not 0 <= atrybut < self.table.n_cols:
+            raise ValueError(f"Nieznany atrybut: {atrybut}")
+        return atrybut
+
+    def _attributes(self, atrybuty):
+        if atrybuty is None:
+            return frozenset(self.conditions)
+        return frozenset(self._index(a) for a in atrybuty)
+
+    # Kody kolumny 0..liczebnosc-1: symboliczne przesunięte o 1 (brak ma własną wartość),
+    # liczbowe numerowane po różnych wartościach (wszystkie NaN w jednej)
+    def _codes(self, j):
+        if j not in self._kody:
+            kolumna = self.table.columns[j]
+            if self.table.types[j] == 's':
+                kody = kolumna.astype(np.intp) - BRAK
+                self._kody[j] = kody, len(self.table.vocabularies[j]) + 1
+            else:
+                unikalne, kody = np.unique(kolumna, return_inverse=True)
+                self._kody[j] = kody.ravel(), len(unikalne)
+        return self._kody[j]
+
+    # Podział wyznaczony przez atrybuty: od największego zapamiętanego podzbioru,
+    # rozdrabniany brakującymi atrybutami
+    def partition(self, attributes=None):
+        atrybuty = self._attributes(attributes)
+        if atrybuty in self._podzialy:
+            return self._podzialy[atrybuty]
+        baza = max((a for a in self._podzialy if a <= atrybuty), key=len)
+        podzial = self._podzialy[baza]
+        for j in sorted(atrybuty - baza):
+            podzial = podzial.refine(*self._codes(j))
+        self._remember(atrybuty, podzial)
+        return podzial
+
+    def _remember(self, atrybuty, podzial):
+        if len(self._podzialy) > self.cache_size:
+            # Najstarszy wpis poza pustym zbiorem atrybutów (dict zachowuje kolejność wstawiania)
+            najstarszy = next(a for a in self._podzialy if a)
+            del self._podzialy[najstarszy]
+        self._podzialy[atrybuty] = podzial
+
+    def clear_cache(self):
+        self._podzialy = {frozenset(): self._podzialy[frozenset()]}
+
+    # Dla każdego wiersza: czy jego klasa nierozróżnialności ma jedną decyzję
+    # (wiersz należy do obszaru pozytywnego)
+    def consistent(self, attributes=None):
+        podzial = self.partition(attributes)
+        z_decyzja = podzial.refine(self.decisions, self._liczba_decyzji)
+        klasa = np.zeros(z_decyzja.count, dtype=np.intp)
+        klasa[z_decyzja.labels] = podzial.labels
+        liczba_decyzji = np.bincount(klasa, minlength=podzial.count)
+        return liczba_decyzji[podzial.labels] == 1
+
+    def _decision_mask(self, wartosc):
+        if self.table.types[self.decision] == 's':
+            slownik = self.table.vocabularies[self.decision]
+            if wartosc not in slownik:
+                raise ValueError(f"Nieznana wartość decyzji: {wartosc}")
+            return self.table.columns[self.decision] == slownik.index(wartosc)
+        return self.table.columns[self.decision] == wartosc
+
+    # Dolne przybliżenie klasy decyzyjnej: wiersze, których cała klasa nierozróżnialności
+    # ma tę decyzję (maska wierszy)
+    def lower(self, value, attributes=None):
+        return self._decision_mask(value) & self.consistent(attributes)
+
+    # Górne przybliżenie: wiersze, których klasa zawiera choć jeden wiersz z tą decyzją
+    def upper(self, value, attributes=None):
+        podzial = self.partition(attributes)
+        trafione = np.zeros(podzial.count, dtype=bool)
+        trafione[podzial.labels[self._decision_mask(value)]] = True
+        return trafione[podzial.labels]
+
+    def boundary(self, value, attributes=None):
+        return self.upper(value, attributes) & ~self.lower(value, attributes)
+
+    # Dokładność przybliżenia |dolne| / |górne|
+    def accuracy(self, value, attributes=None):
+        gorne = int(self.upper(value, attributes).sum())
+        return int(self.lower(value, attributes).sum()) / gorne if gorne else 1.0
+
+    def positive_count(self, attributes=None):
+        return int(self.consistent(attributes).sum())
+
+    # Stopień zależności decyzji od atrybutów: udział wierszy w obszarze pozytywnym
+    def dependency(self, attributes=None):
+        n = self.table.n_rows
+        return self.positive_count(attributes) / n if n else 1.0
+
+    # Rdzeń: atrybuty, bez których obszar pozytywny wszystkich atrybutów się zmniejsza
+    def core(self):
+        wszystkie = frozenset(self.conditions)
+        pelny = self.positive_count(wszystkie)
+        return [self.table.names[j] for j in self.conditions
+                if self.positive_count(wszystkie - {j}) < pelny]
+
+    # Redukt zachłannie (QuickReduct): dokładamy atrybut, który najbardziej powiększa obszar
+    # pozytywny - każdy kandydat to jedno rozdrobnienie zapamiętanego podziału wybranych -
+    # aż do obszaru pozytywnego wszystkich atrybutów; potem usuwamy atrybuty zbędne.
+    def reduct(self, attributes=None):
+        dostepne = sorted(self._attributes(attributes))
+        cel = self.positive_count(dostepne)
+        wybrane = frozenset()
+        biezacy = self.positive_count(wybrane)
+        while biezacy < cel:
+            najlepszy, biezacy = max(
+                ((j, self.positive_count(wybrane | {j})) for j in dostepne if j not in wybrane),
+                key=lambda para: para[1])
+            wybrane |= {najlepszy}
+        for j in sorted(wybrane, reverse=True):
+            if self.positive_count(wybrane - {j}) == cel:
+                wybrane -= {j}
+        return [self.table.names[j] for j in sorted(wybrane)]
+
+    # Reguły pewne: jedna reguła na klasę nierozróżnialności z obszaru pozytywnego,
+    # (warunki {atrybut: wartość}, decyzja, liczba wierszy klasy)
+    def rules(self, attributes=None):
+        atrybuty = sorted(self._attributes(attributes))
+        podzial = self.partition(atrybuty)
+        zgodne = self.consistent(atrybuty)
+        # Pierwszy wiersz każdej klasy jako jej reprezentant
+        pierwsze = np.full(podzial.count, self.table.n_rows, dtype=np.intp)
+        np.minimum.at(pierwsze, podzial.labels, np.arange(self.table.n_rows))
+        pierwsze = pierwsze[zgodne[pierwsze]]
+        rozmiary = podzial.sizes()
+        kolumny = {j: self.table.decode(j) for j in atrybuty + [self.decision]}
+        return [
+            ({self.table.names[j]: str(kolumny[j][w]) for j in atrybuty},
+             str(kolumny[self.decision][w]), int(rozmiary[podzial.labels[w]]))
+            for w in pierwsze.tolist()
+        ]
@@ -0,0 +1,179 @@
+import json
+
+import numpy as np
+
+from column_stats import ColumnStats
+from decision_table import vocabulary_values
+from sketches import HyperLogLog
+
+
+# Łączenie dwóch stanów (liczność, średnia, M2) wzorem Chana - wektorowo dla wszystkich kolumn
+def _chan(n_a, srednia_a, m2_a, n_b, srednia_b, m2_b):
+    n = n_a + n_b
+    with np.errstate(invalid='ignore', divide='ignore'):
+        delta = srednia_b - srednia_a
+        srednia = np.where(n > 0, srednia_a + delta * (n_b / n), np.nan)
+        m2 = np.where(n > 0, np.nan_to_num(m2_a) + np.nan_to_num(m2_b) + delta ** 2 * (n_a * n_b / n), np.nan)
+    srednia = np.where(n_a == 0, srednia_b, np.where(n_b == 0, srednia_a, srednia))
+    m2 = np.where(n_a == 0, m2_b, np.where(n_b == 0, m2_a, m2))
+    return n, srednia, m2
+
+
+# Bieżący stan statystyk tabeli: aktualizowany tylko dopisanymi wierszami, łączony między
+# fragmentami, plikami i procesami oraz zapisywany na dysk. Koszt aktualizacji zależy od
+# liczby nowych wierszy, a nie od rozmiaru całej tabeli.
+class RunningStats:
+    def __init__(self, names, types, vocabularies, p=12):
+        k = len(names)
+        self.names = list(names)
+        self.types = list(types)
+        self.vocabularies = [None if v is None else list(v) for v in vocabularies]
+        self.count = np.zeros(k, dtype=np.int64)
+        self.missing = np.zeros(k, dtype=np.int64)
+        self.mean = np.full(k, np.nan)
+        self.m2 = np.full(k, np.nan)
+        self.min = np.full(k, np.nan)
+        self.max = np.full(k, np.nan)
+        # Kolumny symboliczne: liczność każdego kodu słownika; liczbowe: szkic liczby unikalnych
+        self.category_counts = [
+            np.zeros(len(v), dtype=np.int64) if t == 's' else None
+            for t, v in zip(self.types, self.vocabularies)
+        ]
+        self.sketches = [None if t == 's' else HyperLogLog(p) for t in self.types]
+
+    @classmethod
+    def from_table(cls, table, p=12):
+        return cls(table.names, table.types, table.vocabularies, p).update(table)
+
+    def __len__(self):
+        return len(self.names)
+
+    @property
+    def variance(self):
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(self.count > 0, self.m2 / self.count, np.nan)
+
+    @property
+    def std(self):
+        return np.sqrt(self.variance)
+
+    def _lookup(self, j):
+        return vocabulary_values(self.vocabularies[j])
+
+    # Słownik nowej tabeli może mieć dodatkowe wartości - stare kody zostają, nowe dopisujemy na koniec
+    def _extend_vocabulary(self, j, slownik):
+        znane = {v: i for i, v in enumerate(self.vocabularies[j])}
+        mapa = np.empty(len(slownik) + 1, dtype=np.intp)
+        for i, v in enumerate(slownik):
+            if v not in znane:
+                znane[v] = len(self.vocabularies[j])
+                self.vocabularies[j].append(v)
+            mapa[i] = znane[v]
+        mapa[-1] = -1
+        dodane = len(self.vocabularies[j]) - len(self.category_counts[j])
+        if dodane:
+            self.category_counts[j] = np.concatenate([self.category_counts[j], np.zeros(dodane, dtype=np.int64)])
+        return mapa
+
+    def _add(self, j, n, brakujace, srednia, m2, minimum, maksimum):
+        self.missing[j] += brakujace
+        if n == 0:
+            return
+        self.count[j], self.mean[j], self.m2[j] = _chan(
+            self.count[j], self.mean[j], self.m2[j], n, srednia, m2)
+        self.min[j] = np.fmin(self.min[j], minimum)
+        self.max[j] = np.fmax(self.max[j], maksimum)
+
+    # Dopisuje wiersze table[start:stop] (domyślnie całą tabelę); tabela musi mieć te same kolumny
+    def update(self, table, start=0, stop=None):
+        if list(table.names) != self.names:
+            raise ValueError("Tabela ma inne kolumny niż statystyki")
+        for j, kolumna in enumerate(table.columns):
+            fragment = kolumna[start:stop]
+            if self.types[j] == 's':
+                mapa = self._extend_vocabulary(j, table.vocabularies[j])
+                rozmiar = len(table.vocabularies[j]) + 1
+                licznosci = np.bincount(fragment.astype(np.intp) % rozmiar, minlength=rozmiar)
+                self.category_counts[j][mapa[:-1]] += licznosci[:-1]
+                self._add_counts(j, licznosci[:-1], table.value_lookup(j)[:-1], int(licznosci[-1]))
+            else:
+                braki = np.isnan(fragment)
+                wartosci = fragment[~braki]
+                self.sketches[j].update(wartosci)
+                if len(wartosci):
+                    srednia = float(wartosci.mean())
+                    self._add(j, len(wartosci), int(braki.sum()), srednia,
+                              float(((wartosci - srednia) ** 2).sum()), float(wartosci.min()), float(wartosci.max()))
+                else:
+                    self._add(j, 0, int(braki.sum()), np.nan, np.nan, np.nan, np.nan)
+        return self
+
+    def _add_counts(self, j, licznosci, wartosci, brakujace):
+        uzyte = licznosci > 0
+        n = int(licznosci.sum())
+        if n == 0:
+            self._add(j, 0, brakujace, np.nan, np.nan, np.nan, np.nan)
+            return
+        srednia = float((licznosci * wartosci).sum() / n)
+        m2 = float((licznosci * (wartosci - srednia) ** 2).sum())
+        self._add(j, n, brakujace, srednia, m2, float(wartosci[uzyte].min()), float(wartosci[uzyte].max()))
+
+    def merge(self, other):
+        if other.names != self.names or other.types != self.types:
+            raise ValueError("Można łączyć tylko statystyki tych samych kolumn")
+        for j in range(len(self.names)):
+            if self.types[j] == 's':
+                mapa = self._extend_vocabulary(j, other.vocabularies[j])
+                self.category_counts[j][mapa[:-1]] += other.category_counts[j]
+            else:
+                self.sketches[j].merge(other.sketches[j])
+        self.missing += other.missing
+        self.count, self.mean, self.m2 = _chan(self.count, self.mean, self.m2, other.count, other.mean, other.m2)
+        self.min = np.fmin(self.min, other.min)
+        self.max = np.fmax(self.max, other.max)
+        return self
+
+    # Widok zgodny z describe(): unikalne wartości kolumn symbolicznych z liczności kodów,
+    # dla kolumn liczbowych tylko przybliżona liczba unikalnych ze szkicu
+    def to_column_stats(self):
+        uniques, distinct = [], []
+        for j in range(len(self.names)):
+            if self.types[j] == 's':
+                u = np.unique(self._lookup(j)[self.category_counts[j] > 0])
+                uniques.append(u)
+                distinct.append(len(u))
+            else:
+                uniques.append(None)
+                distinct.append(len(self.sketches[j]))
+        return ColumnStats(
+            list(self.names), self.count.copy(), self.missing.copy(), self.min.copy(), self.max.copy(),
+            self.mean.copy(), self.variance, uniques, distinct,
+        )
+
+    def save(self, sciezka):
+        meta = {'names': self.names, 'types': self.types, 'vocabularies': self.vocabularies}
+        tablice = {
+            'count': self.count, 'missing': self.missing, 'mean': self.mean, 'm2': self.m2,
+            'min': self.min, 'max': self.max,
+        }
+        for j in range(len(self.names)):
+            if self.types[j] == 's':
+                tablice[f'counts_{j}'] = self.category_counts[j]
+            else:
+                tablice[f'sketch_{j}'] = np.frombuffer(self.sketches[j].to_bytes(), dtype=np.uint8)
+        with open(sciezka, 'wb') as f:
+            np.savez(f, meta=np.array(json.dumps(meta)), **tablice)
+
+    @classmethod
+    def load(cls, sciezka):
+        with np.load(sciezka, allow_pickle=False) as dane:
+            meta = json.loads(str(dane['meta']))
+            stan = cls(meta['names'], meta['types'], meta['vocabularies'])
+            for nazwa in ('count', 'missing', 'mean', 'm2', 'min', 'max'):
+                setattr(stan, nazwa, dane[nazwa].copy())
+            for j, typ in enumerate(stan.types):
+                if typ == 's':
+                    stan.category_counts[j] = dane[f'counts_{j}'].copy()
+                else:
+                    stan.sketches[j] = HyperLogLog.from_bytes(dane[f'sketch_{j}'].tobytes())
+        return stan
@@ -0,0 +1,101 @@
+import numpy as np
+
+
+def _as_matrix(X, dtype):
+    X = np.asarray(X, dtype=dtype)
+    if X.ndim == 1:
+        X = X[:, None]
+    return X
+
+
+class MinMaxScaler:
+    # feature_range: jeden przedział (a, b) albo lista przedziałów liczonych jednym wywołaniem
+    def __init__(self, feature_range=(0, 1), dtype=np.float64):
+        self.feature_range = feature_range
+        self.dtype = dtype
+        self.data_min_ = None
+        self.data_max_ = None
+
+    def fit(self, X):
+        X = _as_matrix(X, self.dtype)
+        self.data_min_ = np.nanmin(X, axis=0)
+        self.data_max_ = np.nanmax(X, axis=0)
+        return self
+
+    # Parametry ze statystyk policzonych wcześniej przez column_stats.describe - bez ponownego skanu
+    def fit_stats(self, stats):
+        self.data_min_ = np.asarray(stats.min, dtype=self.dtype)
+        self.data_max_ = np.asarray(stats.max, dtype=self.dtype)
+        return self
+
+    def _check_fitted(self):
+        if self.data_min_ is None:
+            raise ValueError("Skaler nie został nauczony - wywołaj najpierw fit()")
+
+    # Dla jednego przedziału zwraca macierz (wiersze, kolumny), dla listy przedziałów
+    # tablicę (przedziały, wiersze, kolumny) policzoną przez broadcasting.
+    # Kolumny stałe (min == max) zostają bez zmian, tak jak w normalize_into_intervals.
+    def transform(self, X, feature_range=None):
+        self._check_fitted()
+        X = _as_matrix(X, self.dtype)
+        zakres = self.feature_range if feature_range is None else feature_range
+        jeden = np.ndim(zakres) == 1
+        przedzialy = np.asarray([zakres] if jeden else zakres, dtype=self.dtype)
+        a = przedzialy[:, 0, None, None]
+        b = przedzialy[:, 1, None, None]
+
+        rozpietosc = self.data_max_ - self.data_min_
+        stala = rozpietosc == 0
+        ulamek = (X - self.data_min_) / np.where(stala, 1, rozpietosc)
+        wynik = np.where(stala, X, (b - a) * ulamek + a).astype(self.dtype, copy=False)
+        return wynik[0] if jeden else wynik
+
+    def inverse_transform(self, X, feature_range=None):
+        self._check_fitted()
+        X = _as_matrix(X, self.dtype)
+        a, b = self.feature_range if feature_range is None else feature_range
+        rozpietosc = self.data_max_ - self.data_min_
+        stala = rozpietosc == 0
+        return np.where(stala, X, (X - a) / (b - a) * rozpietosc + self.data_min_).astype(self.dtype, copy=False)
+
+    def fit_transform(self, X, feature_range=None):
+        return self.fit(X).transform(X, feature_range)
+
+
+class StandardScaler:
+    def __init__(self, dtype=np.float64):
+        self.dtype = dtype
+        self.mean_ = None
+        self.std_ = None
+
+    # Odchylenie populacyjne (jak np.var w calculate_standard_deviation)
+    def fit(self, X):
+        X = _as_matrix(X, self.dtype)
+        self.mean_ = np.nanmean(X, axis=0)
+        self.std_ = np.nanstd(X, axis=0)
+        return self
+
+    def fit_stats(self, stats):
+        self.mean_ = np.asarray(stats.mean, dtype=self.dtype)
+        self.std_ = np.asarray(stats.std, dtype=self.dtype)
+        return self
+
+    def _check_fitted(self):
+        if self.mean_ is None:
+            raise ValueError("Skaler nie został nauczony - wywołaj najpierw fit()")
+
+    # Kolumny z odchyleniem 0 zostają bez zmian, tak jak w normalize
+    def transform(self, X):
+        self._check_fitted()
+        X = _as_matrix(X, self.dtype)
+        stala = self.std_ == 0
+        return np.where(stala, X, (X - self.mean_) / np.where(stala, 1, self.std_)).astype(self.dtype, copy=False)
+
+    def inverse_transform(self, X):
+        self._check_fitted()
+        X = _as_matrix(X, self.dtype)
+        stala = self.std_ == 0
+        return np.where(stala, X, X * self.std_ + self.mean_).astype(self.dtype, copy=False)
+
+    def fit_transform(self, X):
+        return self.fit(X).transform(X)
@@ -0,0 +1,233 @@
+import hashlib
+import math
+
+import numpy as np
+
+_M1 = np.uint64(0xBF58476D1CE4E5B9)
+_M2 = np.uint64(0x94D049BB133111EB)
+
+
+# Mieszanie bitów splitmix64 (arytmetyka uint64 modulo 2^64)
+def _splitmix64(x):
+    x = x.astype(np.uint64, copy=True)
+    with np.errstate(over='ignore'):
+        x ^= x >> np.uint64(30)
+        x *= _M1
+        x ^= x >> np.uint64(27)
+        x *= _M2
+        x ^= x >> np.uint64(31)
+    return x
+
+
+# 64-bitowy hash każdej wartości: liczby przez ich bity, napisy przez blake2b (raz na różną wartość)
+def hash64(values):
+    wartosci = np.asarray(values)
+    if wartosci.dtype.kind in 'iub':
+        return _splitmix64(wartosci.astype(np.int64).view(np.uint64))
+    if wartosci.dtype.kind == 'f':
+        wartosci = wartosci.astype(np.float64)
+        wartosci = wartosci[~np.isnan(wartosci)] + 0.0  # -0.0 -> 0.0
+        return _splitmix64(wartosci.view(np.uint64))
+    unikalne, odwrotne = np.unique(wartosci.astype(str), return_inverse=True)
+    hashe = np.array(
+        [int.from_bytes(hashlib.blake2b(v.encode(), digest_size=8).digest(), 'little') for v in unikalne.tolist()],
+        dtype=np.uint64,
+    )
+    return hashe[odwrotne.ravel()]
+
+
+# Liczba wiodących zer w 64-bitowych słowach (wektorowo, wyszukiwanie binarne)
+def _clz64(x):
+    x = x.copy()
+    n = np.zeros(len(x), dtype=np.int64)
+    for s in (32, 16, 8, 4, 2, 1):
+        puste = (x >> np.uint64(64 - s)) == 0
+        n += s * puste
+        x = np.where(puste, x << np.uint64(s), x)
+    n[x == 0] = 64
+    return n
+
+
+class HyperLogLog:
+    # Względny błąd standardowy ~ 1.04 / sqrt(2^p); pamięć to 2^p bajtów niezależnie od danych
+    def __init__(self, p=14):
+        if not 4 <= p <= 18:
+            raise ValueError("Precyzja p musi być z przedziału 4..18")
+        self.p = p
+        self.m = 1 << p
+        self.registers = np.zeros(self.m, dtype=np.uint8)
+
+    @classmethod
+    def for_error(cls, error):
+        return cls(min(18, max(4, math.ceil(math.log2((1.04 / error) ** 2)))))
+
+    @property
+    def relative_error(self):
+        return 1.04 / math.sqrt(self.m)
+
+    def update(self, values):
+        self.update_hashes(hash64(values))
+        return self
+
+    def update_hashes(self, hashe):
+        if len(hashe) == 0:
+            return self
+        indeksy = (hashe >> np.uint64(64 - self.p)).astype(np.intp)
+        reszta = hashe << np.uint64(self.p)
+        rangi = np.minimum(_clz64(reszta) + 1, 64 - self.p + 1).astype(np.uint8)
+        np.maximum.at(self.registers, indeksy, rangi)
+        return self
+
+    def merge(self, other):
+        if other.p != self.p:
+            raise ValueError("Można łączyć tylko szkice o tej samej precyzji")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def count(self):
+        alfa = {16: 0.673, 32: 0.697, 64: 0.709}.get(self.m, 0.7213 / (1 + 1.079 / self.m))
+        estymata = alfa * self.m ** 2 / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zera = int(np.count_nonzero(self.registers == 0))
+        # Poprawka dla małych liczności (linear counting)
+        if estymata <= 2.5 * self.m and zera:
+            estymata = self.m * math.log(self.m / zera)
+        return float(estymata)
+
+    def __len__(self):
+        return round(self.count())
+
+    def to_bytes(self):
+        return bytes([self.p]) + self.registers.tobytes()
+
+    @classmethod
+    def from_bytes(cls, dane):
+        szkic = cls(dane[0])
+        szkic.registers = np.frombuffer(dane[1:], dtype=np.uint8).copy()
+        return szkic
+
+
+class KLLSketch:
+    # Szkic kwantyli KLL: poziom h przechowuje elementy o wadze 2^h, a przepełniony
+    # poziom jest sortowany i co drugi element (losowe przesunięcie) awansuje wyżej.
+    # Błąd rangi jest rzędu 1/k; pamięć O(k) niezależnie od liczby elementów.
+    def __init__(self, k=200, seed=None):
+        if k < 8:
+            raise ValueError("k musi być >= 8")
+        self.k = k
+        self.n = 0
+        self.levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, poziom):
+        wysokosc = len(self.levels)
+        return max(2, math.ceil(self.k * (2 / 3) ** (wysokosc - 1 - poziom)))
+
+    def _compress(self):
+        poziom = 0
+        while poziom < len(self.levels):
+            bufor = self.levels[poziom]
+            if len(bufor) > self._capacity(poziom):
+                bufor = np.sort(bufor)
+                # Przy nieparzystej liczbie jeden element zostaje na tym poziomie
+                zostaje = bufor[:1] if len(bufor) % 2 else bufor[:0]
+                para = bufor[len(zostaje):]
+                awans = para[int(self._rng.integers(2))::2]
+                if poziom + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                self.levels[poziom + 1] = np.concatenate([self.levels[poziom + 1], awans])
+                self.levels[poziom] = zostaje
+            poziom += 1
+
+    def update(self, values):
+        wartosci = np.asarray(values, dtype=np.float64).ravel()
+        wartosci = wartosci[~np.isnan(wartosci)]
+        if len(wartosci) == 0:
+            return self
+        self.n += len(wartosci)
+        self.levels[0] = np.concatenate([self.levels[0], wartosci])
+        self._compress()
+        return self
+
+    def merge(self, other):
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for poziom, bufor in enumerate(other.levels):
+            self.levels[poziom] = np.concatenate([self.levels[poziom], bufor])
+        self.n += other.n
+        self._compress()
+        return self
+
+    def _weighted(self):
+        wartosci = np.concatenate(self.levels)
+        wagi = np.concatenate([np.full(len(b), 2.0 ** h) for h, b in enumerate(self.levels)])
+        porzadek = np.argsort(wartosci, kind='stable')
+        return wartosci[porzadek], np.cumsum(wagi[porzadek])
+
+    def quantile(self, q):
+        if self.n == 0:
+            return np.nan
+        wartosci, skumulowane = self._weighted()
+        q = np.asarray(q, dtype=np.float64)
+        indeksy = np.searchsorted(skumulowane, q * skumulowane[-1], side='left')
+        return wartosci[np.minimum(indeksy, len(wartosci) - 1)]
+
+    # Przybliżony ułamek elementów <= x
+    def rank(self, x):
+        if self.n == 0:
+            return np.nan
+        wartosci, skumulowane = self._weighted()
+        indeksy = np.searchsorted(wartosci, np.asarray(x, dtype=np.float64), side='right')
+        return np.where(indeksy > 0, skumulowane[np.maximum(indeksy - 1, 0)], 0.0) / skumulowane[-1]
+
+    @property
+    def size(self):
+        return sum(len(b) for b in self.levels)
+
+    def to_bytes(self):
+        naglowek = np.array([self.k, self.n, len(self.levels)] + [len(b) for b in self.levels], dtype=np.int64)
+        return naglowek.tobytes() + np.concatenate(self.levels).astype(np.float64).tobytes()
+
+    @classmethod
+    def from_bytes(cls, dane):
+        k, n, wysokosc = np.frombuffer(dane[:24], dtype=np.int64).tolist()
+        dlugosci = np.frombuffer(dane[24:24 + 8 * wysokosc], dtype=np.int64)
+        wartosci = np.frombuffer(dane[24 + 8 * wysokosc:], dtype=np.float64)
+        szkic = cls(k)
+        szkic.n = n
+        szkic.levels = [b.copy() for b in np.split(wartosci, np.cumsum(dlugosci)[:-1])]
+        return szkic
+
+
+# Oba szkice dla jednej kolumny budowane fragment po fragmencie (np. z CsvReader)
+# (dla kolumn kategorycznych kwantyle kodów nie mają sensu, więc szkic kwantyli jest pomijany)
+class ColumnSketch:
+    def __init__(self, p=14, k=200, seed=None, categorical=False):
+        self.distinct = HyperLogLog(p)
+        self.quantiles = None if categorical else KLLSketch(k, seed=seed)
+
+    def update(self, values):
+        wartosci = np.asarray(values)
+        self.distinct.update(wartosci)
+        if self.quantiles is not None:
+            self.quantiles.update(wartosci)
+        return self
+
+    def merge(self, other):
+        self.distinct.merge(other.distinct)
+        if self.quantiles is not None and other.quantiles is not None:
+            self.quantiles.merge(other.quantiles)
+        return self
+
+
+# Szkice kolumn dla strumienia fragmentów CsvReader - stała pamięć niezależnie od liczby wierszy
+def sketch_chunks(chunks, columns=None, categorical=(), p=14, k=200, seed=None):
+    szkice = {}
+    for chunk in chunks:
+        for name in columns or chunk.columns:
+            wartosci = chunk.columns[name]
+            if name in chunk.missing:
+                wartosci = wartosci[~chunk.missing[name]]
+            if name not in szkice:
+                szkice[name] = ColumnSketch(p, k, seed, categorical=name in categorical)
+            szkice[name].update(wartosci)
+    return szkice
@@ -0,0 +1,56 @@
+import numpy as np
+
+from column_stats import describe, describe_by
+from decision_table import DecisionTable
+
+
+# Wycinek memmapy (mm[1000:]) dziedziczy offset całej mapy - procesy robocze muszą
+# czytać te same wiersze co tryb szeregowy
+def test_parallel_describe_matches_serial_on_sliced_memmap(tmp_path):
+    rng = np.random.default_rng(0)
+    sciezki = []
+    for j, srednia in enumerate((0.0, 5.0)):
+        sciezka = tmp_path / f"{j}.npy"
+        wartosci = rng.normal(srednia, 1.0, 5000)
+        wartosci[:1000] += 100.0
+        np.save(sciezka, wartosci)
+        sciezki.append(sciezka)
+    kolumny = [np.load(s, mmap_mode='r')[1000:] for s in sciezki]
+    kolumny.append(np.load(sciezki[0], mmap_mode='r')[1000:4000:1])
+    tabela = DecisionTable(['a', 'b', 'c'], ['n', 'n', 'n'], kolumny, [None, None, None])
+
+    szeregowo = describe(tabela, chunk_size=700)
+    rownolegle = describe(tabela, chunk_size=700, workers=2)
+    for pole in ('count', 'missing', 'min', 'max', 'mean', 'variance'):
+        np.testing.assert_array_equal(getattr(rownolegle, pole), getattr(szeregowo, pole))
+    assert szeregowo.max[0] < 50
+
+
+# Cztery kolumny po 60000 wartości: iloczyn liczności przekracza zakres int64, a grupy
+# i ich klucze mają zostać takie same jak unikalne wiersze
+def test_describe_by_many_high_cardinality_columns():
+    rng = np.random.default_rng(0)
+    slownik = [str(i) for i in range(60000)]
+    kolumny = [rng.integers(0, len(slownik), 200).astype(np.int32) for _ in range(4)]
+    for kolumna in kolumny:
+        kolumna[1] = kolumna[0]
+    tabela = DecisionTable(list('abcd'), ['s'] * 4, kolumny, [slownik] * 4)
+
+    grupy = describe_by(tabela, list('abcd'))
+    unikalne = np.unique(np.stack(kolumny, axis=1), axis=0)
+    assert grupy.keys == [tuple(str(k) for k in wiersz) for wiersz in unikalne.tolist()]
+    assert grupy.size.sum() == 200 and grupy.size.max() == 2
+
+
+# Tryb przybliżony: błąd liczby unikalnych wybierany przez error, kwantyle ze szkicu KLL
+def test_describe_approximate_error_and_quantiles():
+    rng = np.random.default_rng(1)
+    wartosci = rng.integers(0, 50_000, 200_000).astype(np.float64)
+    tabela = DecisionTable(['x'], ['n'], [wartosci], [None])
+
+    statystyki = describe(tabela, chunk_size=20_000, exact_limit=1000, error=0.01)
+    prawdziwa = len(np.unique(wartosci))
+    assert statystyki.uniques[0] is None
+    assert abs(statystyki.distinct[0] - prawdziwa) / prawdziwa < 0.04
+    mediana = statystyki.quantile('x', 0.5)
+    assert abs(np.mean(wartosci <= mediana) - 0.5) < 0.02
@@ -0,0 +1,91 @@
+import os
+
+import numpy as np
+
+DEFAULT_BLOCK = 64 << 20
+NOWA_LINIA = ord('\n')
+
+
+# Granice tokenów w bloku bajtów: separatorem jest każdy bajt <= 32 (spacja, \t, \r, \n)
+def _token_bounds(blok):
+    separator = (blok <= 32).view(np.int8)
+    zmiana = np.diff(separator, prepend=np.int8(1), append=np.int8(1))
+    return np.flatnonzero(zmiana == -1), np.flatnonzero(zmiana == 1)
+
+
+# Tokeny jednej kolumny jako tablica bajtów o stałej szerokości (S<n>) - bez tworzenia napisów Pythona
+def _fixed_width(blok, poczatki, konce):
+    dlugosci = konce - poczatki
+    szerokosc = int(dlugosci.max())
+    przesuniecia = np.arange(szerokosc)
+    indeksy = np.minimum(poczatki[:, None] + przesuniecia, len(blok) - 1)
+    bajty = blok[indeksy]
+    bajty[przesuniecia >= dlugosci[:, None]] = 0
+    return np.ascontiguousarray(bajty).view(f'S{szerokosc}').ravel()
+
+
+# Sprawdza, czy wszystkie niepuste linie mają tyle samo pól
+def _check_rows(blok, poczatki, liczba_kolumn):
+    nowe_linie = np.flatnonzero(blok == NOWA_LINIA)
+    wiersze = np.searchsorted(nowe_linie, poczatki)
+    _, licznosci = np.unique(wiersze, return_counts=True)
+    if liczba_kolumn is None:
+        liczba_kolumn = int(licznosci[0])
+    if (licznosci != liczba_kolumn).any():
+        raise ValueError("Wiersze mają różną liczbę kolumn")
+    return liczba_kolumn
+
+
+# Podział pliku na bloki kończące się na granicy linii
+def _blocks(dane, block_size):
+    rozmiar = len(dane)
+    pozycja = 0
+    while pozycja < rozmiar:
+        koniec = min(pozycja + block_size, rozmiar)
+        if koniec < rozmiar:
+            nowe_linie = dane[pozycja:koniec] == NOWA_LINIA
+            # Linia dłuższa niż blok - bierzemy resztę pliku
+            koniec = pozycja + int(np.flatnonzero(nowe_linie)[-1]) + 1 if nowe_linie.any() else rozmiar
+        yield pozycja, koniec
+        pozycja = koniec
+
+
+# Tokenizuje plik z polami rozdzielonymi białymi znakami prosto z pliku zmapowanego w pamięci (np.memmap), blokami.
+# Zwraca listę (kody, słownik) dla każdej kolumny: słownik jest posortowany (jak np.unique),
+# a napisy powstają tylko dla różnych wartości, nie dla każdej komórki.
+def tokenize(sciezka_do_pliku, block_size=DEFAULT_BLOCK):
+    rozmiar = os.path.getsize(sciezka_do_pliku)
+    if rozmiar == 0:
+        return []
+    liczba_kolumn = None
+    slowniki, kody = None, None
+    dane = np.memmap(sciezka_do_pliku, dtype=np.uint8, mode='r')
+    for start, koniec in _blocks(dane, block_size):
+        blok = dane[start:koniec]
+        poczatki, konce = _token_bounds(blok)
+        if len(poczatki) == 0:
+            continue
+        liczba_kolumn = _check_rows(blok, poczatki, liczba_kolumn)
+        if slowniki is None:
+            slowniki = [{} for _ in range(liczba_kolumn)]
+            kody = [[] for _ in range(liczba_kolumn)]
+        for j in range(liczba_kolumn):
+            tokeny = _fixed_width(blok, poczatki[j::liczba_kolumn], konce[j::liczba_kolumn])
+            unikalne, odwrotne = np.unique(tokeny, return_inverse=True)
+            slownik = slowniki[j]
+            mapa = np.empty(len(unikalne), dtype=np.int32)
+            for i, wartosc in enumerate(unikalne.tolist()):
+                mapa[i] = slownik.setdefault(wartosc, len(slownik))
+            kody[j].append(mapa[odwrotne])
+
+    if slowniki is None:
+        return []
+    wynik = []
+    for slownik, fragmenty in zip(slowniki, kody):
+        # Kody nadawane w kolejności wystąpienia przemapowujemy na porządek posortowany
+        wartosci = list(slownik)
+        porzadek = sorted(range(len(wartosci)), key=wartosci.__getitem__)
+        mapa = np.empty(len(wartosci), dtype=np.int32)
+        mapa[porzadek] = np.arange(len(wartosci), dtype=np.int32)
+        wynik.append((mapa[np.concatenate(fragmenty)], [wartosci[i].decode() for i in porzadek]))
+    return wynik